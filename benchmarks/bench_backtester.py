@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from core.backtester import Backtester
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+STRATEGIES = [SMACrossover, RSIWithBB, MACrossover]
+
+
+@pytest.fixture
+def backtester(tmp_path, monkeypatch) -> Backtester:
+    """Бектестер, що пише результати у тимчасовий каталог"""
+    monkeypatch.chdir(tmp_path)
+    return Backtester([])
+
+
+def per_pair_strategies(ohlcv):
+    return [
+        strategy_cls(data.set_index("timestamp"), pair=pair)
+        for pair, data in ohlcv.groupby("pair")
+        for strategy_cls in STRATEGIES
+    ]
+
+
+def test_run_all(benchmark, backtester, ohlcv):
+    """Послідовний бектест пара за парою (без графіків)"""
+
+    def setup():
+        backtester.strategies = per_pair_strategies(ohlcv)
+        return (), {}
+
+    with patch.object(Backtester, "_save_equity_curve"), patch.object(
+        Backtester, "_create_report"
+    ):
+        results = benchmark.pedantic(
+            lambda: asyncio.run(backtester.run_all()),
+            setup=setup,
+            rounds=1,
+            warmup_rounds=1,
+        )
+    assert len(results) == 3 * ohlcv["pair"].nunique()
+
+
+def test_run_batched(benchmark, backtester, panel):
+    """Одна багатоколонкова симуляція на стратегію (без графіків)"""
+    with patch.object(Backtester, "_save_equity_curve"), patch.object(
+        Backtester, "_create_report"
+    ):
+        results = benchmark.pedantic(
+            lambda: asyncio.run(backtester.run_batched(panel, STRATEGIES)),
+            rounds=1,
+            warmup_rounds=1,
+        )
+    assert len(results) == 3 * panel["close"].shape[1]
+
+
+def test_create_report(benchmark, backtester, panel):
+    with patch.object(Backtester, "_save_equity_curve"):
+        metrics = asyncio.run(backtester.run_batched(panel, STRATEGIES))
+    benchmark(backtester._create_report, metrics)
+    assert (backtester.results_dir / "report.html").exists()
+
+
+@pytest.mark.parametrize("chart_format", ["html", "png", "dashboard"])
+def test_save_equity_curve(benchmark, tmp_path, monkeypatch, single_pair, chart_format):
+    """Проріджування та рендеринг однієї кривої у пулі, включно з його запуском"""
+    monkeypatch.chdir(tmp_path)
+    backtester = Backtester([], chart_format=chart_format)
+    equity = SMACrossover(single_pair).result.equity_curve
+
+    async def save():
+        await backtester._save_equity_curve(equity, "SMACrossover", "P000BTC")
+        await backtester.charts_done()
+
+    benchmark.pedantic(lambda: asyncio.run(save()), rounds=3)
+    assert any(backtester.results_dir.iterdir())
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import pytest
+from benchmarks.conftest import FIXTURE_DIR
+from core.data_loader import DataLoader
+from core.metadata import ExchangeMetadata
+from core.panel import align_panel, fill_gaps
+
+UNIVERSE = "bench"
+
+
+@pytest.fixture
+def month_pairs(request, fixture_pairs) -> list[str]:
+    """10 пар для ``small``, усі фікстури для більших масштабів"""
+    if request.config.getoption("--bench-scale") == "small":
+        return fixture_pairs[:10]
+    return fixture_pairs
+
+
+def make_loader(data_dir: str, pairs: list[str]) -> DataLoader:
+    """Каталог даних із посиланнями на денні фікстури та зафіксованими парами"""
+    os.makedirs(data_dir, exist_ok=True)
+    for name in os.listdir(FIXTURE_DIR):
+        if name.endswith(".parquet") and name.split("_")[0] in pairs:
+            os.symlink(os.path.join(FIXTURE_DIR, name), os.path.join(data_dir, name))
+    metadata = ExchangeMetadata(os.path.join(data_dir, "metadata"))
+    metadata.pin(UNIVERSE, pairs)
+    return DataLoader(data_dir, metadata=metadata)
+
+
+def load_month(loader: DataLoader, pairs: list[str]):
+    return asyncio.run(loader.load_month(2025, 2, len(pairs), UNIVERSE))
+
+
+def test_load_month_cold(benchmark, tmp_path, month_pairs):
+    """Перший запуск: реєстрація денних файлів у маніфесті та запис сховища"""
+    rounds = iter(range(1000))
+
+    def setup():
+        loader = make_loader(str(tmp_path / f"run{next(rounds)}"), month_pairs)
+        return (loader, month_pairs), {}
+
+    df = benchmark.pedantic(load_month, setup=setup, rounds=3)
+    assert df["pair"].nunique() == len(month_pairs)
+
+
+def test_load_month_warm(benchmark, tmp_path, month_pairs):
+    """Повторний запуск: маніфест без звернень до диска та читання сховища"""
+    loader = make_loader(str(tmp_path), month_pairs)
+    load_month(loader, month_pairs)
+
+    df = benchmark(load_month, loader, month_pairs)
+    assert df["pair"].nunique() == len(month_pairs)
+
+
+def test_to_panel(benchmark, ohlcv):
+    panel = benchmark(DataLoader.to_panel, ohlcv)
+    assert panel["close"].shape[1] == ohlcv["pair"].nunique()
+
+
+def test_align_panel(benchmark, ohlcv):
+    panel = benchmark(lambda: fill_gaps(align_panel(ohlcv)))
+    assert panel["close"].shape[1] == ohlcv["pair"].nunique()
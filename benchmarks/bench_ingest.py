@@ -0,0 +1,100 @@
+"""Порівняння шляхів обробки завантажених zip-архівів зі свічками.
+
+Запуск: ``python -m benchmarks.bench_ingest [--files N]``
+
+Архіви будуються з фікстур ``data/*.parquet`` у форматі Binance (12 колонок
+без заголовка), після чого обидва шляхи обробляють ті самі байти:
+
+* ``legacy`` - запис zip на диск, розпакування CSV, ``pd.read_csv``, parquet;
+* ``stream`` - розбір CSV прямо з пам'яті pyarrow і запис лише parquet.
+"""
+
+import argparse
+import asyncio
+import glob
+import io
+import os
+import tempfile
+import time
+import zipfile
+import pandas as pd
+from core.data_loader import DataLoader
+
+
+def kline_zip(df: pd.DataFrame, name: str) -> bytes:
+    """Zip-архів із CSV у форматі Binance з parquet-фікстури"""
+    timestamps = df["timestamp"].astype("datetime64[us]").astype("int64")
+    csv = pd.DataFrame(
+        {
+            "open_time": timestamps,
+            "open": df["open"],
+            "high": df["high"],
+            "low": df["low"],
+            "close": df["close"],
+            "volume": df["volume"],
+            "close_time": timestamps + 59_999_999,
+            "quote_volume": df["volume"] * df["close"],
+            "trades": 1,
+            "taker_base": df["volume"] / 2,
+            "taker_quote": df["volume"] * df["close"] / 2,
+            "ignore": 0,
+        }
+    ).to_csv(header=False, index=False)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{name}.csv", csv)
+    return buffer.getvalue()
+
+
+def build_archives(limit: int) -> dict[tuple[str, str], bytes]:
+    archives = {}
+    for path in sorted(glob.glob(os.path.join("data", "*_*.parquet")))[:limit]:
+        pair, date = os.path.basename(path)[: -len(".parquet")].split("_", 1)
+        archives[(pair, date)] = kline_zip(pd.read_parquet(path), f"{pair}-1m-{date}")
+    return archives
+
+
+def run_legacy(archives: dict, directory: str) -> float:
+    loader = DataLoader(directory)
+    start = time.perf_counter()
+    for (pair, date), content in archives.items():
+        with open(os.path.join(directory, f"{pair}_{date}.zip"), "wb") as f:
+            f.write(content)
+        asyncio.run(loader.extract_and_save(pair, date))
+    return time.perf_counter() - start
+
+
+def run_stream(archives: dict, directory: str) -> float:
+    start = time.perf_counter()
+    for (pair, date), content in archives.items():
+        DataLoader.zip_to_parquet(
+            content, os.path.join(directory, f"{pair}_{date}.parquet")
+        )
+    return time.perf_counter() - start
+
+
+def disk_usage(directory: str) -> tuple[int, int]:
+    files = [os.path.join(root, f) for root, _, fs in os.walk(directory) for f in fs]
+    return len(files), sum(os.path.getsize(f) for f in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    args = parser.parse_args()
+
+    archives = build_archives(args.files)
+    print(f"Архівів: {len(archives)}")
+    for name, runner in (("legacy", run_legacy), ("stream", run_stream)):
+        with tempfile.TemporaryDirectory() as directory:
+            elapsed = runner(archives, directory)
+            files, size = disk_usage(directory)
+        print(
+            f"{name:>7}: {elapsed:7.2f} с, {elapsed / len(archives) * 1000:6.1f} мс/файл, "
+            f"залишилось {files} файлів ({size / 2**20:.1f} MiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import pytest
+import vectorbt as vbt
+from core.simulator import simulate_sl_tp
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+STRATEGIES = [SMACrossover, RSIWithBB, MACrossover]
+
+
+def make_strategy(strategy_cls, data, fused: bool):
+    strategy = strategy_cls(data)
+    # Без кешу індикаторів: вимірюємо сам розрахунок, а не попадання в кеш
+    strategy.indicators = None
+    strategy.fused_signals = fused
+    return strategy
+
+
+@pytest.mark.parametrize("fused", [False, True], ids=["vbt", "fused"])
+@pytest.mark.parametrize("strategy_cls", STRATEGIES, ids=lambda cls: cls.__name__)
+def test_generate_signals(benchmark, panel, strategy_cls, fused):
+    strategy = make_strategy(strategy_cls, panel, fused)
+    benchmark(strategy.generate_signals)
+
+
+@pytest.mark.parametrize("strategy_cls", STRATEGIES, ids=lambda cls: cls.__name__)
+def test_run_backtest_panel(benchmark, panel, strategy_cls):
+    strategy = make_strategy(strategy_cls, panel, fused=False)
+    result = benchmark(strategy.run_backtest)
+    assert result.portfolio.wrapper.shape[1] == panel["close"].shape[1]
+
+
+@pytest.mark.parametrize("strategy_cls", STRATEGIES, ids=lambda cls: cls.__name__)
+def test_run_backtest_single_pair(benchmark, single_pair, strategy_cls):
+    strategy = make_strategy(strategy_cls, single_pair, fused=False)
+    benchmark(strategy.run_backtest)
+
+
+@pytest.mark.parametrize("engine", ["from_signals", "simulator"])
+def test_sl_tp_simulation_panel(benchmark, panel, engine):
+    strategy = make_strategy(RSIWithBB, panel, fused=True)
+    close = panel["close"]
+    long_entry, long_exit, short_entry, short_exit = strategy.generate_signals()
+    options = {**RSIWithBB.portfolio_kwargs, "freq": "1min"}
+    if engine == "simulator":
+        benchmark(
+            simulate_sl_tp,
+            close,
+            long_entry,
+            long_exit,
+            short_entry,
+            short_exit,
+            **options,
+        )
+    else:
+        benchmark(
+            vbt.Portfolio.from_signals,
+            close,
+            entries=long_entry,
+            exits=long_exit,
+            short_entries=short_entry,
+            short_exits=short_exit,
+            **options,
+        )
@@ -0,0 +1,108 @@
+"""Набори даних і масштаби для бенчмарків.
+
+Масштаб задається ``--bench-scale``: ``small`` (за замовчуванням) - 1 день
+і 1 місяць для 10 пар; ``medium`` додає 100 пар; ``large`` - 500 пар за
+місяць і рік для 10/100 пар. Рік для 500 пар (≈260 млн свічок) не
+поміщається в пам'ять однієї машини і не входить у жоден масштаб.
+"""
+
+import glob
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+BARS = {"day": 24 * 60, "month": 28 * 24 * 60, "year": 365 * 24 * 60}
+SCALES = {
+    "small": [("day", 10), ("month", 10)],
+    "medium": [("day", 10), ("month", 10), ("day", 100), ("month", 100)],
+    "large": [
+        ("day", 10),
+        ("month", 10),
+        ("day", 100),
+        ("month", 100),
+        ("day", 500),
+        ("month", 500),
+        ("year", 10),
+        ("year", 100),
+    ],
+}
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-scale",
+        choices=list(SCALES),
+        default="small",
+        help="розміри синтетичних наборів даних",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = SCALES[metafunc.config.getoption("--bench-scale")]
+        metafunc.parametrize(
+            "size", sizes, ids=[f"{span}-{pairs}p" for span, pairs in sizes]
+        )
+
+
+def synthetic_ohlcv(pairs: int, bars: int, seed: int = 0) -> pd.DataFrame:
+    """Довга таблиця OHLCV з випадковим блуканням ціни для ``pairs`` пар"""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2025-02-01", periods=bars, freq="min")
+    frames = []
+    for i in range(pairs):
+        close = np.exp(rng.normal(0, 0.002, bars).cumsum()) * 0.001 * (i + 1)
+        spread = np.abs(rng.normal(0, 0.001, bars))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": timestamps,
+                    "open": close,
+                    "high": close * (1 + spread),
+                    "low": close * (1 - spread),
+                    "close": close,
+                    "volume": rng.exponential(100, bars),
+                    "pair": f"P{i:03d}BTC",
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+_datasets: dict = {}
+
+
+@pytest.fixture
+def ohlcv(size) -> pd.DataFrame:
+    """Синтетичні дані потрібного розміру; генеруються раз на сесію"""
+    span, pairs = size
+    if size not in _datasets:
+        _datasets.clear()  # тримаємо в пам'яті лише один великий набір
+        _datasets[size] = synthetic_ohlcv(pairs, BARS[span])
+    return _datasets[size]
+
+
+@pytest.fixture
+def panel(ohlcv) -> pd.DataFrame:
+    from core.data_loader import DataLoader
+
+    return DataLoader.to_panel(ohlcv)
+
+
+@pytest.fixture
+def single_pair(ohlcv) -> pd.DataFrame:
+    """Перша пара набору з часовим індексом, як у ``run_all``"""
+    first = ohlcv["pair"].iloc[0]
+    return ohlcv[ohlcv["pair"] == first].set_index("timestamp")
+
+
+@pytest.fixture(scope="session")
+def fixture_pairs() -> list[str]:
+    """Пари з денними parquet-фікстурами у ``data/``"""
+    paths = glob.glob(os.path.join(FIXTURE_DIR, "*_2025-02-*.parquet"))
+    pairs = sorted({os.path.basename(path).split("_")[0] for path in paths})
+    if not pairs:
+        pytest.skip("немає фікстур у data/")
+    return pairs
@@ -1,105 +1,368 @@
 import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-from typing import Any, List
-from strategies.base import StrategyBase
+from typing import Any, List, Optional, Type
+from core.charts import ChartRenderer
+from core.profiling import profiler
+from core.report import write_report
+from core.results import ResultStore
+from core.timeframes import BASE_TIMEFRAME
+from strategies.base import BacktestResult, StrategyBase
+
+
+def _execute_strategy(strategy: StrategyBase) -> dict[str, Any]:
+    """Синхронно виконує стратегію та повертає метрики або опис помилки"""
+    try:
+        metrics = strategy.get_metrics()
+        return {
+            **metrics,
+            "strategy_name": strategy.__class__.__name__,
+            "pair": getattr(strategy, "pair", "N/A"),
+        }
+    except Exception as e:
+        print(f"❌ Помилка в стратегії {strategy.__class__.__name__}: {e}")
+        return {"strategy_name": strategy.__class__.__name__, "error": str(e)}
+
+
+def _execute_batch(
+    strategies: List[StrategyBase], profile: bool = False
+) -> tuple[list[tuple[dict, Any]], list[tuple]]:
+    """Виконує пакет стратегій однієї пари у процесі-воркері.
+
+    Повертає метрики та криву капіталу для кожної стратегії, щоб основному
+    процесу не доводилось повторно запускати бектест для графіків, а також
+    записи профайлера воркера (якщо ``profile``).
+    """
+    results = []
+    with profiler.capture(profile) as records:
+        for strategy in strategies:
+            metrics = _execute_strategy(strategy)
+            results.append((metrics, _strategy_equity(strategy, metrics)))
+    _release(strategies)
+    return results, records
+
+
+def _release(strategies: List[StrategyBase]):
+    """Звільняє дані лінивих handle пакета, щоб пам'ять не росла з кількістю пар"""
+    for strategy in strategies:
+        strategy.release()
+
+
+def _strategy_equity(strategy: StrategyBase, metrics: dict) -> Optional[pd.Series]:
+    """Крива капіталу з кешованого результату стратегії (без повторної симуляції)"""
+    if "error" in metrics:
+        return None
+    try:
+        return _extract_equity(strategy.result)
+    except Exception as e:
+        print(f"❌ Помилка бектесту {strategy.__class__.__name__}: {e}")
+        return None
+
+
+def _extract_equity(result: Any) -> Optional[pd.Series]:
+    """Дістає криву капіталу з результату бектесту"""
+    if isinstance(result, BacktestResult):
+        return result.equity_curve
+    if isinstance(result, pd.Series):
+        return result
+    if hasattr(result, "cumulative_returns"):
+        return result.cumulative_returns()
+    if isinstance(result, dict) and "portfolio" in result:
+        return result["portfolio"].cumulative_returns()
+    return None
 
 
 class Backtester:
     """Клас для проведення бектесту торгових стратегій."""
 
-    def __init__(self, strategies: List[StrategyBase]):
-        """Клас для проведення бектесту торгових стратегій."""
+    def __init__(
+        self,
+        strategies: List[StrategyBase],
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        chart_format: str = "html",
+        chart_workers: int = 2,
+        extra_metrics: tuple = (),
+        result_store: Optional[ResultStore] = None,
+        report_top_n: Optional[int] = 50,
+    ):
+        """Клас для проведення бектесту торгових стратегій.
+
+        Якщо задано ``max_workers`` або ``executor``, стратегії виконуються
+        паралельно у пулі процесів, інакше - послідовно в поточному процесі.
+        Графіки кривих капіталу (``chart_format``: none, html, png,
+        dashboard) рендерить окремий пул з ``chart_workers`` процесів.
+        ``extra_metrics`` додає до звіту метрики з ``core.metrics.EXTRA_METRICS``.
+        З ``result_store`` виконуються лише задачі, яких ще немає у сховищі
+        (нові пари, параметри, дані чи код), решта рядків береться звідти.
+        ``report_top_n`` - скільки найкращих пар показує теплокарта звіту
+        (``None`` - усі, стиснуті до 100 рядків, див. ``core.report``).
+        """
         self.strategies = strategies
+        self.max_workers = max_workers
+        self.executor = executor
+        self.extra_metrics = tuple(extra_metrics)
+        self.result_store = result_store
+        self.report_top_n = report_top_n
         self.results_dir = Path("results")
         self.results_screens = self.results_dir / "screenshots"
         self.results_dir.mkdir(exist_ok=True)
         self.results_screens.mkdir(exist_ok=True)
+        self.charts = ChartRenderer(self.results_dir, chart_format, chart_workers)
+        self._chart_tasks: list[asyncio.Future] = []
 
     async def _run_strategy(self, strategy: StrategyBase) -> dict[str, Any]:
         """Виконує стратегію та повертає метрики"""
+        return _execute_strategy(strategy)
+
+    @staticmethod
+    def _group_by_data(strategies: List[StrategyBase]) -> list[list[int]]:
+        """Групує індекси стратегій, що працюють з одним і тим самим DataFrame.
+
+        Стратегії однієї пари ділять один об'єкт даних (або handle), тому при
+        відправці пакета у воркер pickle серіалізує зріз пари лише один раз,
+        а handle читається один раз на пакет.
+        """
+        groups: dict[int, list[int]] = {}
+        for i, strategy in enumerate(strategies):
+            source = getattr(strategy, "_handle", None)
+            if source is None:
+                source = getattr(strategy, "data", strategy)
+            groups.setdefault(id(source), []).append(i)
+        return list(groups.values())
+
+    async def _run_parallel(
+        self, strategies: List[StrategyBase]
+    ) -> list[tuple[dict, Any]]:
+        """Виконує стратегії у пулі процесів, зберігаючи вихідний порядок"""
+        loop = asyncio.get_running_loop()
+        own_executor = self.executor is None
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.max_workers)
+        groups = self._group_by_data(strategies)
         try:
-            metrics = strategy.get_metrics()
-            return {
-                **metrics,
-                "strategy_name": strategy.__class__.__name__,
-                "pair": getattr(strategy, "pair", "N/A"),
-            }
-        except Exception as e:
-            print(f"❌ Помилка в стратегії {strategy.__class__.__name__}: {e}")
-            return {"strategy_name": strategy.__class__.__name__, "error": str(e)}
+            futures = [
+                loop.run_in_executor(
+                    executor,
+                    _execute_batch,
+                    [strategies[i] for i in group],
+                    profiler.enabled,
+                )
+                for group in groups
+            ]
+            batches = await asyncio.gather(*futures, return_exceptions=True)
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        results: list[Any] = [None] * len(strategies)
+        for group, batch in zip(groups, batches):
+            if isinstance(batch, BaseException):
+                for i in group:
+                    name = strategies[i].__class__.__name__
+                    print(f"❌ Помилка в стратегії {name}: {batch}")
+                    results[i] = ({"strategy_name": name, "error": str(batch)}, None)
+                continue
+            batch, records = batch
+            profiler.merge(records)
+            for i, item in zip(group, batch):
+                results[i] = item
+        return results
 
     async def _save_equity_curve(self, result: Any, strategy_name: str, pair: str):
         """Універсальне збереження графіків"""
         try:
-            if hasattr(result, "cumulative_returns"):
-                equity = result.cumulative_returns()
-            elif isinstance(result, dict) and "portfolio" in result:
-                equity = result["portfolio"].cumulative_returns()
-            else:
+            equity = _extract_equity(result)
+            if equity is None:
                 return
-
-            fig = go.Figure()
-            fig.add_trace(
-                go.Scatter(x=equity.index, y=equity, mode="lines", name="Equity Curve")
-            )
-
-            plot_path = self.results_dir / f"equity_{strategy_name}_{pair}"
-            fig.write_html(f"{plot_path}.html")
-            fig.write_image(f"{plot_path}.png")
-
+            with profiler.stage("plot", strategy_name, pair):
+                await self.charts.render(equity, strategy_name, pair)
         except Exception as e:
             print(f"❌ Помилка при збереженні графіку: {e}")
 
-    def _create_heatmap(self, metrics_df: pd.DataFrame):
-        """Створення теплокарти продуктивності"""
+    def _schedule_charts(self, save_tasks: list):
+        """Запускає збереження графіків у фоні, не чекаючи завершення"""
+        self._chart_tasks.extend(asyncio.ensure_future(task) for task in save_tasks)
+
+    async def charts_done(self):
+        """Чекає на всі заплановані графіки та зведений HTML"""
+        tasks, self._chart_tasks = self._chart_tasks, []
+        await asyncio.gather(*tasks)
+        await self.charts.finish()
+
+    @profiler.timed("report")
+    def _create_report(self, metrics_df: pd.DataFrame):
+        """Звіт ``results/report.html``: теплокарта, зведення та топ-таблиці"""
         try:
-            pivot_df = metrics_df.pivot_table(
-                index="pair",
-                columns="strategy_name",
-                values="total_return",
-                aggfunc="mean",
+            write_report(
+                metrics_df,
+                str(self.results_dir / "report.html"),
+                top_n=self.report_top_n,
             )
+        except Exception as e:
+            print(f"❌ Помилка при створенні звіту: {e}")
 
-            plt.figure(figsize=(20, 15))
-            sns.heatmap(pivot_df, annot=True, fmt=".1f", cmap="RdYlGn", linewidths=0.5)
-            plt.title("Performance Heatmap")
+    @profiler.timed("run_all")
+    async def run_all(self, wait_charts: bool = True) -> pd.DataFrame:
+        """Паралельний бектест всіх стратегій.
 
-            heatmap_path = self.results_screens / "heatmap.png"
-            plt.savefig(heatmap_path)
-            plt.close()
-        except Exception as e:
-            print(f"❌ Помилка при створенні теплокарти: {e}")
+        З ``wait_charts=False`` повертає метрики одразу, а графіки
+        рендеряться у фоні до виклику ``charts_done``.
+        """
+        if self.extra_metrics:
+            for strategy in self.strategies:
+                strategy.extra_metrics = self.extra_metrics
+
+        results: list[Any] = [None] * len(self.strategies)
+        pending = list(range(len(self.strategies)))
+        if self.result_store is not None:
+            keys = [self.result_store.key(strategy) for strategy in self.strategies]
+            stored = self.result_store.get(key for key, _ in keys)
+            for i, (key, _) in enumerate(keys):
+                results[i] = stored.get(key)
+            pending = [i for i in pending if results[i] is None]
+            print(
+                f"💾 З кешу результатів: {len(results) - len(pending)}, "
+                f"до виконання: {len(pending)}"
+            )
 
-    async def run_all(self) -> pd.DataFrame:
-        """Паралельний бектест всіх стратегій"""
-        tasks = [self._run_strategy(strategy) for strategy in self.strategies]
-        results = await asyncio.gather(*tasks)
+        strategies = [self.strategies[i] for i in pending]
+        if not strategies:
+            outcomes = []
+        elif self.max_workers is not None or self.executor is not None:
+            outcomes = await self._run_parallel(strategies)
+        else:
+            # Пакетами за даними: handle пари звільняється після її стратегій
+            outcomes = [None] * len(strategies)
+            for group in self._group_by_data(strategies):
+                for i in group:
+                    metrics = await self._run_strategy(strategies[i])
+                    outcomes[i] = (metrics, _strategy_equity(strategies[i], metrics))
+                _release([strategies[i] for i in group])
+        for i, (metrics, _) in zip(pending, outcomes):
+            results[i] = metrics
+        if self.result_store is not None:
+            self.result_store.put(
+                (*keys[i], self.strategies[i], results[i]) for i in pending
+            )
 
         # Обробка результатів
         valid_results = [r for r in results if isinstance(r, dict)]
         metrics_df = pd.DataFrame(valid_results)
 
-        # Паралельне збереження графіків
+        # Графіки - окремий етап, що не блокує метрики; лише для виконаних задач
         save_tasks = [
             self._save_equity_curve(
-                strategy.run_backtest(),
+                equity,
                 strategy.__class__.__name__,
                 getattr(strategy, "pair", "N/A"),
             )
-            for strategy in self.strategies
+            for strategy, (_, equity) in zip(strategies, outcomes)
+            if equity is not None
         ]
-        await asyncio.gather(*save_tasks)
+        self._schedule_charts(save_tasks)
+
+        # Звіт з теплокартою
+        if not metrics_df.empty:
+            self._create_report(metrics_df)
+
+        if wait_charts:
+            await self.charts_done()
+        return metrics_df
+
+    @profiler.timed("run_batched")
+    async def run_batched(
+        self,
+        panel: pd.DataFrame,
+        strategy_classes: List[Type[StrategyBase]],
+        wait_charts: bool = True,
+        timeframe: str = BASE_TIMEFRAME,
+    ) -> pd.DataFrame:
+        """Бектест усіх пар однією багатоколонковою симуляцією на стратегію.
+
+        ``panel`` - широка панель з ``DataLoader.to_panel``. Рядки результату
+        мають той самий формат і порядок (пара, стратегія), що й у ``run_all``;
+        ``wait_charts`` - як у ``run_all``; ``timeframe`` - інтервал свічок панелі.
+        """
+        frames = []
+        for rank, strategy_cls in enumerate(strategy_classes):
+            name = strategy_cls.__name__
+            strategy = strategy_cls(panel, timeframe=timeframe)
+            strategy.extra_metrics = self.extra_metrics or strategy.extra_metrics
+
+            if self.result_store is not None:
+                keys, cached = self._lookup_pairs(strategy, panel)
+                if cached:
+                    frames.append(
+                        pd.DataFrame(list(cached.values())).assign(_rank=rank)
+                    )
+                missing = [pair for pair in keys if pair not in cached]
+                print(
+                    f"💾 {name}: з кешу результатів {len(cached)}, "
+                    f"до виконання {len(missing)}"
+                )
+                if not missing:
+                    continue
+                if cached:
+                    # Симулюються лише пари без збережених результатів
+                    pairs = panel.columns.get_level_values("pair")
+                    strategy = strategy_cls(
+                        panel.loc[:, pairs.isin(missing)], timeframe=timeframe
+                    )
+                    strategy.extra_metrics = (
+                        self.extra_metrics or strategy.extra_metrics
+                    )
+
+            try:
+                frame = strategy.get_metrics_frame()
+                equity = strategy.result.equity_curve
+            except Exception as e:
+                print(f"❌ Помилка в стратегії {name}: {e}")
+                frames.append(pd.DataFrame([{"strategy_name": name, "error": str(e)}]))
+                continue
+
+            frame["strategy_name"] = name
+            if self.result_store is not None:
+                self.result_store.put(
+                    (*keys[row["pair"]], strategy, row)
+                    for row in frame.to_dict("records")
+                )
+            frame["_rank"] = rank
+            frames.append(frame)
+            self._schedule_charts(
+                [
+                    self._save_equity_curve(equity[pair], name, pair)
+                    for pair in equity.columns
+                ]
+            )
+
+        metrics_df = pd.concat(frames, ignore_index=True)
+        if "_rank" in metrics_df:
+            metrics_df = metrics_df.sort_values(
+                ["pair", "_rank"], kind="stable", ignore_index=True
+            ).drop(columns="_rank")
 
-        # Створення теплокарти
         if not metrics_df.empty:
-            self._create_heatmap(metrics_df)
+            self._create_report(metrics_df)
 
+        if wait_charts:
+            await self.charts_done()
         return metrics_df
 
+    def _lookup_pairs(
+        self, strategy: StrategyBase, panel: pd.DataFrame
+    ) -> tuple[dict[str, tuple[str, str]], dict[str, dict]]:
+        """Ключі (задача, дані) кожної пари панелі та збережені рядки за парою"""
+        keys = {
+            pair: self.result_store.key(
+                strategy, pair, panel.xs(pair, axis=1, level="pair")
+            )
+            for pair in panel.columns.unique(level="pair")
+        }
+        stored = self.result_store.get(key for key, _ in keys.values())
+        cached = {pair: stored[key] for pair, (key, _) in keys.items() if key in stored}
+        return keys, cached
+
     async def save_results(self, df: pd.DataFrame, path: str):
         """Асинхронне збереження результатів"""
         loop = asyncio.get_event_loop()
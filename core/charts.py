@@ -0,0 +1,116 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# none - без графіків; html - інтерактивний файл на стратегію й пару;
+# png - зменшене статичне зображення (kaleido); dashboard - один HTML з усіма
+# кривими
+CHART_FORMATS = ("none", "html", "png", "dashboard")
+PNG_SIZE = (960, 480)
+
+
+def decimate(equity: pd.Series, max_points: int = 2000) -> pd.Series:
+    """Проріджує криву до ``max_points`` точок, зберігаючи екстремуми.
+
+    Крива ділиться на ``max_points / 2`` кошиків, з кожного беруться мінімум
+    і максимум, а також перша й остання точки - на екрані такої ширини
+    графік виглядає так само, як повний.
+    """
+    equity = equity.dropna()
+    n = len(equity)
+    if n <= max_points:
+        return equity
+    buckets = pd.Series(equity.to_numpy()).groupby(
+        np.arange(n) * max(max_points // 2, 1) // n
+    )
+    keep = np.union1d(buckets.idxmin(), buckets.idxmax())
+    return equity.iloc[np.union1d(keep, [0, n - 1])]
+
+
+def _figure(curves: dict[str, pd.Series]) -> go.Figure:
+    fig = go.Figure()
+    for name, equity in curves.items():
+        fig.add_trace(go.Scattergl(x=equity.index, y=equity, mode="lines", name=name))
+    return fig
+
+
+def render_chart(equity: pd.Series, path: str) -> str:
+    """Зберігає криву капіталу у ``path`` (.html або .png)"""
+    fig = _figure({"Equity Curve": equity})
+    if path.endswith(".png"):
+        width, height = PNG_SIZE
+        fig.write_image(path, width=width, height=height)
+    else:
+        # plotly.js (~3.5 МБ) не вбудовується в кожен із сотень файлів
+        fig.write_html(path, include_plotlyjs="cdn")
+    return path
+
+
+def render_dashboard(curves: dict[str, pd.Series], path: str) -> str:
+    """Один HTML з усіма кривими; видимість перемикається в легенді"""
+    fig = _figure(curves)
+    fig.update_layout(title="Equity Curves", legend={"groupclick": "toggleitem"})
+    fig.write_html(path)
+    return path
+
+
+class ChartRenderer:
+    """Рендеринг графіків кривих капіталу поза критичним шляхом бектесту.
+
+    Криві проріджуються в основному процесі (у воркер передаються лише
+    ``max_points`` точок), а файли пише обмежений пул процесів
+    ``max_workers``; ``max_workers=0`` - пул потоків циклу подій.
+    """
+
+    def __init__(
+        self,
+        results_dir: Path,
+        fmt: str = "html",
+        max_workers: int = 2,
+        max_points: int = 2000,
+    ):
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"невідомий формат графіків: {fmt}")
+        self.results_dir = Path(results_dir)
+        self.fmt = fmt
+        self.max_workers = max_workers
+        self.max_points = max_points
+        self._executor: Optional[Executor] = None
+        self._curves: dict[str, pd.Series] = {}
+
+    def _pool(self) -> Optional[Executor]:
+        if self.max_workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run(self, func, *args) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), func, *args)
+
+    async def render(self, equity: pd.Series, strategy_name: str, pair: str):
+        """Ставить графік кривої в чергу (для ``dashboard`` - лише запам'ятовує)"""
+        if self.fmt == "none":
+            return
+        equity = decimate(equity, self.max_points)
+        if self.fmt == "dashboard":
+            self._curves[f"{strategy_name} {pair}"] = equity
+            return
+        extension = "png" if self.fmt == "png" else "html"
+        path = self.results_dir / f"equity_{strategy_name}_{pair}.{extension}"
+        await self._run(render_chart, equity, str(path))
+
+    async def finish(self):
+        """Записує зведений HTML (для ``dashboard``) і зупиняє пул"""
+        try:
+            if self._curves:
+                curves, self._curves = self._curves, {}
+                path = self.results_dir / "dashboard.html"
+                await self._run(render_dashboard, curves, str(path))
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
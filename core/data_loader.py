@@ -1,8 +1,29 @@
+import hashlib
+import io
 import os
 import pandas as pd
 from zipfile import ZipFile
 import asyncio
 import aiohttp
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from typing import Optional, Sequence
+from core.downloader import DownloadScheduler
+from core.handles import DataHandle
+from core.manifest import FAILED, MISSING, OK, Manifest
+from core.metadata import ExchangeMetadata
+from core.panel import FILL_POLICIES, align_panel, fill_gaps
+from core.profiling import profiler
+from core.schema import select_columns, to_compact
+from core.store import PRICE_COLUMNS, MonthStore
+from core.timeframes import BASE_TIMEFRAME, TimeframeCache, is_base
+
+KLINE_COLUMNS = ["timestamp", *PRICE_COLUMNS]
+# Binance публікує денний архів із затримкою: 404 за останні дні означає
+# "ще не опубліковано", а не "пара не торгувалась", тож у маніфест не пишеться
+PUBLICATION_LAG_DAYS = 2
 
 
 class DataLoader:
@@ -10,75 +31,217 @@ class DataLoader:
 
     BASE_URL = "https://data.binance.vision/data/spot/daily/klines"
 
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        base_url: Optional[str] = None,
+        scheduler: Optional[DownloadScheduler] = None,
+        metadata: Optional[ExchangeMetadata] = None,
+    ):
         self.data_dir = data_dir
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.scheduler = scheduler or DownloadScheduler()
         os.makedirs(data_dir, exist_ok=True)
+        self.store = MonthStore(os.path.join(data_dir, "store"))
+        self.timeframes = TimeframeCache(os.path.join(data_dir, "timeframes"))
+        self.manifest = Manifest(os.path.join(data_dir, "manifest.sqlite"))
+        self.metadata = metadata or ExchangeMetadata(os.path.join(data_dir, "metadata"))
 
-    async def _download_month(
-        self, session: aiohttp.ClientSession, pair: str, year: int, month: int
-    ) -> list[str]:
-        """Завантаження даних за весь місяць для однієї пари"""
-        dates = pd.date_range(
-            start=f"{year}-{month:02d}-01",
-            end=f"{year}-{month:02d}-28",  # Лютий має 28 днів
-            freq="D",
-        )
+    def _day_path(self, pair: str, date: str) -> str:
+        return os.path.join(self.data_dir, f"{pair}_{date}.parquet")
+
+    def _day_url(self, pair: str, date: str) -> str:
+        return f"{self.base_url}/{pair}/1m/{pair}-1m-{date}.zip"
+
+    async def _sync_day(
+        self,
+        session: aiohttp.ClientSession,
+        pair: str,
+        date: str,
+        etag: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Завантажує день пари; повертає запис маніфесту або ``None`` при 304"""
+        entry = {"pair": pair, "date": date}
+        with profiler.stage("download", pair=pair):
+            download = await self.scheduler.request(
+                session, self._day_url(pair, date), etag=etag
+            )
+        profiler.count("download_bytes", download.size, pair=pair)
+        if download.status == 304:
+            return None
+        if download.status == 404:
+            if not self._published(date):
+                return None
+            return {**entry, "status": MISSING}
+        if download.status != 200:
+            return {**entry, "status": FAILED}
+
+        try:
+            loop = asyncio.get_running_loop()
+            rows, checksum = await loop.run_in_executor(
+                None, self._save_day, download.content, self._day_path(pair, date)
+            )
+        except Exception as e:
+            print(f"❌ Помилка обробки {pair} {date}: {str(e)}")
+            return {**entry, "status": FAILED}
+        return {
+            **entry,
+            "status": OK,
+            "rows": rows,
+            "checksum": checksum,
+            "etag": download.etag,
+            "size": download.size,
+        }
 
-        saved_paths = []
-        for date in dates:
-            date_str = date.strftime("%Y-%m-%d")
-            url = f"{self.BASE_URL}/{pair}/1m/{pair}-1m-{date_str}.zip"
-            local_path = os.path.join(self.data_dir, f"{pair}_{date_str}.parquet")
+    @staticmethod
+    def _published(date: str) -> bool:
+        """Чи мав архів дня вже з'явитися (з урахуванням ``PUBLICATION_LAG_DAYS``)"""
+        today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+        return pd.Timestamp(date) < today - pd.Timedelta(days=PUBLICATION_LAG_DAYS)
 
-            if os.path.exists(local_path):
-                saved_paths.append(local_path)
-                continue
+    @classmethod
+    def _save_day(cls, content: bytes, parquet_path: str) -> tuple[int, str]:
+        """Записує день у parquet; повертає кількість рядків і sha256 архіву"""
+        with profiler.stage("extract"):
+            table = cls.parse_kline_zip(content)
+        with profiler.stage("write_day"):
+            pq.write_table(table, parquet_path, compression="snappy")
+        profiler.count("rows", table.num_rows)
+        return table.num_rows, hashlib.sha256(content).hexdigest()
 
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        zip_path = local_path.replace(".parquet", ".zip")
+    def _adopt_day(self, pair: str, date: str) -> Optional[dict]:
+        """Запис маніфесту для денного файлу, завантаженого до появи маніфесту"""
+        try:
+            rows = pq.read_metadata(self._day_path(pair, date)).num_rows
+        except (OSError, ValueError):
+            return None
+        return {"pair": pair, "date": date, "status": OK, "rows": rows}
 
-                        with open(zip_path, "wb") as f:
-                            f.write(content)
+    @profiler.timed("sync")
+    async def sync(
+        self,
+        pairs: list[str],
+        start: str,
+        end: str,
+        revalidate: bool = False,
+        retry_missing: bool = False,
+    ) -> pd.DataFrame:
+        """Інкрементальна синхронізація днів ``[start, end)`` для пар.
 
-                        parquet_path = await self._extract_and_save(
-                            zip_path, pair, date_str
-                        )
-                        saved_paths.append(parquet_path)
+        Що завантажувати, вирішує маніфест: повні дні та дні з 404
+        пропускаються без звернень до мережі й диска, завантажуються лише
+        нові та невдалі. ``revalidate`` перевіряє повні дні умовним запитом
+        за ETag, ``retry_missing`` повторює дні, що раніше повернули 404.
+        404 за останні ``PUBLICATION_LAG_DAYS`` днів не записується, тож ще
+        не опубліковані дні завантажуються наступною синхронізацією.
+        Змінені місяці перезаписуються у колонкове сховище. Повертає записи
+        маніфесту за період.
+        """
+        dates = (
+            pd.date_range(start, end, freq="D", inclusive="left")
+            .strftime("%Y-%m-%d")
+            .tolist()
+        )
+        if not dates or not pairs:
+            return pd.DataFrame(columns=["pair", "date", "status"])
 
-            except Exception as e:
-                print(f"❌ Помилка для {pair} {date_str}: {str(e)}")
+        known = self.manifest.get(pairs, dates[0], dates[-1])
+        todo, updated = [], []
+        for pair in pairs:
+            for date in dates:
+                entry = known.get((pair, date))
+                if entry is None:
+                    # Файл міг залишитись з часів до маніфесту
+                    adopted = self._adopt_day(pair, date)
+                    if adopted is not None:
+                        updated.append(adopted)
+                        continue
+                    todo.append((pair, date, None))
+                elif entry["status"] == FAILED:
+                    todo.append((pair, date, None))
+                elif entry["status"] == MISSING and retry_missing:
+                    todo.append((pair, date, None))
+                elif entry["status"] == OK and revalidate:
+                    todo.append((pair, date, entry["etag"]))
 
-        return saved_paths
+        if todo:
+            self.scheduler.start(total=len(todo))
+            async with self.scheduler.session() as session:
+                results = await asyncio.gather(
+                    *[
+                        self._sync_day(session, pair, date, etag)
+                        for pair, date, etag in todo
+                    ]
+                )
+            self.scheduler.finish()
+            updated.extend(entry for entry in results if entry is not None)
 
-    async def download_data(
-        self, session: aiohttp.ClientSession, pair: str, date: str
-    ) -> str:
-        """Асинхронне завантаження даних для однієї пари"""
-        url = f"{self.BASE_URL}/{pair}/1m/{pair}-1m-{date}.zip"
-        local_path = os.path.join(self.data_dir, f"{pair}_{date}.parquet")
+        self.manifest.record(updated)
+        self._rebuild_months(updated)
 
-        if os.path.exists(local_path):
-            return local_path
+        entries = self.manifest.get(pairs, dates[0], dates[-1])
+        return pd.DataFrame(list(entries.values())).sort_values(
+            ["pair", "date"], ignore_index=True
+        )
 
-        try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    content = await response.read()
-                    with open(local_path.replace(".parquet", ".zip"), "wb") as f:
-                        f.write(content)
-                    print(f"✅ {url} завантажено.")  # for debugging
-                    print(f"✅ Збережено до {local_path}.")  # for debugging
-                    return await self.extract_and_save(pair, date)
-                print(f"❌ Помилка завантаження {pair}: {response.status}")
-        except Exception as e:
-            print(f"❌ Помилка {pair}: {str(e)}")
-        return None
+    @profiler.timed("store_write")
+    def _rebuild_months(self, updated: list[dict]):
+        """Перезаписує у сховищі місяці, в яких з'явились нові дні"""
+        months = {
+            (entry["pair"], entry["date"][:7])
+            for entry in updated
+            if entry["status"] == OK
+        }
+        paths = []
+        for pair, month in sorted(months):
+            start = pd.Period(month, freq="M")
+            entries = self.manifest.get(
+                [pair],
+                start.start_time.strftime("%Y-%m-%d"),
+                start.end_time.strftime("%Y-%m-%d"),
+            )
+            paths.extend(
+                self._day_path(pair, date)
+                for (_, date), entry in sorted(entries.items())
+                if entry["status"] == OK
+            )
+        self.store.write_daily_files(paths)
+
+    @staticmethod
+    def parse_kline_zip(content: bytes) -> pa.Table:
+        """Розбирає zip-архів зі свічками Binance прямо з пам'яті.
+
+        CSV читається потоково з члена архіву без розпакування на диск;
+        зберігаються лише колонки часу та OHLCV.
+        """
+        with ZipFile(io.BytesIO(content)) as zip_ref:
+            with zip_ref.open(zip_ref.namelist()[0]) as member:
+                table = pacsv.read_csv(
+                    member,
+                    read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=[f"f{i}" for i in range(len(KLINE_COLUMNS))],
+                        column_types={"f0": pa.int64()},
+                    ),
+                )
+
+        table = table.rename_columns(KLINE_COLUMNS)
+        timestamps = pc.cast(table["timestamp"], pa.timestamp("us"))
+        return table.set_column(0, "timestamp", timestamps)
+
+    @classmethod
+    def zip_to_parquet(cls, content: bytes, parquet_path: str) -> str:
+        """Перетворює вміст zip-архіву на parquet без тимчасових файлів"""
+        cls._save_day(content, parquet_path)
+        return parquet_path
 
     async def extract_and_save(self, pair: str, date: str) -> str:
-        """Розпакування та збереження даних"""
+        """Розпакування та збереження даних з zip-файлу на диску.
+
+        Попередній шлях обробки: розпаковує CSV у ``data_dir`` і читає його
+        pandas. Залишений для вже завантажених архівів; нові завантаження
+        обробляє ``zip_to_parquet``.
+        """
         zip_path = os.path.join(self.data_dir, f"{pair}_{date}.zip")
         parquet_path = os.path.join(self.data_dir, f"{pair}_{date}.parquet")
 
@@ -99,60 +262,148 @@ class DataLoader:
             print(f"❌ Помилка обробки {pair}: {str(e)}")
             return None
 
-    async def load_month(self, year: int, month: int, top_n: int = 10) -> pd.DataFrame:
-        """Завантаження даних за весь місяць для топ-пар"""
-        # Генеруємо всі дати місяця
-        dates = (
-            pd.date_range(
-                start=f"{year}-{month:02d}-01",
-                end=f"{year}-{month:02d}-28",
-                freq="D",
-            )
-            .strftime("%Y-%m-%d")
-            .tolist()
-        )
+    async def load_month(
+        self,
+        year: int,
+        month: int,
+        top_n: int = 10,
+        universe: Optional[str] = None,
+        timeframe: str = BASE_TIMEFRAME,
+        compact: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Завантаження даних за весь місяць для топ-пар.
 
-        # Отримуємо топ-пари
-        top_pairs = await self.get_top_pairs(top_n)
+        Для ``timeframe`` старшого за хвилину повертаються свічки цього
+        інтервалу з дискового кешу; ключ кешу - записи маніфесту за місяць,
+        тож при попаданні хвилинні дані не читаються.
 
-        async with aiohttp.ClientSession() as session:
-            # Створюємо завдання для кожної пари та кожного дня
-            tasks = [
-                self.download_data(session, pair, date)
-                for pair in top_pairs
-                for date in dates
-            ]
-            results = await asyncio.gather(*tasks)
+        ``compact`` залишає ціни та обсяг у float32 сховища (``pair`` завжди
+        categorical), ``columns`` - лише потрібні поля OHLCV
+        (див. ``core.schema``).
+        """
+        top_pairs = await self.get_top_pairs(top_n, universe)
 
-        # Об'єднуємо всі дані
-        all_dfs = []
-        for path in results:
-            if path and os.path.exists(path):
-                df = pd.read_parquet(path)
-                df["pair"] = os.path.basename(path).split("_")[0]
+        # Довантажуємо лише відсутні дні; довжину місяця враховує календар
+        start = pd.Timestamp(year=year, month=month, day=1)
+        end = start + pd.offsets.MonthBegin()
+        entries = await self.sync(top_pairs, start, end)
+        if is_base(timeframe):
+            return self._read_month(top_pairs, start, end, compact, columns)
 
-                all_dfs.append(df)
+        key = entries.reindex(
+            columns=["pair", "date", "status", "rows", "checksum"]
+        ).to_csv(index=False)
+        bars = self.timeframes.get_or_build(
+            key, timeframe, lambda: self._read_month(top_pairs, start, end)
+        )
+        return to_compact(bars, columns) if compact else select_columns(bars, columns)
 
-        # Додаткова перевірка після об'єднання
-        if all_dfs:
-            combined_df = pd.concat(all_dfs).sort_values("timestamp")
+    async def load_handles(
+        self,
+        year: int,
+        month: int,
+        top_n: int = 10,
+        universe: Optional[str] = None,
+        timeframe: str = BASE_TIMEFRAME,
+        compact: bool = False,
+    ) -> list[DataHandle]:
+        """Ліниві handle пар місяця замість матеріалізованої таблиці.
 
+        Відсутні дні довантажуються так само, як у ``load_month``, але дані
+        не читаються: стратегії з ``StrategyBase.from_handle`` задають
+        потрібні колонки та lookback, а кожен handle читає лише їх при першому
+        зверненні (у воркері). Пари без даних за місяць пропускаються.
+        """
+        top_pairs = await self.get_top_pairs(top_n, universe)
+        start = pd.Timestamp(year=year, month=month, day=1)
+        end = start + pd.offsets.MonthBegin()
+        await self.sync(top_pairs, start, end)
+        month_key = start.strftime("%Y-%m")
+        return [
+            DataHandle(self.store, pair, start, end, timeframe, compact)
+            for pair in top_pairs
+            if self.store.has(pair, month_key)
+        ]
+
+    def _read_month(
+        self,
+        pairs: list[str],
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        compact: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        # Весь місяць - одне сканування сховища замість тисяч відкриттів файлів
+        with profiler.stage("store_read"):
+            combined_df = self.store.read(
+                pairs=pairs, start=start, end=end, columns=columns
+            )
+        if combined_df.empty:
+            return pd.DataFrame()
+        if compact:
             return combined_df
 
-        return pd.DataFrame()
+        # Сховище тримає float32; звичайний режим віддає float64
+        prices = [column for column in PRICE_COLUMNS if column in combined_df]
+        combined_df[prices] = combined_df[prices].astype("float64")
+        return combined_df
+
+    async def load_panel(
+        self,
+        year: int,
+        month: int,
+        top_n: int = 10,
+        universe: Optional[str] = None,
+        timeframe: str = BASE_TIMEFRAME,
+        fields: tuple = ("close", "high", "low"),
+        fill: str = "ffill",
+        limit: Optional[int] = None,
+        mask: str = "listing",
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """Дані місяця одразу як вирівняна панель timestamp x (поле, пара).
+
+        Індекс - рівномірна сітка ``timeframe`` з ``freq``; ``fill`` і
+        ``limit`` задають заповнення пропусків (див. ``core.panel.fill_gaps``),
+        ``mask`` - які рядки залишаються (див. ``core.panel.align_panel``).
+        Читаються лише ``fields``; ``compact`` - панель у float32.
+        """
+        if fill not in FILL_POLICIES:
+            raise ValueError(f"невідома політика заповнення: {fill}")
+        df = await self.load_month(
+            year, month, top_n, universe, timeframe, compact, columns=fields
+        )
+        with profiler.stage("to_panel"):
+            panel = align_panel(df, fields, timeframe, mask)
+            if fill == "ffill" and not panel.empty:
+                panel = fill_gaps(panel, limit)
+        return panel
 
     @staticmethod
-    async def get_top_pairs(top_n: int) -> list[str]:
-        """Асинхронне отримання списку топ-пар"""
-        url = "https://api.binance.com/api/v3/ticker/24hr"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                data = await response.json()
-                btc_pairs = [t["symbol"] for t in data if t["symbol"].endswith("BTC")]
-                return sorted(
-                    btc_pairs,
-                    key=lambda x: float(
-                        next(t["quoteVolume"] for t in data if t["symbol"] == x)
-                    ),
-                    reverse=True,
-                )[:top_n]
+    def to_panel(
+        df: pd.DataFrame, fields: tuple = ("close", "high", "low")
+    ) -> pd.DataFrame:
+        """Перетворює довгу таблицю в широку панель timestamp x (поле, пара).
+
+        ``panel["close"]`` повертає матрицю цін закриття з колонкою на пару,
+        яку стратегії можуть обробляти однією векторизованою симуляцією.
+        """
+        with profiler.stage("to_panel"):
+            return df.pivot(index="timestamp", columns="pair", values=list(fields))
+
+    async def get_top_pairs(
+        self, top_n: int, universe: Optional[str] = None
+    ) -> list[str]:
+        """Топ-пари до BTC за обсягом торгів.
+
+        Якщо задано ``universe`` і такий набір уже зафіксовано, пари беруться
+        з нього без звернення до API; інакше набір фіксується після вибору.
+        """
+        if universe is not None and self.metadata.has_universe(universe):
+            return self.metadata.universe(universe)[:top_n]
+
+        pairs = await self.metadata.top_pairs(top_n)
+        if universe is not None:
+            self.metadata.pin(universe, pairs)
+        return pairs
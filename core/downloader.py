@@ -0,0 +1,181 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+import aiohttp
+
+# Статуси, після яких запит має сенс повторити. 429 - перевищено ліміт
+# запитів, 418 - Binance тимчасово заблокував IP після ігнорування 429.
+RETRY_STATUSES = {418, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class DownloadStats:
+    """Прогрес і пропускна здатність завантаження"""
+
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    retries: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Байт за секунду з початку завантаження"""
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        finished = self.done + self.failed
+        percent = finished / self.total * 100 if self.total else 100.0
+        return (
+            f"📥 {finished}/{self.total} ({percent:.1f}%), "
+            f"помилок {self.failed}, повторів {self.retries}, "
+            f"{self.bytes / 2**20:.1f} MiB, {self.throughput / 2**20:.2f} MiB/s"
+        )
+
+
+@dataclass
+class Download:
+    """Відповідь сервера після всіх повторів"""
+
+    status: int
+    content: Optional[bytes] = None
+    etag: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.content or b"")
+
+
+class DownloadScheduler:
+    """Планувальник завантажень з обмеженням паралельності та повторами.
+
+    Кількість одночасних запитів обмежується семафором, з'єднання
+    перевикористовуються через ``TCPConnector`` з keep-alive, а відповіді
+    429/418/5xx і мережеві помилки повторюються з експоненційною затримкою,
+    яка враховує заголовок ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 16,
+        limit_per_host: int = 16,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 60.0,
+        timeout: float = 60.0,
+        keepalive_timeout: float = 30.0,
+        progress_every: int = 100,
+        on_progress: Optional[Callable[[DownloadStats], None]] = print,
+    ):
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.progress_every = progress_every
+        self.on_progress = on_progress
+        self.stats = DownloadStats()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def session(self) -> aiohttp.ClientSession:
+        """Сесія з пулом з'єднань, налаштованим під ліміти планувальника"""
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    def start(self, total: int):
+        """Скидає лічильники перед новою партією з ``total`` завантажень"""
+        self.stats = DownloadStats(total=total)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def finish(self):
+        """Звітує про підсумок партії"""
+        if self.on_progress is not None:
+            self.on_progress(self.stats)
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Затримка перед наступною спробою (секунди)"""
+        delay = self.backoff * 2**attempt
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    moment = parsedate_to_datetime(retry_after).timestamp()
+                    delay = moment - time.time()
+                except (TypeError, ValueError):
+                    pass
+        return min(max(delay, 0.0), self.max_backoff)
+
+    def _record(self, content: Optional[bytes], failed: bool):
+        if failed:
+            self.stats.failed += 1
+        else:
+            self.stats.done += 1
+            self.stats.bytes += len(content or b"")
+
+        finished = self.stats.done + self.stats.failed
+        if (
+            self.on_progress is not None
+            and self.progress_every
+            and finished % self.progress_every == 0
+        ):
+            self.on_progress(self.stats)
+
+    async def request(
+        self, session: aiohttp.ClientSession, url: str, etag: Optional[str] = None
+    ) -> Download:
+        """GET з повторами; з ``etag`` запит умовний (``If-None-Match``).
+
+        Статус 304 означає, що файл не змінився; 0 - всі спроби вичерпано
+        через мережеві помилки.
+        """
+        if self._semaphore is None:
+            self.start(total=1)
+
+        headers = {"If-None-Match": etag} if etag else None
+        status = 0
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                retry_after = None
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        status = response.status
+                        if status == 200:
+                            content = await response.read()
+                            self._record(content, failed=False)
+                            return Download(
+                                status, content, response.headers.get("ETag")
+                            )
+                        if status not in RETRY_STATUSES:
+                            if status not in (304, 404):
+                                print(f"❌ Помилка завантаження {url}: {status}")
+                            self._record(None, failed=status not in (304, 404))
+                            return Download(status, etag=response.headers.get("ETag"))
+                        retry_after = response.headers.get("Retry-After")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"⚠️ {url}: {e!r}")
+
+                if attempt < self.retries:
+                    self.stats.retries += 1
+                    await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
+        print(f"❌ Вичерпано спроби для {url}")
+        self._record(None, failed=True)
+        return Download(status)
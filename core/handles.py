@@ -0,0 +1,104 @@
+import hashlib
+import os
+from typing import Iterable, Optional
+import pandas as pd
+from core.profiling import profiler
+from core.store import PRICE_COLUMNS, MonthStore
+from core.timeframes import BASE_TIMEFRAME, is_base, resample_ohlcv, timeframe_offset
+
+
+class DataHandle:
+    """Лінивий доступ до свічок однієї пари у ``MonthStore``.
+
+    Нічого не читає до першого ``load``: стратегії, створені через
+    ``StrategyBase.from_handle``, лише додають свої колонки та lookback
+    (``require``), а читання - одне сканування розділів пари з проекцією
+    колонок і фільтром за часом. Після задачі ``release`` звільняє дані,
+    тож у пам'яті одночасно лише пари, що зараз рахуються.
+    """
+
+    def __init__(
+        self,
+        store: MonthStore,
+        pair: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        timeframe: str = BASE_TIMEFRAME,
+        compact: bool = False,
+    ):
+        """Діапазон ``[start, end)``; ``compact`` - ціни у float32 сховища"""
+        self.store = store
+        self.pair = pair
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end)
+        self.timeframe = timeframe
+        self.compact = compact
+        self.columns: list[str] = []
+        self.lookback = 0
+        self._frame: Optional[pd.DataFrame] = None
+
+    def require(self, columns: Iterable[str], lookback: int = 0) -> "DataHandle":
+        """Додає колонки та кількість свічок прогріву до ``start``.
+
+        Якщо дані вже прочитані без них, вони будуть перечитані при
+        наступному ``load``.
+        """
+        new = [column for column in columns if column not in self.columns]
+        if new or lookback > self.lookback:
+            self.columns.extend(new)
+            self.lookback = max(self.lookback, lookback)
+            self.release()
+        return self
+
+    @property
+    def read_start(self) -> pd.Timestamp:
+        """Початок читання з урахуванням прогріву індикаторів"""
+        return self.start - self.lookback * timeframe_offset(self.timeframe)
+
+    @property
+    def loaded(self) -> bool:
+        return self._frame is not None
+
+    def load(self) -> pd.DataFrame:
+        """Свічки пари (індекс - час, колонки - ``columns``); читаються один раз"""
+        if self._frame is None:
+            with profiler.stage("handle_read", pair=self.pair):
+                self._frame = self._read()
+        return self._frame
+
+    def _read(self) -> pd.DataFrame:
+        columns = [column for column in PRICE_COLUMNS if column in self.columns]
+        df = self.store.read(
+            pairs=[self.pair],
+            start=self.read_start,
+            end=self.end,
+            columns=columns,
+        )
+        if df.empty:
+            return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([]))
+        if not is_base(self.timeframe):
+            df = resample_ohlcv(df, self.timeframe)
+        df = df.set_index("timestamp")[columns]
+        return df if self.compact else df.astype("float64")
+
+    def release(self):
+        """Звільняє прочитані дані; наступний ``load`` прочитає їх знову"""
+        self._frame = None
+
+    def fingerprint(self) -> str:
+        """Відбиток даних без їх читання: пара, діапазон, таймфрейм і
+        розмір та час зміни файлів розділів пари"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            repr(
+                (self.pair, str(self.read_start), str(self.end), self.timeframe)
+            ).encode()
+        )
+        for path in self.store.files(self.pair):
+            stat = os.stat(path)
+            digest.update(repr((path, stat.st_size, stat.st_mtime_ns)).encode())
+        return digest.hexdigest()
+
+    def __getstate__(self):
+        # У воркер передаються лише параметри читання, без даних
+        return {**self.__dict__, "_frame": None}
@@ -0,0 +1,268 @@
+import hashlib
+import os
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Union
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+
+PandasObject = Union[pd.Series, pd.DataFrame]
+
+# id(об'єкта) -> (слабке посилання, відбиток); дані однієї пари зазвичай
+# запитуються кількома індикаторами поспіль, тож хешуються один раз.
+# Дані вважаються незмінними: зміна на місці не оновлює відбиток
+_fingerprints: dict[int, tuple[weakref.ref, str]] = {}
+
+
+def fingerprint(obj: PandasObject) -> str:
+    """Відбиток вмісту Series/DataFrame: значення, індекс та назви колонок"""
+    memo = _fingerprints.get(id(obj))
+    if memo is not None and memo[0]() is obj:
+        return memo[1]
+
+    digest = hashlib.blake2b(digest_size=16)
+    columns = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+    digest.update(repr(list(columns)).encode())
+    digest.update(np.ascontiguousarray(obj.index.to_numpy()).tobytes())
+    digest.update(np.ascontiguousarray(obj.to_numpy()).tobytes())
+    value = digest.hexdigest()
+
+    key = id(obj)
+    _fingerprints[key] = (
+        weakref.ref(obj, lambda _: _fingerprints.pop(key, None)),
+        value,
+    )
+    return value
+
+
+def _nbytes(value: PandasObject) -> int:
+    return int(value.to_numpy().nbytes + value.index.nbytes)
+
+
+class IndicatorCache:
+    """Кеш індикаторів з ключем (пара, відбиток даних, індикатор, параметри).
+
+    У пам'яті - LRU з обмеженням за обсягом у байтах. Якщо задано
+    ``disk_dir``, значення також зберігаються як ``.npy`` і переживають
+    перезапуск: на диску лише масив, індекс і колонки відновлюються з вхідних
+    даних, з якими вирівняний кожен індикатор.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.nbytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, PandasObject] = OrderedDict()
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _disk_path(self, key: Hashable) -> str:
+        # Версія vectorbt входить у ключ: інша реалізація - інші значення
+        name = hashlib.blake2b(
+            repr((vbt.__version__, key)).encode(), digest_size=16
+        ).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.npy")
+
+    def get(self, key: Hashable, template: PandasObject) -> Optional[PandasObject]:
+        """Значення за ключем або ``None``; ``template`` - вхід індикатора"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                values = np.load(path)
+                if isinstance(template, pd.DataFrame):
+                    value = pd.DataFrame(
+                        values, index=template.index, columns=template.columns
+                    )
+                else:
+                    value = pd.Series(values, index=template.index, name=template.name)
+                self.disk_hits += 1
+                self._remember(key, value)
+                return value
+        return None
+
+    def put(self, key: Hashable, value: PandasObject):
+        """Зберігає значення у пам'яті та, якщо задано, на диску"""
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, value.to_numpy())
+            os.replace(tmp_path, path)
+        self._remember(key, value)
+
+    def _remember(self, key: Hashable, value: PandasObject):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.nbytes -= _nbytes(self._entries.pop(key))
+        self._entries[key] = value
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _nbytes(evicted)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        template: PandasObject,
+        compute: Callable[[], PandasObject],
+    ) -> PandasObject:
+        value = self.get(key, template)
+        if value is None:
+            self.misses += 1
+            value = compute()
+            self.put(key, value)
+        return value
+
+
+# Спільний кеш процесу: стратегії однієї пари перевикористовують індикатори
+shared_cache = IndicatorCache()
+
+
+def _key(pair: Optional[str], name: str, inputs: tuple, **params) -> tuple:
+    return (
+        pair,
+        tuple(fingerprint(obj) for obj in inputs),
+        name,
+        tuple(sorted(params.items())),
+    )
+
+
+def _like(value: PandasObject, template: PandasObject) -> PandasObject:
+    """Назва Series як у входу - так само, як при відновленні з диска"""
+    if isinstance(value, pd.Series) and value.name != template.name:
+        return value.rename(template.name)
+    return value
+
+
+def _cached(
+    cache: Optional[IndicatorCache],
+    pair: Optional[str],
+    name: str,
+    inputs: tuple,
+    compute: Callable[[], PandasObject],
+    **params,
+) -> PandasObject:
+    template = inputs[0]
+    if cache is None:
+        return _like(compute(), template)
+    key = _key(pair, name, inputs, **params)
+    return cache.get_or_compute(key, template, lambda: _like(compute(), template))
+
+
+def ma(
+    close: PandasObject,
+    window: int,
+    cache: Optional[IndicatorCache] = None,
+    pair: Optional[str] = None,
+) -> PandasObject:
+    """Проста ковзна середня"""
+    return _cached(
+        cache,
+        pair,
+        "ma",
+        (close,),
+        lambda: vbt.MA.run(close, window, hide_params=["window"]).ma,
+        window=window,
+    )
+
+
+def rsi(
+    close: PandasObject,
+    window: int,
+    cache: Optional[IndicatorCache] = None,
+    pair: Optional[str] = None,
+) -> PandasObject:
+    """Індекс відносної сили"""
+    return _cached(
+        cache,
+        pair,
+        "rsi",
+        (close,),
+        lambda: vbt.RSI.run(close, window, hide_params=["window"]).rsi,
+        window=window,
+    )
+
+
+def bbands(
+    close: PandasObject,
+    window: int,
+    bb_std: float,
+    cache: Optional[IndicatorCache] = None,
+    pair: Optional[str] = None,
+) -> tuple[PandasObject, PandasObject]:
+    """Нижня та верхня смуги Боллінджера (обидві за один розрахунок)"""
+
+    def compute():
+        return vbt.BBANDS.run(close, window, bb_std, hide_params=["window", "ewm"])
+
+    if cache is None:
+        bb = compute()
+        return bb.lower, bb.upper
+
+    keys = [
+        _key(pair, f"bbands.{band}", (close,), window=window, bb_std=bb_std)
+        for band in ("lower", "upper")
+    ]
+    lower, upper = (cache.get(key, close) for key in keys)
+    if lower is None or upper is None:
+        cache.misses += 1
+        bb = compute()
+        lower, upper = bb.lower, bb.upper
+        cache.put(keys[0], lower)
+        cache.put(keys[1], upper)
+    return lower, upper
+
+
+def atr(
+    high: PandasObject,
+    low: PandasObject,
+    close: PandasObject,
+    window: int,
+    cache: Optional[IndicatorCache] = None,
+    pair: Optional[str] = None,
+) -> PandasObject:
+    """Середній істинний діапазон"""
+    return _cached(
+        cache,
+        pair,
+        "atr",
+        (close, high, low),
+        lambda: vbt.ATR.run(high, low, close, window, hide_params=["window"]).atr,
+        window=window,
+    )
+
+
+def rolling_mean(
+    values: PandasObject,
+    window: int,
+    cache: Optional[IndicatorCache] = None,
+    pair: Optional[str] = None,
+) -> PandasObject:
+    """Ковзне середнє довільного ряду (pandas ``rolling``)"""
+    return _cached(
+        cache,
+        pair,
+        "rolling_mean",
+        (values,),
+        lambda: values.rolling(window).mean(),
+        window=window,
+    )
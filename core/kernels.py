@@ -0,0 +1,632 @@
+from typing import NamedTuple, Union
+import numpy as np
+import pandas as pd
+from numba import njit
+
+PandasObject = Union[pd.Series, pd.DataFrame]
+
+# Кожне ядро проходить колонку один раз і тримає лише кільцеві буфери
+# розміром з вікно. Арифметика повторює vectorbt (``rolling_mean_1d_nb``,
+# ``ewm_mean_1d_nb``, ``ewm_std_1d_nb``, ``crossed_above_1d_nb``) та pandas
+# (``roll_mean`` з компенсацією Кехена) операція в операцію, тож сигнали
+# збігаються біт у біт. ``error_model="numpy"``: ділення на нуль дає inf/nan,
+# як у векторизованих операціях numpy. Кроки, спільні з потоковими ядрами
+# (``*_update_nb``), вбудовуються (``inline="always"``) у цикл ядра.
+
+
+@njit(cache=True)
+def _sma_step(value, i, window, cumsum, nancnt, sums, nans):
+    """Крок ``rolling_mean_1d_nb`` (minp=window); повертає (mean, cumsum, nancnt)"""
+    if np.isnan(value):
+        nancnt = nancnt + 1
+    else:
+        cumsum = cumsum + value
+    j = i % window
+    if i < window:
+        window_len = i + 1 - nancnt
+        window_sum = cumsum
+    else:
+        window_len = window - (nancnt - nans[j])
+        window_sum = cumsum - sums[j]
+    sums[j] = cumsum
+    nans[j] = nancnt
+    if window_len < window:
+        return np.nan, cumsum, nancnt
+    return window_sum / window_len, cumsum, nancnt
+
+
+@njit(cache=True)
+def _ewm_weights(span):
+    """Вага старого значення та нового спостереження для EWM (adjust=False)"""
+    com = (span - 1) / 2.0
+    alpha = 1.0 / (1.0 + com)
+    return 1.0 - alpha, alpha
+
+
+@njit(cache=True)
+def _ewm_mean_step(value, i, avg, nobs, old_wt, old_wt_factor, new_wt):
+    """Крок ``ewm_mean_1d_nb`` (adjust=False); повертає (avg, nobs, old_wt)"""
+    is_observation = value == value
+    if i == 0:
+        return value, int(is_observation), 1.0
+    nobs += is_observation
+    if avg == avg:
+        old_wt *= old_wt_factor
+        if is_observation:
+            if avg != value:
+                avg = ((old_wt * avg) + (new_wt * value)) / (old_wt + new_wt)
+            old_wt = 1.0
+    elif is_observation:
+        avg = value
+    return avg, nobs, old_wt
+
+
+@njit(cache=True)
+def _crossed_above_step(a1, a2, was_below, crossed_ago):
+    """Крок ``crossed_above_1d_nb`` з wait=0; повертає (out, was_below, crossed_ago)"""
+    if np.isnan(a1) or np.isnan(a2):
+        return False, False, -1
+    if a1 > a2:
+        if was_below:
+            crossed_ago += 1
+            return crossed_ago == 0, was_below, crossed_ago
+        return False, was_below, crossed_ago
+    if a1 == a2:
+        return False, was_below, -1
+    return False, True, -1
+
+
+@njit(cache=True, error_model="numpy")
+def crossover_signals_nb(close, fast_window, slow_window):
+    """Входи/виходи перетину двох SMA для кожної колонки ``close`` (2D)"""
+    n, n_cols = close.shape
+    entries = np.empty((n, n_cols), dtype=np.bool_)
+    exits = np.empty((n, n_cols), dtype=np.bool_)
+    fast_sums = np.empty(fast_window)
+    fast_nans = np.empty(fast_window, dtype=np.int64)
+    slow_sums = np.empty(slow_window)
+    slow_nans = np.empty(slow_window, dtype=np.int64)
+
+    for col in range(n_cols):
+        fast_sum = 0.0
+        fast_nan = 0
+        slow_sum = 0.0
+        slow_nan = 0
+        entry_below, entry_ago = False, -1
+        exit_below, exit_ago = False, -1
+        for i in range(n):
+            value = close[i, col]
+            fast, fast_sum, fast_nan = _sma_step(
+                value, i, fast_window, fast_sum, fast_nan, fast_sums, fast_nans
+            )
+            slow, slow_sum, slow_nan = _sma_step(
+                value, i, slow_window, slow_sum, slow_nan, slow_sums, slow_nans
+            )
+            entries[i, col], entry_below, entry_ago = _crossed_above_step(
+                fast, slow, entry_below, entry_ago
+            )
+            exits[i, col], exit_below, exit_ago = _crossed_above_step(
+                slow, fast, exit_below, exit_ago
+            )
+    return entries, exits
+
+
+@njit(cache=True, inline="always", error_model="numpy")
+def _rsi_step(price, prev_close, i, window, up_state, down_state, up_ring, down_ring):
+    """Крок RSI (SMA приростів і спадів); ``*_state`` - пари (cumsum, nancnt)"""
+    delta = price - prev_close
+    up = 0.0 if delta < 0 else delta
+    down = abs(0.0 if delta > 0 else delta)
+    up_sums, up_nans = up_ring
+    down_sums, down_nans = down_ring
+    roll_up, up_sum, up_nan = _sma_step(
+        up, i, window, up_state[0], up_state[1], up_sums, up_nans
+    )
+    roll_down, down_sum, down_nan = _sma_step(
+        down, i, window, down_state[0], down_state[1], down_sums, down_nans
+    )
+    rsi = 100 - 100 / (1 + roll_up / roll_down)
+    return rsi, (up_sum, up_nan), (down_sum, down_nan)
+
+
+@njit(cache=True)
+def _ewm_std_init(price):
+    """Стан ``ewm_std_1d_nb`` після першого значення: (mean, nobs, cov, sum_wt,
+    sum_wt2, old_wt)"""
+    nobs = int(price == price)
+    mean = price if nobs else np.nan
+    return mean, nobs, 0.0, 1.0, 1.0, 1.0
+
+
+@njit(cache=True, inline="always", error_model="numpy")
+def _ewm_std_step(price, window, state, old_wt_factor, new_wt):
+    """Крок ``ewm_std_1d_nb`` (adjust=False) для i > 0; повертає (std, state)"""
+    mean, nobs, cov, sum_wt, sum_wt2, old_wt = state
+    is_observation = price == price
+    nobs += is_observation
+    if mean == mean:
+        sum_wt *= old_wt_factor
+        sum_wt2 *= old_wt_factor * old_wt_factor
+        old_wt *= old_wt_factor
+        if is_observation:
+            old_mean = mean
+            if mean != price:
+                mean = ((old_wt * old_mean) + (new_wt * price)) / (old_wt + new_wt)
+            cov = (
+                (old_wt * (cov + ((old_mean - mean) * (old_mean - mean))))
+                + (new_wt * ((price - mean) * (price - mean)))
+            ) / (old_wt + new_wt)
+            sum_wt += new_wt
+            sum_wt2 += new_wt * new_wt
+            old_wt += new_wt
+            sum_wt /= old_wt
+            sum_wt2 /= old_wt * old_wt
+            old_wt = 1.0
+    elif is_observation:
+        mean = price
+
+    variance = np.nan
+    if nobs >= window:
+        numerator = sum_wt * sum_wt
+        denominator = numerator - sum_wt2
+        if denominator > 0.0:
+            variance = (numerator / denominator) * cov
+    return np.sqrt(variance), (mean, nobs, cov, sum_wt, sum_wt2, old_wt)
+
+
+@njit(cache=True, inline="always", error_model="numpy")
+def _roll_mean_step(value, i, window, ring, sums, counts):
+    """Крок pandas ``roll_mean`` з компенсацією Кехена.
+
+    ``sums`` - (sum_x, compensation_add, compensation_remove, prev_value),
+    ``counts`` - (nobs, neg_ct, num_same); повертає (mean, sums, counts).
+    """
+    sum_x, compensation_add, compensation_remove, prev_value = sums
+    nobs, neg_ct, num_same = counts
+    j = i % window
+    if i == 0 or window == 1:
+        sum_x = 0.0
+        compensation_add = 0.0
+        compensation_remove = 0.0
+        nobs = 0
+        neg_ct = 0
+        num_same = 0
+        prev_value = value
+    elif i >= window:
+        removed = ring[j]
+        if removed == removed:
+            nobs -= 1
+            y = -removed - compensation_remove
+            t = sum_x + y
+            compensation_remove = t - sum_x - y
+            sum_x = t
+            if np.signbit(removed):
+                neg_ct -= 1
+    ring[j] = value
+    if value == value:
+        nobs += 1
+        y = value - compensation_add
+        t = sum_x + y
+        compensation_add = t - sum_x - y
+        sum_x = t
+        if np.signbit(value):
+            neg_ct += 1
+        if value == prev_value:
+            num_same += 1
+        else:
+            num_same = 1
+        prev_value = value
+
+    mean = np.nan
+    if nobs >= window and nobs > 0:
+        mean = sum_x / nobs
+        if num_same >= nobs:
+            mean = prev_value
+        elif neg_ct == 0 and mean < 0:
+            mean = 0.0
+        elif neg_ct == nobs and mean > 0:
+            mean = 0.0
+    return (
+        mean,
+        (sum_x, compensation_add, compensation_remove, prev_value),
+        (nobs, neg_ct, num_same),
+    )
+
+
+@njit(cache=True, inline="always")
+def _true_range(high, low, prev_close):
+    tr1 = high - low
+    tr2 = abs(high - prev_close)
+    tr3 = abs(low - prev_close)
+    return max(tr1, tr2, tr3)
+
+
+@njit(cache=True, inline="always")
+def _rsi_bb_flags(price, rsi, ma, mstd, atr, atr_mean):
+    """(long_entry, long_exit, short_entry, short_exit) для однієї свічки"""
+    bb_upper = ma + 2 * mstd
+    bb_lower = ma - 2 * mstd
+    atr_filter = atr > atr_mean * 0.5
+    long_entry = (rsi < 45) & (price <= bb_lower * 1.02) & atr_filter
+    short_entry = (rsi > 55) & (price >= bb_upper * 0.98) & atr_filter
+    return long_entry, rsi >= 50, short_entry, rsi <= 50
+
+
+@njit(cache=True, error_model="numpy")
+def rsi_bb_signals_nb(
+    close, high, low, rsi_window, bb_window, atr_window, atr_mean_window
+):
+    """Сигнали ``RSIWithBB`` за один прохід по кожній колонці.
+
+    RSI - SMA приростів, смуги Боллінджера - EWM середнє ± 2 EWM std,
+    фільтр - ATR (EWM true range) вище половини його pandas-середнього.
+    Повертає (long_entry, long_exit, short_entry, short_exit).
+    """
+    n, n_cols = close.shape
+    long_entry = np.empty((n, n_cols), dtype=np.bool_)
+    long_exit = np.empty((n, n_cols), dtype=np.bool_)
+    short_entry = np.empty((n, n_cols), dtype=np.bool_)
+    short_exit = np.empty((n, n_cols), dtype=np.bool_)
+
+    up_ring = (np.empty(rsi_window), np.empty(rsi_window, dtype=np.int64))
+    down_ring = (np.empty(rsi_window), np.empty(rsi_window, dtype=np.int64))
+    atr_ring = np.empty(atr_mean_window)
+
+    old_wt_factor, new_wt = _ewm_weights(bb_window)
+    atr_old_wt_factor, atr_new_wt = _ewm_weights(atr_window)
+
+    for col in range(n_cols):
+        up_state, down_state = (0.0, 0), (0.0, 0)
+        prev_close = np.nan
+        ewm_avg, ewm_nobs, ewm_old_wt = np.nan, 0, 1.0
+        atr_avg, atr_nobs, atr_old_wt = np.nan, 0, 1.0
+        std_state = _ewm_std_init(close[0, col])
+        mean_sums, mean_counts = (0.0, 0.0, 0.0, np.nan), (0, 0, 0)
+
+        for i in range(n):
+            price = close[i, col]
+            rsi, up_state, down_state = _rsi_step(
+                price,
+                prev_close,
+                i,
+                rsi_window,
+                up_state,
+                down_state,
+                up_ring,
+                down_ring,
+            )
+
+            # Смуги Боллінджера
+            ewm_avg, ewm_nobs, ewm_old_wt = _ewm_mean_step(
+                price, i, ewm_avg, ewm_nobs, ewm_old_wt, old_wt_factor, new_wt
+            )
+            ma = ewm_avg if ewm_nobs >= bb_window else np.nan
+            mstd = np.nan
+            if i > 0:
+                mstd, std_state = _ewm_std_step(
+                    price, bb_window, std_state, old_wt_factor, new_wt
+                )
+
+            # ATR та його ковзне середнє (pandas rolling)
+            tr = _true_range(high[i, col], low[i, col], prev_close)
+            atr_avg, atr_nobs, atr_old_wt = _ewm_mean_step(
+                tr, i, atr_avg, atr_nobs, atr_old_wt, atr_old_wt_factor, atr_new_wt
+            )
+            atr = atr_avg if atr_nobs >= atr_window else np.nan
+            atr_mean, mean_sums, mean_counts = _roll_mean_step(
+                atr, i, atr_mean_window, atr_ring, mean_sums, mean_counts
+            )
+
+            (
+                long_entry[i, col],
+                long_exit[i, col],
+                short_entry[i, col],
+                short_exit[i, col],
+            ) = _rsi_bb_flags(price, rsi, ma, mstd, atr, atr_mean)
+            prev_close = price
+    return long_entry, long_exit, short_entry, short_exit
+
+
+class CrossoverState(NamedTuple):
+    """Стан потокового перетину SMA: масиви з рядком на колонку (пару)"""
+
+    bars: np.ndarray
+    fast_sum: np.ndarray
+    fast_nan: np.ndarray
+    fast_sums: np.ndarray
+    fast_nans: np.ndarray
+    slow_sum: np.ndarray
+    slow_nan: np.ndarray
+    slow_sums: np.ndarray
+    slow_nans: np.ndarray
+    entry_below: np.ndarray
+    entry_ago: np.ndarray
+    exit_below: np.ndarray
+    exit_ago: np.ndarray
+
+    @classmethod
+    def create(cls, n_cols: int, fast_window: int, slow_window: int):
+        return cls(
+            bars=np.zeros(n_cols, dtype=np.int64),
+            fast_sum=np.zeros(n_cols),
+            fast_nan=np.zeros(n_cols, dtype=np.int64),
+            fast_sums=np.empty((n_cols, fast_window)),
+            fast_nans=np.empty((n_cols, fast_window), dtype=np.int64),
+            slow_sum=np.zeros(n_cols),
+            slow_nan=np.zeros(n_cols, dtype=np.int64),
+            slow_sums=np.empty((n_cols, slow_window)),
+            slow_nans=np.empty((n_cols, slow_window), dtype=np.int64),
+            entry_below=np.zeros(n_cols, dtype=np.bool_),
+            entry_ago=np.full(n_cols, -1, dtype=np.int64),
+            exit_below=np.zeros(n_cols, dtype=np.bool_),
+            exit_ago=np.full(n_cols, -1, dtype=np.int64),
+        )
+
+
+@njit(cache=True, error_model="numpy")
+def crossover_update_nb(cols, close, fast_window, slow_window, state):
+    """Одна нова свічка для колонок ``cols``: O(1) на пару.
+
+    Кожна колонка має власний лічильник свічок, тож сигнали пари збігаються
+    з ``crossover_signals_nb`` над її власним рядом. Повертає (entries, exits)
+    у порядку ``cols``.
+    """
+    n = len(cols)
+    entries = np.empty(n, dtype=np.bool_)
+    exits = np.empty(n, dtype=np.bool_)
+    for k in range(n):
+        col = cols[k]
+        i = state.bars[col]
+        value = close[k]
+        fast, fast_sum, fast_nan = _sma_step(
+            value,
+            i,
+            fast_window,
+            state.fast_sum[col],
+            state.fast_nan[col],
+            state.fast_sums[col],
+            state.fast_nans[col],
+        )
+        slow, slow_sum, slow_nan = _sma_step(
+            value,
+            i,
+            slow_window,
+            state.slow_sum[col],
+            state.slow_nan[col],
+            state.slow_sums[col],
+            state.slow_nans[col],
+        )
+        entries[k], entry_below, entry_ago = _crossed_above_step(
+            fast, slow, state.entry_below[col], state.entry_ago[col]
+        )
+        exits[k], exit_below, exit_ago = _crossed_above_step(
+            slow, fast, state.exit_below[col], state.exit_ago[col]
+        )
+
+        state.bars[col] = i + 1
+        state.fast_sum[col] = fast_sum
+        state.fast_nan[col] = fast_nan
+        state.slow_sum[col] = slow_sum
+        state.slow_nan[col] = slow_nan
+        state.entry_below[col] = entry_below
+        state.entry_ago[col] = entry_ago
+        state.exit_below[col] = exit_below
+        state.exit_ago[col] = exit_ago
+    return entries, exits
+
+
+class RSIBBState(NamedTuple):
+    """Стан потокових сигналів ``RSIWithBB``: масиви з рядком на колонку"""
+
+    bars: np.ndarray
+    prev_close: np.ndarray
+    # RSI: (cumsum, nancnt) та кільцеві буфери SMA приростів і спадів
+    up_sum: np.ndarray
+    up_nan: np.ndarray
+    up_sums: np.ndarray
+    up_nans: np.ndarray
+    down_sum: np.ndarray
+    down_nan: np.ndarray
+    down_sums: np.ndarray
+    down_nans: np.ndarray
+    # EWM середнє та std смуг Боллінджера
+    ewm_avg: np.ndarray
+    ewm_nobs: np.ndarray
+    ewm_old_wt: np.ndarray
+    std_floats: np.ndarray
+    std_nobs: np.ndarray
+    # ATR (EWM true range) та його pandas-середнє
+    atr_avg: np.ndarray
+    atr_nobs: np.ndarray
+    atr_old_wt: np.ndarray
+    atr_ring: np.ndarray
+    mean_sums: np.ndarray
+    mean_counts: np.ndarray
+
+    @classmethod
+    def create(cls, n_cols: int, rsi_window: int, atr_mean_window: int):
+        return cls(
+            bars=np.zeros(n_cols, dtype=np.int64),
+            prev_close=np.full(n_cols, np.nan),
+            up_sum=np.zeros(n_cols),
+            up_nan=np.zeros(n_cols, dtype=np.int64),
+            up_sums=np.empty((n_cols, rsi_window)),
+            up_nans=np.empty((n_cols, rsi_window), dtype=np.int64),
+            down_sum=np.zeros(n_cols),
+            down_nan=np.zeros(n_cols, dtype=np.int64),
+            down_sums=np.empty((n_cols, rsi_window)),
+            down_nans=np.empty((n_cols, rsi_window), dtype=np.int64),
+            ewm_avg=np.full(n_cols, np.nan),
+            ewm_nobs=np.zeros(n_cols, dtype=np.int64),
+            ewm_old_wt=np.ones(n_cols),
+            # mean, cov, sum_wt, sum_wt2, old_wt
+            std_floats=np.empty((n_cols, 5)),
+            std_nobs=np.zeros(n_cols, dtype=np.int64),
+            atr_avg=np.full(n_cols, np.nan),
+            atr_nobs=np.zeros(n_cols, dtype=np.int64),
+            atr_old_wt=np.ones(n_cols),
+            atr_ring=np.empty((n_cols, atr_mean_window)),
+            # sum_x, compensation_add, compensation_remove, prev_value
+            mean_sums=np.empty((n_cols, 4)),
+            # nobs, neg_ct, num_same
+            mean_counts=np.empty((n_cols, 3), dtype=np.int64),
+        )
+
+
+@njit(cache=True, error_model="numpy")
+def rsi_bb_update_nb(
+    cols, close, high, low, rsi_window, bb_window, atr_window, atr_mean_window, state
+):
+    """Одна нова свічка ``RSIWithBB`` для колонок ``cols``: O(1) на пару.
+
+    Ті самі кроки, що й у ``rsi_bb_signals_nb``, зі станом у ``RSIBBState``.
+    Повертає (long_entry, long_exit, short_entry, short_exit) у порядку ``cols``.
+    """
+    n = len(cols)
+    long_entry = np.empty(n, dtype=np.bool_)
+    long_exit = np.empty(n, dtype=np.bool_)
+    short_entry = np.empty(n, dtype=np.bool_)
+    short_exit = np.empty(n, dtype=np.bool_)
+    old_wt_factor, new_wt = _ewm_weights(bb_window)
+    atr_old_wt_factor, atr_new_wt = _ewm_weights(atr_window)
+
+    for k in range(n):
+        col = cols[k]
+        i = state.bars[col]
+        price = close[k]
+        prev_close = state.prev_close[col]
+
+        rsi, up_state, down_state = _rsi_step(
+            price,
+            prev_close,
+            i,
+            rsi_window,
+            (state.up_sum[col], state.up_nan[col]),
+            (state.down_sum[col], state.down_nan[col]),
+            (state.up_sums[col], state.up_nans[col]),
+            (state.down_sums[col], state.down_nans[col]),
+        )
+        state.up_sum[col], state.up_nan[col] = up_state
+        state.down_sum[col], state.down_nan[col] = down_state
+
+        # Смуги Боллінджера
+        ewm_avg, ewm_nobs, ewm_old_wt = _ewm_mean_step(
+            price,
+            i,
+            state.ewm_avg[col],
+            state.ewm_nobs[col],
+            state.ewm_old_wt[col],
+            old_wt_factor,
+            new_wt,
+        )
+        state.ewm_avg[col] = ewm_avg
+        state.ewm_nobs[col] = ewm_nobs
+        state.ewm_old_wt[col] = ewm_old_wt
+        ma = ewm_avg if ewm_nobs >= bb_window else np.nan
+        mstd = np.nan
+        if i == 0:
+            std_state = _ewm_std_init(price)
+        else:
+            floats = state.std_floats[col]
+            mstd, std_state = _ewm_std_step(
+                price,
+                bb_window,
+                (
+                    floats[0],
+                    state.std_nobs[col],
+                    floats[1],
+                    floats[2],
+                    floats[3],
+                    floats[4],
+                ),
+                old_wt_factor,
+                new_wt,
+            )
+        mean, nobs, cov, sum_wt, sum_wt2, old_wt = std_state
+        state.std_floats[col, 0] = mean
+        state.std_floats[col, 1] = cov
+        state.std_floats[col, 2] = sum_wt
+        state.std_floats[col, 3] = sum_wt2
+        state.std_floats[col, 4] = old_wt
+        state.std_nobs[col] = nobs
+
+        # ATR та його ковзне середнє (pandas rolling)
+        tr = _true_range(high[k], low[k], prev_close)
+        atr_avg, atr_nobs, atr_old_wt = _ewm_mean_step(
+            tr,
+            i,
+            state.atr_avg[col],
+            state.atr_nobs[col],
+            state.atr_old_wt[col],
+            atr_old_wt_factor,
+            atr_new_wt,
+        )
+        state.atr_avg[col] = atr_avg
+        state.atr_nobs[col] = atr_nobs
+        state.atr_old_wt[col] = atr_old_wt
+        atr = atr_avg if atr_nobs >= atr_window else np.nan
+
+        sums = state.mean_sums[col]
+        counts = state.mean_counts[col]
+        atr_mean, new_sums, new_counts = _roll_mean_step(
+            atr,
+            i,
+            atr_mean_window,
+            state.atr_ring[col],
+            (sums[0], sums[1], sums[2], sums[3]),
+            (counts[0], counts[1], counts[2]),
+        )
+        sums[0], sums[1], sums[2], sums[3] = new_sums
+        counts[0], counts[1], counts[2] = new_counts
+
+        (
+            long_entry[k],
+            long_exit[k],
+            short_entry[k],
+            short_exit[k],
+        ) = _rsi_bb_flags(price, rsi, ma, mstd, atr, atr_mean)
+        state.prev_close[col] = price
+        state.bars[col] = i + 1
+    return long_entry, long_exit, short_entry, short_exit
+
+
+def _to_2d(obj: PandasObject) -> np.ndarray:
+    values = obj.to_numpy(dtype=np.float64)
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def _wrap(values: np.ndarray, like: PandasObject) -> PandasObject:
+    """Обгортає масив сигналів індексом і колонками ``like``"""
+    if isinstance(like, pd.Series):
+        return pd.Series(values[:, 0], index=like.index, name=like.name)
+    return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+
+def crossover_signals(
+    close: PandasObject, fast_window: int, slow_window: int
+) -> tuple[PandasObject, PandasObject]:
+    """Входи та виходи перетину SMA без проміжних серій ковзних середніх"""
+    entries, exits = crossover_signals_nb(_to_2d(close), fast_window, slow_window)
+    return _wrap(entries, close), _wrap(exits, close)
+
+
+def rsi_bb_signals(
+    close: PandasObject,
+    high: PandasObject,
+    low: PandasObject,
+    rsi_window: int,
+    bb_window: int,
+    atr_window: int = 14,
+    atr_mean_window: int = 50,
+) -> tuple[PandasObject, ...]:
+    """Сигнали RSI + смуг Боллінджера з ATR-фільтром одним проходом"""
+    signals = rsi_bb_signals_nb(
+        _to_2d(close),
+        _to_2d(high),
+        _to_2d(low),
+        rsi_window,
+        bb_window,
+        atr_window,
+        atr_mean_window,
+    )
+    return tuple(_wrap(values, close) for values in signals)
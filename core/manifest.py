@@ -0,0 +1,126 @@
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Статуси дня пари в маніфесті
+OK = "ok"
+MISSING = "missing"  # сервер відповів 404: пара не торгувалась цього дня
+FAILED = "failed"
+
+MANIFEST_COLUMNS = [
+    "pair",
+    "date",
+    "status",
+    "rows",
+    "checksum",
+    "etag",
+    "size",
+    "updated",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    pair TEXT NOT NULL,
+    date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    rows INTEGER,
+    checksum TEXT,
+    etag TEXT,
+    size INTEGER,
+    updated TEXT NOT NULL,
+    PRIMARY KEY (pair, date)
+)
+"""
+
+
+class Manifest:
+    """Індекс завантажених днів у SQLite.
+
+    Для кожної пари та дати зберігає статус, кількість рядків, sha256 архіву,
+    ETag і розмір відповіді сервера. Синхронізація вирішує, що завантажувати,
+    за одним запитом до маніфесту, без перевірки файлів на диску.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def get(
+        self, pairs: Iterable[str], start: str, end: str
+    ) -> dict[tuple[str, str], dict]:
+        """Записи пар за дати ``[start, end]`` (``YYYY-MM-DD``) за ключем (пара, дата)"""
+        pairs = list(pairs)
+        if not pairs:
+            return {}
+        placeholders = ",".join("?" * len(pairs))
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(MANIFEST_COLUMNS)} FROM days "
+            f"WHERE pair IN ({placeholders}) AND date BETWEEN ? AND ?",
+            [*pairs, start, end],
+        )
+        return {
+            (row[0], row[1]): dict(zip(MANIFEST_COLUMNS, row))
+            for row in cursor.fetchall()
+        }
+
+    def record(self, entries: Iterable[dict]):
+        """Додає або оновлює записи (ключі - ``MANIFEST_COLUMNS`` без ``updated``)"""
+        updated = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        rows = [
+            tuple(entry.get(name) for name in MANIFEST_COLUMNS[:-1]) + (updated,)
+            for entry in entries
+        ]
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO days ({', '.join(MANIFEST_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(MANIFEST_COLUMNS))})",
+            rows,
+        )
+        self.connection.commit()
+
+    def frame(self, pairs: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Вміст маніфесту у вигляді таблиці"""
+        query = f"SELECT {', '.join(MANIFEST_COLUMNS)} FROM days"
+        params: list = []
+        if pairs is not None:
+            pairs = list(pairs)
+            query += f" WHERE pair IN ({','.join('?' * len(pairs))})"
+            params = pairs
+        return pd.read_sql_query(
+            query + " ORDER BY pair, date", self.connection, params=params
+        )
+
+    def verify(self, data_dir: str) -> list[tuple[str, str]]:
+        """Перевіряє денні файли зі статусом ``ok`` і позначає пошкоджені.
+
+        Файл вважається пошкодженим, якщо його немає, він не читається або
+        кількість рядків не збігається із записаною. Такі дні отримують статус
+        ``failed`` і будуть завантажені повторно при наступній синхронізації.
+        """
+        cursor = self.connection.execute(
+            "SELECT pair, date, rows FROM days WHERE status = ?", (OK,)
+        )
+        broken = []
+        for pair, date, rows in cursor.fetchall():
+            path = os.path.join(data_dir, f"{pair}_{date}.parquet")
+            try:
+                valid = pq.read_metadata(path).num_rows == rows
+            except (OSError, ValueError):
+                valid = False
+            if not valid:
+                broken.append((pair, date))
+
+        self.connection.executemany(
+            "UPDATE days SET status = ? WHERE pair = ? AND date = ?",
+            [(FAILED, pair, date) for pair, date in broken],
+        )
+        self.connection.commit()
+        return broken
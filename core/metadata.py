@@ -0,0 +1,104 @@
+import asyncio
+import heapq
+import json
+import os
+import time
+from typing import Optional
+import aiohttp
+
+TICKER_URL = "https://api.binance.com/api/v3/ticker/24hr"
+
+
+def volume_index(tickers: list[dict], quote: str = "BTC") -> dict[str, float]:
+    """Символ -> денний обсяг у котирувальній валюті за один прохід"""
+    return {
+        ticker["symbol"]: float(ticker["quoteVolume"])
+        for ticker in tickers
+        if ticker["symbol"].endswith(quote)
+    }
+
+
+def top_by_volume(volumes: dict[str, float], top_n: int) -> list[str]:
+    """``top_n`` символів з найбільшим обсягом (купа замість повного сортування)"""
+    return heapq.nlargest(top_n, volumes, key=volumes.__getitem__)
+
+
+class ExchangeMetadata:
+    """Метадані біржі зі збереженням на диску.
+
+    Знімок ``ticker/24hr`` кешується у ``root`` на ``ttl`` секунд; якщо API
+    недоступне, використовується останній збережений знімок. Зафіксовані
+    набори пар (``pin``) дозволяють повторювати бектест без мережі.
+    """
+
+    def __init__(
+        self,
+        root: str = os.path.join("data", "metadata"),
+        ttl: float = 3600.0,
+        url: str = TICKER_URL,
+    ):
+        self.root = root
+        self.ttl = ttl
+        self.url = url
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.root, "ticker_24hr.json")
+
+    def _universe_path(self, name: str) -> str:
+        return os.path.join(self.root, f"universe_{name}.json")
+
+    def _read_snapshot(self) -> Optional[dict]:
+        try:
+            with open(self.snapshot_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    async def _fetch_tickers(self) -> list[dict]:
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as session:
+            async with session.get(self.url) as response:
+                response.raise_for_status()
+                return await response.json()
+
+    async def tickers(self, refresh: bool = False) -> list[dict]:
+        """Тікери за 24 години: зі знімка, якщо він свіжий, інакше з API"""
+        snapshot = self._read_snapshot()
+        if (
+            snapshot is not None
+            and not refresh
+            and time.time() - snapshot["fetched_at"] < self.ttl
+        ):
+            return snapshot["tickers"]
+
+        try:
+            tickers = await self._fetch_tickers()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if snapshot is None:
+                raise
+            print(f"⚠️ API недоступне ({e!r}), використовую збережений знімок")
+            return snapshot["tickers"]
+
+        with open(self.snapshot_path, "w") as f:
+            json.dump({"fetched_at": time.time(), "tickers": tickers}, f)
+        return tickers
+
+    async def top_pairs(self, top_n: int, quote: str = "BTC") -> list[str]:
+        """Пари до ``quote`` з найбільшим обсягом торгів за 24 години"""
+        return top_by_volume(volume_index(await self.tickers(), quote), top_n)
+
+    def has_universe(self, name: str) -> bool:
+        return os.path.exists(self._universe_path(name))
+
+    def pin(self, name: str, pairs: list[str]):
+        """Фіксує набір пар під назвою ``name``"""
+        with open(self._universe_path(name), "w") as f:
+            json.dump(pairs, f, indent=2)
+
+    def universe(self, name: str) -> list[str]:
+        """Зафіксований раніше набір пар"""
+        with open(self._universe_path(name)) as f:
+            return json.load(f)
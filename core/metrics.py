@@ -0,0 +1,145 @@
+from typing import Callable, Sequence
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from vectorbt.returns import nb as returns_nb
+
+# Колонки metrics.csv; значення збігаються з відповідними полями pf.stats()
+DEFAULT_METRICS = ("total_return", "sharpe_ratio", "max_drawdown", "win_rate", "trades")
+# Додаткові метрики, що вмикаються на запит
+EXTRA_METRICS = ("sortino_ratio", "calmar_ratio", "exposure")
+
+
+class _Arrays:
+    """Масиви портфеля, які потрібні метрикам; кожен рахується один раз"""
+
+    def __init__(self, pf: vbt.Portfolio):
+        self.pf = pf
+        self._cache: dict = {}
+
+    def _get(self, name: str, func: Callable[[], np.ndarray]) -> np.ndarray:
+        if name not in self._cache:
+            self._cache[name] = func()
+        return self._cache[name]
+
+    @property
+    def n_cols(self) -> int:
+        return len(self.pf.wrapper.columns)
+
+    @property
+    def returns(self) -> np.ndarray:
+        return self._get("returns", lambda: _to_2d(self.pf.returns()))
+
+    @property
+    def value(self) -> np.ndarray:
+        return self._get("value", lambda: _to_2d(self.pf.value()))
+
+    @property
+    def ann_factor(self) -> float:
+        return self.pf.returns_acc.ann_factor
+
+    @property
+    def trades(self) -> np.ndarray:
+        return self._get("trades", lambda: self.pf.trades.values)
+
+
+def _to_2d(obj) -> np.ndarray:
+    values = np.asarray(obj, dtype=np.float64)
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def _total_return(a: _Arrays) -> np.ndarray:
+    return np.atleast_1d(np.asarray(a.pf.total_return(), dtype=np.float64)) * 100
+
+
+def _sharpe_ratio(a: _Arrays) -> np.ndarray:
+    return returns_nb.sharpe_ratio_nb(a.returns, a.ann_factor)
+
+
+def _max_drawdown(a: _Arrays) -> np.ndarray:
+    """Найбільше падіння від піку в %, як ``pf.drawdowns.max_drawdown``"""
+    value = a.value
+    peak = np.fmax.accumulate(value, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = (value - peak) / peak
+    # Колонка без просадки (або без даних) дає NaN, як ``pf.drawdowns``
+    has_drawdown = (drawdown < 0).any(axis=0)
+    deepest = np.nanmin(np.where(drawdown < 0, drawdown, 0.0), axis=0)
+    return np.where(has_drawdown, -deepest * 100, np.nan)
+
+
+def _trade_counts(a: _Arrays) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Кількість усіх, закритих і прибуткових закритих угод по колонках"""
+    trades = a.trades
+    closed = trades["status"] == 1
+    count = np.bincount(trades["col"], minlength=a.n_cols)
+    closed_count = np.bincount(trades["col"][closed], minlength=a.n_cols)
+    won = np.bincount(trades["col"][closed & (trades["pnl"] > 0)], minlength=a.n_cols)
+    return count, closed_count, won
+
+
+def _win_rate(a: _Arrays) -> np.ndarray:
+    _, closed, won = _trade_counts(a)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return won / closed * 100
+
+
+def _trades(a: _Arrays) -> np.ndarray:
+    return _trade_counts(a)[0]
+
+
+def _sortino_ratio(a: _Arrays) -> np.ndarray:
+    return returns_nb.sortino_ratio_nb(a.returns, a.ann_factor)
+
+
+def _calmar_ratio(a: _Arrays) -> np.ndarray:
+    return returns_nb.calmar_ratio_nb(a.returns, a.ann_factor)
+
+
+def _exposure(a: _Arrays) -> np.ndarray:
+    """Частка барів з відкритою позицією, %"""
+    return (_to_2d(a.pf.assets()) != 0).mean(axis=0) * 100
+
+
+METRICS: dict[str, Callable[[_Arrays], np.ndarray]] = {
+    "total_return": _total_return,
+    "sharpe_ratio": _sharpe_ratio,
+    "max_drawdown": _max_drawdown,
+    "win_rate": _win_rate,
+    "trades": _trades,
+    "sortino_ratio": _sortino_ratio,
+    "calmar_ratio": _calmar_ratio,
+    "exposure": _exposure,
+}
+
+
+def compute_metrics(
+    pf: vbt.Portfolio, metrics: Sequence[str] = DEFAULT_METRICS
+) -> pd.DataFrame:
+    """Метрики портфеля з рядком на колонку (пару) та колонкою на метрику.
+
+    Рахуються лише запитані метрики, одразу для всіх колонок портфеля, з
+    масивів дохідностей, вартості та записів угод - без ``pf.stats()``.
+    """
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        raise ValueError(f"невідомі метрики: {unknown}")
+    arrays = _Arrays(pf)
+    return pd.DataFrame(
+        {name: METRICS[name](arrays) for name in metrics},
+        index=pf.wrapper.columns,
+    )
+
+
+def relative_tick(close) -> np.ndarray:
+    """Крок ціни кожної колонки відносно її медіанної ціни.
+
+    Крок - найменша різниця між сусідніми різними цінами закриття; для
+    колонки з менш ніж двома рівнями ціни - NaN.
+    """
+    prices = np.sort(_to_2d(close), axis=0)  # NaN - у кінці
+    steps = np.diff(prices, axis=0)
+    tick = np.where(steps > 0, steps, np.inf).min(axis=0, initial=np.inf)
+    count = (~np.isnan(prices)).sum(axis=0)
+    median = np.take_along_axis(prices, (count // 2)[None], axis=0)[0]
+    return np.where(np.isfinite(tick), tick / median, np.nan)
@@ -0,0 +1,91 @@
+import json
+import os
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class OHLCVCache:
+    """Кеш OHLCV на диску у вигляді суцільних numpy-масивів з memory-map.
+
+    Кожне поле (``timestamp``, ``open``, ..., ``volume``) зберігається одним
+    ``.npy``-файлом, у якому рядки згруповані за парою; ``index.json`` містить
+    межі ``[start, stop)`` кожної пари. Процеси, що відкривають кеш, ділять
+    ті самі сторінки пам'яті замість власних копій даних.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, "index.json")) as f:
+            self.offsets: dict[str, list[int]] = json.load(f)
+        self._arrays: Optional[dict[str, np.ndarray]] = None
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, root: str, dtype: str = "float64") -> "OHLCVCache":
+        """Створює кеш з довгої таблиці (``timestamp``, OHLCV, ``pair``).
+
+        ``dtype="float32"`` вдвічі зменшує масиви; стратегії все одно рахують
+        у float64 (див. ``core.schema.as_float64``).
+        """
+        os.makedirs(root, exist_ok=True)
+        df = df.sort_values(["pair", "timestamp"], kind="stable")
+        pairs = df["pair"].to_numpy().astype(str)
+
+        np.save(
+            os.path.join(root, "timestamp.npy"),
+            df["timestamp"].to_numpy().astype("datetime64[ns]").view("int64"),
+        )
+        for field in FIELDS:
+            np.save(
+                os.path.join(root, f"{field}.npy"),
+                df[field].to_numpy(dtype=dtype),
+            )
+
+        # Межі кожної пари у відсортованих масивах
+        starts = np.flatnonzero(np.r_[True, pairs[1:] != pairs[:-1]])
+        stops = np.r_[starts[1:], len(pairs)]
+        offsets = {
+            pairs[start]: [int(start), int(stop)] for start, stop in zip(starts, stops)
+        }
+        with open(os.path.join(root, "index.json"), "w") as f:
+            json.dump(offsets, f)
+
+        return cls(root)
+
+    @property
+    def pairs(self) -> list[str]:
+        return list(self.offsets)
+
+    @property
+    def arrays(self) -> dict[str, np.ndarray]:
+        """Масиви полів, відкриті лише для читання через memory-map"""
+        if self._arrays is None:
+            self._arrays = {
+                field: np.load(os.path.join(self.root, f"{field}.npy"), mmap_mode="r")
+                for field in ("timestamp", *FIELDS)
+            }
+        return self._arrays
+
+    def view(self, pair: str) -> pd.DataFrame:
+        """DataFrame пари поверх memory-map без копіювання даних.
+
+        Індекс - час свічки, колонки - read-only представлення масивів кешу.
+        """
+        start, stop = self.offsets[pair]
+        arrays = self.arrays
+        index = pd.DatetimeIndex(
+            arrays["timestamp"][start:stop].view("datetime64[ns]"),
+            name="timestamp",
+            copy=False,
+        )
+        return pd.DataFrame(
+            {field: arrays[field][start:stop] for field in FIELDS},
+            index=index,
+            copy=False,
+        )
+
+    def __getstate__(self):
+        # У воркер передається лише шлях; масиви відкриваються там заново
+        return {"root": self.root, "offsets": self.offsets, "_arrays": None}
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from core.timeframes import BASE_TIMEFRAME, timeframe_offset
+
+# Які рядки залишаються в панелі: об'єднання періодів лістингу всіх пар
+# (поза своїм періодом пара - NaN) або лише спільний для всіх пар період
+MASK_POLICIES = ("listing", "common")
+# Заповнення пропущених свічок усередині періоду лістингу
+FILL_POLICIES = ("none", "ffill")
+
+
+def align_panel(
+    df: pd.DataFrame,
+    fields: tuple = ("close", "high", "low"),
+    timeframe: str = BASE_TIMEFRAME,
+    mask: str = "listing",
+) -> pd.DataFrame:
+    """Широка панель timestamp x (поле, пара) на рівномірній сітці ``timeframe``.
+
+    На відміну від ``DataLoader.to_panel`` індекс містить кожен інтервал
+    (пропущені хвилини - рядки з NaN) і має ``freq``. Рядки розкладаються
+    за позицією ``(timestamp - start) // timeframe`` одним проходом, без
+    сортування довгої таблиці. Тип значень поля зберігається (float32
+    залишається float32).
+    """
+    if mask not in MASK_POLICIES:
+        raise ValueError(f"невідома політика маскування: {mask}")
+    if df.empty:
+        return pd.DataFrame()
+
+    offset = timeframe_offset(timeframe)
+    timestamps = df["timestamp"].to_numpy()
+    unit = np.datetime_data(timestamps.dtype)[0]
+    step = np.timedelta64(offset.nanos, "ns").astype(f"timedelta64[{unit}]")
+    start = timestamps.min()
+    offsets = timestamps - start
+    if (offsets % step).any():
+        raise ValueError(f"мітки часу не лежать на сітці {timeframe}")
+    rows = offsets // step
+    n_rows = int(rows.max()) + 1
+
+    pairs = df["pair"].astype("category").cat.remove_unused_categories()
+    pairs = pairs.cat.reorder_categories(sorted(pairs.cat.categories))
+    cols = pairs.cat.codes.to_numpy()
+    names = pairs.cat.categories
+
+    observed = np.zeros((n_rows, len(names)), dtype=bool)
+    observed[rows, cols] = True
+    first = observed.argmax(axis=0)
+    last = n_rows - 1 - observed[::-1].argmax(axis=0)
+    if mask == "common":
+        keep = slice(first.max(), max(first.max(), last.min() + 1))
+    else:
+        keep = slice(0, n_rows)
+
+    index = pd.DatetimeIndex(
+        start + np.arange(n_rows)[keep] * step, name="timestamp", freq=offset
+    )
+    columns = pd.Index(names, name="pair")
+    frames = {}
+    for field in fields:
+        # float32 залишається float32, цілі типи стають float64 заради NaN
+        dtype = np.promote_types(df[field].dtype, np.float32)
+        values = np.full((n_rows, len(names)), np.nan, dtype=dtype)
+        values[rows, cols] = df[field].to_numpy(dtype=dtype)
+        frames[field] = pd.DataFrame(values[keep], index=index, columns=columns)
+    return pd.concat(frames, axis=1)
+
+
+def fill_gaps(panel: pd.DataFrame, limit: int = None) -> pd.DataFrame:
+    """Заповнює пропущені свічки всередині періоду лістингу кожної пари.
+
+    Пропуск стає пласкою свічкою: ціни дорівнюють попередньому ``close``,
+    обсяг - нулю. З ``limit`` заповнюється не більше ``limit`` свічок
+    поспіль після наявної; періоди до першої та після останньої свічки пари
+    залишаються NaN. Маска наявних даних - ``panel["close"].notna()`` до
+    заповнення.
+    """
+    close = panel["close"].to_numpy()
+    observed = ~np.isnan(close)
+    n_rows = len(close)
+    position = np.arange(n_rows)[:, None]
+
+    # Позиція останньої наявної свічки для кожного рядка
+    source = np.maximum.accumulate(np.where(observed, position, -1), axis=0)
+    last = n_rows - 1 - observed[::-1].argmax(axis=0)
+    fill = ~observed & (source >= 0) & (position <= last)
+    if limit is not None:
+        fill &= position - source <= limit
+    if not fill.any():
+        return panel
+
+    filled_close = np.take_along_axis(close, np.maximum(source, 0), axis=0)
+    frames = {}
+    for field in panel.columns.get_level_values(0).unique():
+        values = panel[field].to_numpy(copy=True)
+        values[fill] = 0.0 if field == "volume" else filled_close[fill]
+        frames[field] = pd.DataFrame(
+            values, index=panel.index, columns=panel[field].columns
+        )
+    return pd.concat(frames, axis=1)
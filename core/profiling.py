@@ -0,0 +1,195 @@
+import cProfile
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+import pandas as pd
+
+try:
+    import pyinstrument
+except ImportError:  # необов'язкова залежність
+    pyinstrument = None
+
+REPORT_COLUMNS = ["kind", "stage", "strategy", "pair", "calls", "total", "mean", "max"]
+
+
+class Profiler:
+    """Таймери та лічильники етапів конвеєра з розбивкою по стратегії та парі.
+
+    Вимкнений профайлер нічого не записує, тож інструментовані методи
+    працюють як звичайно. Записи агрегуються одразу: на ключ
+    (вид, етап, стратегія, пара) зберігаються кількість викликів, сума та
+    максимум, тож пам'ять не росте з кількістю викликів. Таймери міряють
+    повний час, включно з вкладеними етапами (``simulate`` містить
+    ``signals``).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._records: dict[tuple, list] = {}
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+
+    def _add(self, kind: str, stage: str, strategy, pair, value: float):
+        key = (kind, stage, strategy or "", pair or "")
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                self._records[key] = [1, value, value]
+            else:
+                record[0] += 1
+                record[1] += value
+                record[2] = max(record[2], value)
+
+    @contextmanager
+    def stage(
+        self, name: str, strategy: Optional[str] = None, pair: Optional[str] = None
+    ) -> Iterator[None]:
+        """Вимірює час блоку як етап ``name``"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add("timer", name, strategy, pair, time.perf_counter() - start)
+
+    def count(
+        self,
+        name: str,
+        value: float = 1,
+        strategy: Optional[str] = None,
+        pair: Optional[str] = None,
+    ):
+        """Додає ``value`` до лічильника ``name``"""
+        if self.enabled:
+            self._add("counter", name, strategy, pair, value)
+
+    def timed(self, name: str, labels: Optional[Callable[..., dict]] = None):
+        """Декоратор методу: вимірює кожен виклик як етап ``name``.
+
+        ``labels(self)`` повертає мітки ``strategy``/``pair`` для виклику.
+        Підтримує й корутини.
+        """
+
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(obj, *args, **kwargs):
+                    if not self.enabled:
+                        return await func(obj, *args, **kwargs)
+                    with self.stage(name, **(labels(obj) if labels else {})):
+                        return await func(obj, *args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(obj, *args, **kwargs):
+                if not self.enabled:
+                    return func(obj, *args, **kwargs)
+                with self.stage(name, **(labels(obj) if labels else {})):
+                    return func(obj, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def records(self) -> list[tuple]:
+        """Сирі агреговані записи для передачі між процесами"""
+        with self._lock:
+            return [(*key, *value) for key, value in self._records.items()]
+
+    def merge(self, records: list[tuple]):
+        """Додає записи, зібрані в іншому процесі"""
+        with self._lock:
+            for kind, stage, strategy, pair, calls, total, peak in records:
+                key = (kind, stage, strategy, pair)
+                record = self._records.get(key)
+                if record is None:
+                    self._records[key] = [calls, total, peak]
+                else:
+                    record[0] += calls
+                    record[1] += total
+                    record[2] = max(record[2], peak)
+
+    @contextmanager
+    def capture(self, enabled: bool) -> Iterator[list]:
+        """Збирає записи блоку окремо від накопичених (для процесів-воркерів).
+
+        Після виходу список, що повертається, містить записи блоку, а стан
+        профайлера відновлюється.
+        """
+        captured: list = []
+        saved_enabled, saved_records = self.enabled, self._records
+        self.enabled, self._records = enabled, {}
+        try:
+            yield captured
+        finally:
+            captured.extend(self.records())
+            self.enabled, self._records = saved_enabled, saved_records
+
+    def report(self) -> pd.DataFrame:
+        """Таблиця записів, найдовші етапи першими"""
+        frame = pd.DataFrame(
+            self.records(),
+            columns=["kind", "stage", "strategy", "pair", "calls", "total", "max"],
+        )
+        frame["mean"] = frame["total"] / frame["calls"]
+        return frame[REPORT_COLUMNS].sort_values(
+            ["kind", "total"], ascending=[False, False], ignore_index=True
+        )
+
+    def save(self, path: str) -> str:
+        """Зберігає звіт у JSON або CSV (за розширенням ``path``)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        frame = self.report()
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(frame.to_dict(orient="records"), f, indent=2)
+        else:
+            frame.to_csv(path, index=False)
+        return path
+
+
+# Спільний профайлер конвеєра; вмикається ``profiler.enabled = True``
+profiler = Profiler()
+
+
+@contextmanager
+def profile_to(path: Optional[str]) -> Iterator[None]:
+    """Дамп профілю блоку: ``.html`` - pyinstrument, інакше - cProfile (``.prof``).
+
+    ``path=None`` вимикає профілювання.
+    """
+    if path is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".html"):
+        if pyinstrument is None:
+            raise ImportError("для HTML-профілю потрібен pyinstrument")
+        session = pyinstrument.Profiler(async_mode="enabled")
+        session.start()
+        try:
+            yield
+        finally:
+            session.stop()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(session.output_html())
+        return
+    session = cProfile.Profile()
+    session.enable()
+    try:
+        yield
+    finally:
+        session.disable()
+        session.dump_stats(path)
@@ -0,0 +1,232 @@
+import html
+from typing import Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Метрики, для яких менше - краще (впливає на порядок рядків і колірну шкалу)
+LOWER_IS_BETTER = {"max_drawdown"}
+# Підписи значень у клітинках лише для невеликих теплокарт
+ANNOTATE_CELLS = 600
+
+# Сортування таблиць кліком на заголовок, без зовнішніх залежностей
+SORT_SCRIPT = """
+<script>
+document.querySelectorAll("table.sortable th").forEach(function (th) {
+  th.style.cursor = "pointer";
+  th.addEventListener("click", function () {
+    var table = th.closest("table"), body = table.tBodies[0];
+    var index = Array.prototype.indexOf.call(th.parentNode.children, th);
+    var asc = th.dataset.order !== "asc";
+    th.dataset.order = asc ? "asc" : "desc";
+    Array.from(body.rows).sort(function (a, b) {
+      var x = a.cells[index].innerText, y = b.cells[index].innerText;
+      var nx = parseFloat(x), ny = parseFloat(y);
+      var cmp = isNaN(nx) || isNaN(ny) ? x.localeCompare(y) : nx - ny;
+      return asc ? cmp : -cmp;
+    }).forEach(function (row) { body.appendChild(row); });
+  });
+});
+</script>
+"""
+
+STYLE = """
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table.sortable { border-collapse: collapse; font-size: 13px; margin-bottom: 2em; }
+table.sortable th, table.sortable td { border: 1px solid #ddd; padding: 4px 8px; }
+table.sortable th { background: #f3f3f3; }
+table.sortable td { text-align: right; }
+</style>
+"""
+
+
+def _labels(df: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
+    """Підпис колонки теплокарти з одного або кількох полів (стратегія, параметри)"""
+    if len(columns) == 1:
+        return df[columns[0]].astype(str)
+    return df[list(columns)].astype(str).agg(" ".join, axis=1)
+
+
+def pivot_metric(
+    df: pd.DataFrame,
+    value: str = "total_return",
+    index: str = "pair",
+    columns: Union[str, Sequence[str]] = "strategy_name",
+) -> pd.DataFrame:
+    """Матриця ``index`` x ``columns`` середніх значень метрики одним groupby.
+
+    ``columns`` може бути кількома полями (напр. стратегія та параметри з
+    ``ParameterSweep``) - тоді підпис колонки складається з їхніх значень.
+    """
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    df = df[df[value].notna()] if value in df else df.iloc[:0]
+    if df.empty:
+        return pd.DataFrame()
+    values = pd.to_numeric(df[value], errors="coerce").replace(
+        [np.inf, -np.inf], np.nan
+    )
+    return (
+        values.groupby(
+            [df[index].astype(str).to_numpy(), _labels(df, columns).to_numpy()],
+            sort=True,
+        )
+        .mean()
+        .unstack()
+    )
+
+
+def rank_rows(matrix: pd.DataFrame, value: str = "total_return") -> pd.DataFrame:
+    """Рядки від найкращого до найгіршого за найкращою клітинкою рядка"""
+    ascending = value in LOWER_IS_BETTER
+    score = matrix.min(axis=1) if ascending else matrix.max(axis=1)
+    order = np.argsort(score.to_numpy(), kind="stable")
+    if not ascending:
+        order = order[::-1]
+    # NaN-рядки завжди в кінці
+    order = order[np.argsort(score.isna().to_numpy()[order], kind="stable")]
+    return matrix.iloc[order]
+
+
+def downsample_rows(matrix: pd.DataFrame, max_rows: int) -> pd.DataFrame:
+    """Не більше ``max_rows`` рядків: сусідні (за рангом) рядки усереднюються.
+
+    Підпис рядка-кошика - діапазон рангів і перший та останній рядок у ньому.
+    """
+    n = len(matrix)
+    if n <= max_rows:
+        return matrix
+    buckets = np.arange(n) * max_rows // n
+    grouped = matrix.groupby(buckets, sort=True)
+    result = grouped.mean()
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    stops = np.r_[starts[1:], n] - 1
+    labels = matrix.index.to_numpy()
+    result.index = [
+        f"#{start + 1}-{stop + 1} ({labels[start]} … {labels[stop]})"
+        for start, stop in zip(starts, stops)
+    ]
+    return result
+
+
+def heatmap_matrix(
+    df: pd.DataFrame,
+    value: str = "total_return",
+    index: str = "pair",
+    columns: Union[str, Sequence[str]] = "strategy_name",
+    top_n: Optional[int] = 50,
+    max_rows: int = 100,
+    max_columns: int = 50,
+) -> pd.DataFrame:
+    """Матриця теплокарти обмеженого розміру.
+
+    Рядки впорядковуються за найкращою клітинкою; ``top_n`` залишає лише
+    найкращі, решта (або всі з ``top_n=None``) стискається до ``max_rows``
+    кошиків середнім. Колонки понад ``max_columns`` відкидаються за тим
+    самим правилом, тож розмір рисунка не залежить від кількості рядків
+    результатів.
+    """
+    matrix = pivot_metric(df, value, index, columns)
+    if matrix.empty:
+        return matrix
+    if matrix.shape[1] > max_columns:
+        matrix = rank_rows(matrix.T, value).iloc[:max_columns].T
+    matrix = rank_rows(matrix, value)
+    if top_n is not None:
+        matrix = matrix.iloc[:top_n]
+    return downsample_rows(matrix, max_rows)
+
+
+def heatmap_figure(matrix: pd.DataFrame, value: str = "total_return") -> go.Figure:
+    colorscale = "RdYlGn_r" if value in LOWER_IS_BETTER else "RdYlGn"
+    annotate = matrix.size <= ANNOTATE_CELLS
+    fig = go.Figure(
+        go.Heatmap(
+            z=matrix.to_numpy(),
+            x=[str(c) for c in matrix.columns],
+            y=[str(i) for i in matrix.index],
+            colorscale=colorscale,
+            zmid=0 if value not in LOWER_IS_BETTER else None,
+            texttemplate="%{z:.1f}" if annotate else None,
+            hovertemplate="%{y}<br>%{x}<br>" + value + "=%{z:.3f}<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title=f"{value}: {matrix.shape[0]} x {matrix.shape[1]}",
+        height=max(400, 18 * matrix.shape[0] + 150),
+        yaxis={"autorange": "reversed"},
+    )
+    return fig
+
+
+def summary_table(
+    df: pd.DataFrame, by: Union[str, Sequence[str]] = "strategy_name"
+) -> pd.DataFrame:
+    """Агрегати числових метрик по стратегії: кількість, середнє, медіана"""
+    by = [by] if isinstance(by, str) else list(by)
+    numeric = df.select_dtypes("number").columns.difference(by)
+    if df.empty or numeric.empty:
+        return pd.DataFrame()
+    table = df.groupby(by, sort=True)[list(numeric)].agg(["mean", "median"])
+    table.columns = [f"{metric} {how}" for metric, how in table.columns]
+    table.insert(0, "rows", df.groupby(by, sort=True).size())
+    return table.reset_index()
+
+
+def top_rows(df: pd.DataFrame, value: str = "total_return", n: int = 50):
+    """``n`` найкращих і ``n`` найгірших рядків за метрикою"""
+    if value not in df:
+        return df.iloc[:0], df.iloc[:0]
+    ranked = df[df[value].notna()].sort_values(
+        value, ascending=value in LOWER_IS_BETTER, kind="stable"
+    )
+    return ranked.head(n), ranked.tail(n).iloc[::-1]
+
+
+def _table(df: pd.DataFrame) -> str:
+    return df.to_html(
+        index=False, classes="sortable", border=0, float_format="{:.4f}".format
+    )
+
+
+def write_report(
+    df: pd.DataFrame,
+    path: str,
+    value: str = "total_return",
+    index: str = "pair",
+    columns: Union[str, Sequence[str]] = "strategy_name",
+    top_n: Optional[int] = 50,
+    max_rows: int = 100,
+    max_columns: int = 50,
+) -> str:
+    """Один інтерактивний HTML: теплокарта plotly, зведення та топ-таблиці.
+
+    Усе агрегується до запису (``heatmap_matrix``, ``summary_table``,
+    ``top_rows``), тож розмір файлу й час рендерингу обмежені ``top_n``,
+    ``max_rows`` і ``max_columns`` незалежно від кількості рядків ``df``.
+    """
+    matrix = heatmap_matrix(df, value, index, columns, top_n, max_rows, max_columns)
+    best, worst = top_rows(df, value, top_n or max_rows)
+    parts = [
+        "<html><head><meta charset='utf-8'><title>Backtest report</title>",
+        STYLE,
+        "</head><body>",
+        f"<h1>Backtest report</h1><p>{len(df)} рядків результатів</p>",
+    ]
+    if not matrix.empty:
+        parts.append(
+            heatmap_figure(matrix, value).to_html(
+                full_html=False, include_plotlyjs="cdn"
+            )
+        )
+    for title, table in (
+        ("Зведення по стратегіях", summary_table(df)),
+        (f"Найкращі за {value}", best),
+        (f"Найгірші за {value}", worst),
+    ):
+        if not table.empty:
+            parts.append(f"<h2>{html.escape(title)}</h2>{_table(table)}")
+    parts += [SORT_SCRIPT, "</body></html>"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+    return path
@@ -0,0 +1,200 @@
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Type
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from core.indicators import fingerprint
+from core.metrics import DEFAULT_METRICS
+from strategies.base import StrategyBase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    pair TEXT,
+    params TEXT NOT NULL,
+    data_key TEXT NOT NULL,
+    code_key TEXT NOT NULL,
+    row TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_strategy_pair ON results (strategy, pair);
+"""
+
+# Модулі, від коду яких залежать метрики будь-якої стратегії
+SHARED_MODULES = ("core.kernels", "core.indicators", "core.metrics", "core.simulator")
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} не серіалізується у JSON")
+
+
+def _dumps(value, sort_keys: bool = True) -> str:
+    return json.dumps(value, sort_keys=sort_keys, default=_json_default)
+
+
+@lru_cache(maxsize=None)
+def code_key(strategy_cls: Type[StrategyBase]) -> str:
+    """Відбиток коду стратегії: модулі класу, його батьків, спільних обчислень
+    та версія vectorbt"""
+    modules = {
+        cls.__module__ for cls in strategy_cls.__mro__ if issubclass(cls, StrategyBase)
+    }
+    modules.update(SHARED_MODULES)
+    digest = hashlib.blake2b(vbt.__version__.encode(), digest_size=16)
+    for name in sorted(modules):
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        try:
+            digest.update(inspect.getsource(module).encode())
+        except (OSError, TypeError):
+            digest.update(name.encode())
+    return digest.hexdigest()
+
+
+def strategy_params(strategy: StrategyBase) -> dict:
+    """Параметри, від яких залежить результат: аргументи ``__init__``,
+    налаштування симуляції (комісії, сліппейдж, частота) та набір метрик"""
+    return {
+        "params": {
+            name: getattr(strategy, name)
+            for name in type(strategy).param_defaults()
+            if hasattr(strategy, name)
+        },
+        "portfolio": strategy.portfolio_options(),
+        "metrics": list(DEFAULT_METRICS + tuple(strategy.extra_metrics)),
+    }
+
+
+def result_key(
+    strategy_cls: Type[StrategyBase], pair: Optional[str], params: dict, data_key: str
+) -> str:
+    """Ключ результату: хеш (пара та її дані, код стратегії, параметри)"""
+    payload = _dumps(
+        {
+            "strategy": f"{strategy_cls.__module__}.{strategy_cls.__qualname__}",
+            "code": code_key(strategy_cls),
+            "pair": pair,
+            "data": data_key,
+            "params": params,
+        }
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ResultStore:
+    """Сховище результатів бектестів у SQLite.
+
+    Ключ рядка - хеш відбитка даних пари, коду стратегії та її параметрів
+    (див. ``result_key``), тож ``Backtester`` виконує лише нові або змінені
+    задачі, а решту бере звідси. Записи попередніх запусків не видаляються
+    і доступні через ``history``.
+    """
+
+    def __init__(self, path: str = os.path.join("results", "runs.sqlite")):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def key(
+        strategy: StrategyBase, pair: Optional[str] = None, data=None
+    ) -> tuple[str, str]:
+        """(ключ задачі, відбиток даних) для стратегії над даними пари.
+
+        За замовчуванням - пара й дані самої стратегії; для стратегії над
+        панеллю передаються пара та її зріз панелі.
+        """
+        pair = getattr(strategy, "pair", None) if pair is None else pair
+        data_key = strategy.data_key() if data is None else fingerprint(data)
+        params = strategy_params(strategy)
+        return result_key(type(strategy), pair, params, data_key), data_key
+
+    def get(self, keys: Iterable[str]) -> dict[str, dict]:
+        """Збережені рядки метрик за ключами (відсутні ключі пропускаються)"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        # SQLite обмежує кількість параметрів одного запиту
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            cursor = self.connection.execute(
+                "SELECT key, row FROM results WHERE key IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update((key, json.loads(row)) for key, row in cursor.fetchall())
+        return found
+
+    def put(self, entries: Iterable[tuple[str, str, StrategyBase, dict]]):
+        """Зберігає рядки метрик: (ключ, відбиток даних, стратегія, рядок).
+
+        Рядки з помилкою не зберігаються, щоб наступний запуск їх повторив.
+        """
+        created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        rows = [
+            (
+                key,
+                type(strategy).__name__,
+                row.get("pair"),
+                _dumps(strategy_params(strategy)),
+                data_key,
+                code_key(type(strategy)),
+                _dumps(row, sort_keys=False),
+                created,
+            )
+            for key, data_key, strategy, row in entries
+            if "error" not in row
+        ]
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self.connection.commit()
+
+    def history(
+        self,
+        strategies: Optional[Sequence[str]] = None,
+        pairs: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Усі збережені результати (опційно лише для стратегій/пар).
+
+        Рядок - метрики одного запуску плюс ``created``, ``data_key`` і
+        ``code_key``, за якими видно, на яких даних і версії коду він отриманий.
+        """
+        query = "SELECT row, created, data_key, code_key FROM results"
+        conditions, args = [], []
+        for column, values in (("strategy", strategies), ("pair", pairs)):
+            if values is not None:
+                values = list(values)
+                conditions.append(f"{column} IN ({','.join('?' * len(values))})")
+                args.extend(values)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor = self.connection.execute(query + " ORDER BY created", args)
+        return pd.DataFrame(
+            [
+                {
+                    **json.loads(row),
+                    "created": created,
+                    "data_key": data,
+                    "code_key": code,
+                }
+                for row, created, data, code in cursor.fetchall()
+            ]
+        )
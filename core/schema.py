@@ -0,0 +1,90 @@
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+from core.store import PRICE_COLUMNS
+
+# Компактне представлення в пам'яті: ціни й обсяг як у сховищі (float32),
+# пара - categorical. Обчислення індикаторів і симуляція йдуть у float64
+# (див. ``as_float64``): ковзні суми у float32 змінюють сигнали.
+COMPACT_DTYPES = {column: "float32" for column in PRICE_COLUMNS}
+
+
+def select_columns(df: pd.DataFrame, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    """Лише поля ``columns`` (``timestamp`` і ``pair`` залишаються завжди)"""
+    if columns is None:
+        return df
+    return df[[c for c in df if c in ("timestamp", "pair") or c in columns]]
+
+
+def to_compact(
+    df: pd.DataFrame, columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Довга таблиця OHLCV у компактних типах; ``columns`` - які поля залишити"""
+    df = select_columns(df, columns)
+    dtypes = {c: dtype for c, dtype in COMPACT_DTYPES.items() if c in df}
+    if "pair" in df and not isinstance(df["pair"].dtype, pd.CategoricalDtype):
+        dtypes["pair"] = "category"
+    return df.astype(dtypes)
+
+
+def as_float64(obj):
+    """``obj`` з float64 замість вужчих float-типів; без копії, якщо нічого міняти"""
+    if isinstance(obj, pd.Series):
+        return obj.astype(np.float64) if _is_narrow(obj.dtype) else obj
+    narrow = [column for column, dtype in obj.dtypes.items() if _is_narrow(dtype)]
+    if not narrow:
+        return obj
+    if len(narrow) == obj.shape[1]:
+        return obj.astype(np.float64)
+    return obj.astype({column: np.float64 for column in narrow})
+
+
+def _is_narrow(dtype) -> bool:
+    return dtype.kind == "f" and dtype != np.float64
+
+
+def bytes_per_row(df: pd.DataFrame) -> pd.Series:
+    """Байти на рядок по колонках (з індексом) та разом, з урахуванням object"""
+    usage = df.memory_usage(deep=True, index=True) / max(len(df), 1)
+    usage["total"] = usage.sum()
+    return usage
+
+
+def memory_report(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Байти на рядок для кількох представлень тих самих даних, колонка на кожне"""
+    return pd.DataFrame({name: bytes_per_row(df) for name, df in frames.items()})
+
+
+def compare_metrics(
+    reference: pd.DataFrame,
+    candidate: pd.DataFrame,
+    keys: Sequence[str] = ("pair", "strategy_name"),
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+) -> pd.DataFrame:
+    """Рядки метрик, що розходяться більше за допуск.
+
+    Порівнюються спільні числові колонки двох таблиць результатів (наприклад,
+    ``metrics.csv`` звичайного і компактного запуску); NaN в обох вважаються
+    рівними. Порожній результат означає, що метрики в межах допуску.
+    """
+    keys = list(keys)
+    merged = reference.merge(candidate, on=keys, suffixes=("", "_candidate"))
+    columns = [
+        c
+        for c in reference.select_dtypes("number")
+        if c not in keys and f"{c}_candidate" in merged
+    ]
+    mismatch = pd.Series(False, index=merged.index)
+    for column in columns:
+        mismatch |= ~np.isclose(
+            merged[column].to_numpy(dtype=np.float64),
+            merged[f"{column}_candidate"].to_numpy(dtype=np.float64),
+            rtol=rtol,
+            atol=atol,
+            equal_nan=True,
+        )
+    return merged.loc[
+        mismatch,
+        keys + [c for column in columns for c in (column, f"{column}_candidate")],
+    ]
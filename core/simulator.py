@@ -0,0 +1,297 @@
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from numba import njit
+from vectorbt.base.array_wrapper import ArrayWrapper
+from vectorbt.portfolio import nb as pf_nb
+from vectorbt.portfolio.enums import (
+    ConflictMode,
+    Direction,
+    DirectionConflictMode,
+    OppositeEntryMode,
+    OrderStatus,
+    ProcessOrderState,
+    SizeType,
+    StopExitMode,
+    StopExitPrice,
+    log_dt,
+    order_dt,
+)
+from core.kernels import PandasObject
+
+# Симулятор повторює ``simulate_from_signal_func_nb`` з vectorbt для
+# окремих сигналів лонгів і шортів (``ls_enex_signal_func_nb``), SL/TP від
+# ціни закриття входу з перевіркою по open/high/low свічки та параметрів
+# ``vbt.settings.portfolio`` за замовчуванням
+# (size=inf, accumulate=False, конфлікти - Ignore, протилежний вхід -
+# ReverseReduce, stop_entry_price=Close, stop_exit_price=StopLimit).
+# Розв'язання сигналів і виконання ордерів - ті самі numba-функції vectorbt,
+# тож ордери збігаються з ``Portfolio.from_signals`` біт у біт. Без
+# трансляції аргументів, логів і гнучкої індексації; записи ордерів ростуть
+# за потреби замість резерву рядки x колонки.
+
+
+@njit(cache=True)
+def _grow(records, count):
+    """Удвічі більший масив записів з першими ``count`` записами"""
+    grown = np.empty(2 * len(records), dtype=records.dtype)
+    grown[:count] = records[:count]
+    return grown
+
+
+@njit(cache=True)
+def sl_tp_simulate_nb(
+    close,
+    open,
+    high,
+    low,
+    long_entries,
+    long_exits,
+    short_entries,
+    short_exits,
+    sl_stop,
+    tp_stop,
+    fees,
+    slippage,
+    init_cash,
+    min_size,
+):
+    """Записи ордерів для колонок ``close`` (2D); параметри - по колонці.
+
+    ``open``/``high``/``low`` - NaN, якщо невідомі: як у vectorbt, open
+    тоді дорівнює close, а low/high - межам open і close.
+    """
+    n_rows, n_cols = close.shape
+    records = np.empty(max(n_rows, 16), dtype=order_dt)
+    log_records = np.empty(0, dtype=log_dt)
+    oidx = 0
+    lidx = 0
+
+    for col in range(n_cols):
+        cash = init_cash[col]
+        free_cash = init_cash[col]
+        position = 0.0
+        debt = 0.0
+        val_price = np.nan
+        stop_init_price = np.nan
+        sl_curr = np.nan
+        tp_curr = np.nan
+
+        for i in range(n_rows):
+            price = close[i, col]
+            if not np.isnan(price):
+                val_price = price
+            order_slippage = slippage[col]
+
+            stop_price = np.nan
+            if not np.isnan(sl_curr) or not np.isnan(tp_curr):
+                # Стоп у межах свічки виконується за рівнем стопу, розрив
+                # за рівень на відкритті - за open
+                bar_open = open[i, col]
+                bar_low = low[i, col]
+                bar_high = high[i, col]
+                if np.isnan(bar_open):
+                    bar_open = price
+                if np.isnan(bar_low):
+                    bar_low = min(bar_open, price)
+                if np.isnan(bar_high):
+                    bar_high = max(bar_open, price)
+                if not np.isnan(sl_curr):
+                    stop_price = pf_nb.get_stop_price_nb(
+                        position,
+                        stop_init_price,
+                        sl_curr,
+                        bar_open,
+                        bar_low,
+                        bar_high,
+                        True,
+                    )
+                if np.isnan(stop_price) and not np.isnan(tp_curr):
+                    stop_price = pf_nb.get_stop_price_nb(
+                        position,
+                        stop_init_price,
+                        tp_curr,
+                        bar_open,
+                        bar_low,
+                        bar_high,
+                        False,
+                    )
+
+            accumulate = False
+            if not np.isnan(stop_price):
+                # Стоп має пріоритет над сигналами
+                long_entry, long_exit, short_entry, short_exit, accumulate = (
+                    pf_nb.generate_stop_signal_nb(
+                        position, StopExitMode.Close, accumulate
+                    )
+                )
+                price, order_slippage = pf_nb.resolve_stop_price_and_slippage_nb(
+                    stop_price, price, price, order_slippage, StopExitPrice.StopLimit
+                )
+            else:
+                long_entry = long_entries[i, col]
+                long_exit = long_exits[i, col]
+                short_entry = short_entries[i, col]
+                short_exit = short_exits[i, col]
+                if long_entry or short_entry:
+                    long_entry, long_exit = pf_nb.resolve_signal_conflict_nb(
+                        position,
+                        long_entry,
+                        long_exit,
+                        Direction.LongOnly,
+                        ConflictMode.Ignore,
+                    )
+                    short_entry, short_exit = pf_nb.resolve_signal_conflict_nb(
+                        position,
+                        short_entry,
+                        short_exit,
+                        Direction.ShortOnly,
+                        ConflictMode.Ignore,
+                    )
+                    long_entry, short_entry = pf_nb.resolve_dir_conflict_nb(
+                        position, long_entry, short_entry, DirectionConflictMode.Ignore
+                    )
+                    long_entry, long_exit, short_entry, short_exit, accumulate = (
+                        pf_nb.resolve_opposite_entry_nb(
+                            position,
+                            long_entry,
+                            long_exit,
+                            short_entry,
+                            short_exit,
+                            OppositeEntryMode.ReverseReduce,
+                            accumulate,
+                        )
+                    )
+
+            size, size_type, direction = pf_nb.signals_to_size_nb(
+                position,
+                long_entry,
+                long_exit,
+                short_entry,
+                short_exit,
+                np.inf,
+                SizeType.Amount,
+                accumulate,
+                val_price,
+            )
+            if size == 0:
+                continue
+            if direction == Direction.ShortOnly:
+                size = -size
+            order = pf_nb.order_nb(
+                size=size,
+                price=price,
+                size_type=size_type,
+                direction=direction,
+                fees=fees[col],
+                slippage=order_slippage,
+                min_size=min_size,
+            )
+            if oidx == len(records):
+                records = _grow(records, oidx)
+            state = ProcessOrderState(
+                cash=cash,
+                position=position,
+                debt=debt,
+                free_cash=free_cash,
+                val_price=val_price,
+                value=cash + position * val_price if position != 0 else cash,
+                oidx=oidx,
+                lidx=lidx,
+            )
+            result, new_state = pf_nb.process_order_nb(
+                i, col, col, state, False, order, records, log_records
+            )
+            cash = new_state.cash
+            position = new_state.position
+            debt = new_state.debt
+            free_cash = new_state.free_cash
+            oidx = new_state.oidx
+            if not np.isnan(new_state.val_price):
+                val_price = new_state.val_price
+
+            if result.status == OrderStatus.Filled:
+                if position == 0:
+                    stop_init_price = np.nan
+                    sl_curr = np.nan
+                    tp_curr = np.nan
+                elif state.position == 0 or np.sign(position) != np.sign(
+                    state.position
+                ):
+                    # Нова або розвернута позиція: стопи від close цієї свічки
+                    stop_init_price = close[i, col]
+                    sl_curr = sl_stop[col]
+                    tp_curr = tp_stop[col]
+
+    return records[:oidx]
+
+
+def _as_2d(obj, dtype) -> np.ndarray:
+    values = np.asarray(obj, dtype=dtype)
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def _per_column(value, n_cols: int) -> np.ndarray:
+    return np.require(np.broadcast_to(value, (n_cols,)), dtype=np.float64)
+
+
+def simulate_sl_tp(
+    close: PandasObject,
+    long_entries: PandasObject,
+    long_exits: PandasObject,
+    short_entries: PandasObject,
+    short_exits: PandasObject,
+    sl_stop: Union[float, np.ndarray] = np.nan,
+    tp_stop: Union[float, np.ndarray] = np.nan,
+    fees: Union[float, np.ndarray] = 0.0,
+    slippage: Union[float, np.ndarray] = 0.0,
+    init_cash: Optional[Union[float, np.ndarray]] = None,
+    freq=None,
+    open: Optional[PandasObject] = None,
+    high: Optional[PandasObject] = None,
+    low: Optional[PandasObject] = None,
+) -> vbt.Portfolio:
+    """Портфель SL/TP-стратегії з окремими сигналами лонгів і шортів.
+
+    Рівнозначно ``Portfolio.from_signals(close, entries=long_entries,
+    exits=long_exits, short_entries=..., short_exits=..., sl_stop=...,
+    tp_stop=..., fees=..., slippage=..., open=..., high=..., low=...)``;
+    усі колонки ``close`` симулюються одним проходом. ``sl_stop``,
+    ``tp_stop``, ``fees``, ``slippage`` та ``init_cash`` - скаляр або
+    значення на колонку. Без ``open``/``high``/``low`` стопи перевіряються
+    лише за close.
+    """
+    values = _as_2d(close, np.float64)
+    n_cols = values.shape[1]
+    signals = [
+        np.broadcast_to(_as_2d(signal, np.bool_), values.shape)
+        for signal in (long_entries, long_exits, short_entries, short_exits)
+    ]
+    bars = [
+        np.broadcast_to(
+            np.nan if price is None else _as_2d(price, np.float64), values.shape
+        )
+        for price in (open, high, low)
+    ]
+    settings = vbt.settings.portfolio
+    init_cash = _per_column(
+        settings["init_cash"] if init_cash is None else init_cash, n_cols
+    )
+    records = sl_tp_simulate_nb(
+        values,
+        *bars,
+        *signals,
+        _per_column(sl_stop, n_cols),
+        _per_column(tp_stop, n_cols),
+        _per_column(fees, n_cols),
+        _per_column(slippage, n_cols),
+        init_cash,
+        float(settings["min_size"]),
+    )
+    if not isinstance(close, (pd.Series, pd.DataFrame)):
+        close = pd.Series(close) if np.ndim(close) == 1 else pd.DataFrame(close)
+    wrapper = ArrayWrapper.from_obj(close, freq=freq)
+    return vbt.Portfolio(
+        wrapper, close, records, np.empty(0, dtype=log_dt), init_cash, False
+    )
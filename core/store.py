@@ -0,0 +1,202 @@
+import argparse
+import glob
+import operator
+import os
+from collections import defaultdict
+from functools import reduce
+from typing import Iterable, Optional, Sequence
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Схема файлів сховища; pair та month зберігаються як ключі розділів
+FILE_SCHEMA = pa.schema(
+    [("timestamp", pa.timestamp("us"))]
+    + [(name, pa.float32()) for name in PRICE_COLUMNS]
+)
+PARTITIONING = ds.partitioning(
+    pa.schema(
+        [
+            ("pair", pa.dictionary(pa.int32(), pa.string())),
+            ("month", pa.dictionary(pa.int32(), pa.string())),
+        ]
+    ),
+    flavor="hive",
+    dictionaries="infer",
+)
+
+# Тиждень хвилинних свічок: статистика row group дозволяє пропускати
+# непотрібні тижні при читанні діапазону часу
+ROW_GROUP_SIZE = 7 * 24 * 60
+
+
+def _to_scalar(value: pd.Timestamp) -> pa.Scalar:
+    """Мітка часу у типі колонки ``timestamp`` для фільтрів pyarrow"""
+    return pa.scalar(value.to_pydatetime(), type=pa.timestamp("us"))
+
+
+class MonthStore:
+    """Колонкове сховище OHLCV, розбите на розділи за парою та місяцем.
+
+    Кожен розділ ``pair=<PAIR>/month=<YYYY-MM>`` - один parquet-файл,
+    відсортований за часом, з float32 цінами. Читання місяця для всіх пар -
+    одне сканування датасету з проекцією колонок і фільтрами за парою та часом.
+    """
+
+    def __init__(self, root: str = os.path.join("data", "store")):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _partition_path(self, pair: str, month: str) -> str:
+        return os.path.join(self.root, f"pair={pair}", f"month={month}")
+
+    def has(self, pair: str, month: str) -> bool:
+        """Чи є в сховищі розділ для пари за місяць (``YYYY-MM``)"""
+        return os.path.exists(
+            os.path.join(self._partition_path(pair, month), "data.parquet")
+        )
+
+    def write(self, df: pd.DataFrame) -> list[str]:
+        """Записує довгу таблицю (з колонкою ``pair``) у розділи сховища.
+
+        Наявні розділи тих самих пар і місяців перезаписуються повністю.
+        """
+        if df.empty:
+            return []
+
+        df = df.assign(month=df["timestamp"].dt.strftime("%Y-%m"))
+        paths = []
+        for (pair, month), part in df.groupby(["pair", "month"], observed=True):
+            part = part.sort_values("timestamp", kind="stable")
+            table = pa.Table.from_pandas(
+                part[FILE_SCHEMA.names], schema=FILE_SCHEMA, preserve_index=False
+            )
+            directory = self._partition_path(pair, month)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, "data.parquet")
+            pq.write_table(
+                table, path, row_group_size=ROW_GROUP_SIZE, compression="snappy"
+            )
+            paths.append(path)
+        return paths
+
+    def compact(self, data_dir: str = "data", remove: bool = False) -> int:
+        """Переносить денні файли ``{pair}_{date}.parquet`` у сховище.
+
+        Повертає кількість перенесених файлів. З ``remove=True`` денні файли
+        видаляються після успішного запису відповідного розділу.
+        """
+        paths = glob.glob(os.path.join(data_dir, "*_*.parquet"))
+        return self.write_daily_files(paths, remove=remove)
+
+    def write_daily_files(self, paths: Iterable[str], remove: bool = False) -> int:
+        """Записує денні файли у сховище, групуючи їх за парою та місяцем"""
+        groups = defaultdict(list)
+        for path in paths:
+            pair, date = os.path.basename(path)[: -len(".parquet")].split("_", 1)
+            groups[(pair, date[:7])].append(path)
+
+        migrated = 0
+        for (pair, _), group in sorted(groups.items()):
+            group = sorted(group)
+            df = pd.concat([pd.read_parquet(path) for path in group], ignore_index=True)
+            df["pair"] = pair
+            self.write(df)
+            migrated += len(group)
+            if remove:
+                for path in group:
+                    os.remove(path)
+        return migrated
+
+    def files(self, pair: str) -> list[str]:
+        """Файли всіх розділів пари, впорядковані за місяцем"""
+        return sorted(
+            glob.glob(
+                os.path.join(self.root, f"pair={pair}", "month=*", "data.parquet")
+            )
+        )
+
+    def dataset(self, pairs: Optional[Iterable[str]] = None) -> ds.Dataset:
+        """Датасет pyarrow над усім сховищем або лише над розділами ``pairs``.
+
+        Для кількох пар список їхніх файлів дешевший за обхід усього сховища.
+        """
+        if pairs is None:
+            return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING)
+        return ds.dataset(
+            [path for pair in pairs for path in self.files(pair)],
+            format="parquet",
+            partitioning=PARTITIONING,
+            partition_base_dir=self.root,
+        )
+
+    def read(
+        self,
+        pairs: Optional[Iterable[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Читає дані одним скануванням датасету.
+
+        ``pairs`` та ``start``/``end`` (кінець не включно) перетворюються на
+        фільтри, що відсікають цілі розділи та row groups; ``columns`` -
+        проекція колонок. Колонка ``pair`` повертається як categorical.
+        """
+        if pairs is not None:
+            pairs = list(pairs)
+        dataset = self.dataset(pairs)
+        if not dataset.files:
+            return pd.DataFrame()
+
+        filters = []
+        if pairs is not None:
+            filters.append(ds.field("pair").isin(pairs))
+        if start is not None:
+            start = pd.Timestamp(start)
+            filters.append(ds.field("month") >= start.strftime("%Y-%m"))
+            filters.append(ds.field("timestamp") >= _to_scalar(start))
+        if end is not None:
+            end = pd.Timestamp(end)
+            last = end - pd.Timedelta(1, "us")
+            filters.append(ds.field("month") <= last.strftime("%Y-%m"))
+            filters.append(ds.field("timestamp") < _to_scalar(end))
+        expression = reduce(operator.and_, filters) if filters else None
+
+        if columns is not None:
+            columns = [
+                "timestamp",
+                *[c for c in columns if c not in ("timestamp", "pair")],
+            ]
+            columns.append("pair")
+
+        table = dataset.to_table(columns=columns, filter=expression)
+        df = table.to_pandas()
+        if "month" in df:
+            df = df.drop(columns="month")
+        # Словник розділів містить усі пари сховища, а не лише прочитані
+        df["pair"] = df["pair"].cat.remove_unused_categories()
+        return df
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Перенесення денних parquet-файлів у колонкове сховище"
+    )
+    parser.add_argument("command", choices=["compact"])
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--root", default=os.path.join("data", "store"))
+    parser.add_argument(
+        "--remove", action="store_true", help="видалити денні файли після переносу"
+    )
+    args = parser.parse_args()
+
+    migrated = MonthStore(args.root).compact(args.data_dir, remove=args.remove)
+    print(f"✅ Перенесено {migrated} файлів у {args.root}")
+
+
+if __name__ == "__main__":
+    main()
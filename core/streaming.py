@@ -0,0 +1,155 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Optional, Sequence
+import numpy as np
+import pandas as pd
+from core.kernels import (
+    CrossoverState,
+    RSIBBState,
+    crossover_update_nb,
+    rsi_bb_update_nb,
+)
+from core.store import MonthStore
+
+
+class SignalStream(ABC):
+    """Потокові сигнали стратегії для набору пар.
+
+    Кожна нова свічка оновлює стан індикаторів пари за O(1), без перерахунку
+    всієї історії. Сигнали пари збігаються з ``generate_signals`` стратегії
+    над усіма свічками цієї пари, отриманими до того.
+    """
+
+    # Назви сигналів у порядку, в якому їх повертає ядро
+    outputs: tuple = ()
+
+    def __init__(self, pairs: Sequence[str]):
+        self.pairs = pd.Index(pairs, name="pair")
+
+    @abstractmethod
+    def _update(self, cols: np.ndarray, bars: pd.DataFrame) -> tuple:
+        """Оновлює стан пар ``cols`` свічками ``bars``; сигнали в порядку ``outputs``"""
+        pass
+
+    def _columns(self, bars: pd.DataFrame) -> np.ndarray:
+        cols = self.pairs.get_indexer(bars["pair"])
+        if (cols < 0).any():
+            unknown = sorted(set(bars["pair"][cols < 0]))
+            raise ValueError(f"невідомі пари: {unknown}")
+        return cols
+
+    def update(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """Обробляє свічки однієї хвилини (рядок на пару, колонка ``pair``).
+
+        Пари без свічки у цій хвилині не змінюються. Повертає сигнали з
+        рядком на пару.
+        """
+        signals = self._update(self._columns(bars), bars)
+        index = pd.Index(bars["pair"].to_numpy(), name="pair")
+        return pd.DataFrame(dict(zip(self.outputs, signals)), index=index)
+
+    def run(self, feed: Iterable[tuple[pd.Timestamp, pd.DataFrame]]) -> pd.DataFrame:
+        """Проганяє всі свічки ``feed`` (див. ``replay``).
+
+        Повертає довгу таблицю: ``timestamp``, ``pair`` та сигнали.
+        """
+        timestamps, cols, signals = [], [], []
+        for timestamp, bars in feed:
+            bar_cols = self._columns(bars)
+            signals.append(self._update(bar_cols, bars))
+            timestamps.append(np.full(len(bar_cols), timestamp))
+            cols.append(bar_cols)
+        if not cols:
+            return pd.DataFrame(columns=["timestamp", "pair", *self.outputs])
+
+        result = pd.DataFrame(
+            {
+                "timestamp": np.concatenate(timestamps),
+                "pair": self.pairs[np.concatenate(cols)],
+            }
+        )
+        for k, name in enumerate(self.outputs):
+            result[name] = np.concatenate([bar[k] for bar in signals])
+        return result
+
+
+def _prices(bars: pd.DataFrame, field: str) -> np.ndarray:
+    return bars[field].to_numpy(dtype=np.float64)
+
+
+class CrossoverStream(SignalStream):
+    """Перетин двох SMA (``SMACrossover``, ``MACrossover``)"""
+
+    outputs = ("entries", "exits")
+
+    def __init__(self, pairs: Sequence[str], fast_window: int, slow_window: int):
+        super().__init__(pairs)
+        self.fast_window = fast_window
+        self.slow_window = slow_window
+        self.state = CrossoverState.create(len(self.pairs), fast_window, slow_window)
+
+    def _update(self, cols: np.ndarray, bars: pd.DataFrame) -> tuple:
+        return crossover_update_nb(
+            cols,
+            _prices(bars, "close"),
+            self.fast_window,
+            self.slow_window,
+            self.state,
+        )
+
+
+class RSIBBStream(SignalStream):
+    """RSI + смуги Боллінджера з ATR-фільтром (``RSIWithBB``)"""
+
+    outputs = ("long_entry", "long_exit", "short_entry", "short_exit")
+
+    def __init__(
+        self,
+        pairs: Sequence[str],
+        rsi_window: int,
+        bb_window: int,
+        atr_window: int = 14,
+        atr_mean_window: int = 50,
+    ):
+        super().__init__(pairs)
+        self.rsi_window = rsi_window
+        self.bb_window = bb_window
+        self.atr_window = atr_window
+        self.atr_mean_window = atr_mean_window
+        self.state = RSIBBState.create(len(self.pairs), rsi_window, atr_mean_window)
+
+    def _update(self, cols: np.ndarray, bars: pd.DataFrame) -> tuple:
+        return rsi_bb_update_nb(
+            cols,
+            _prices(bars, "close"),
+            _prices(bars, "high"),
+            _prices(bars, "low"),
+            self.rsi_window,
+            self.bb_window,
+            self.atr_window,
+            self.atr_mean_window,
+            self.state,
+        )
+
+
+def replay(df: pd.DataFrame) -> Iterator[tuple[pd.Timestamp, pd.DataFrame]]:
+    """Свічки довгої таблиці хвилина за хвилиною, як їх віддавав би живий потік"""
+    if df.empty:
+        return
+    order = np.argsort(df["timestamp"].to_numpy(), kind="stable")
+    df = df.iloc[order]
+    timestamps = df["timestamp"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, timestamps[1:] != timestamps[:-1]])
+    stops = np.r_[starts[1:], len(df)]
+    for start, stop in zip(starts, stops):
+        yield pd.Timestamp(timestamps[start]), df.iloc[start:stop]
+
+
+def replay_store(
+    store: MonthStore,
+    pairs: Optional[Sequence[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Sequence[str] = ("close", "high", "low"),
+) -> Iterator[tuple[pd.Timestamp, pd.DataFrame]]:
+    """Локальне відтворення збережених свічок зі сховища ``MonthStore``"""
+    yield from replay(store.read(pairs=pairs, start=start, end=end, columns=columns))
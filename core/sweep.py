@@ -0,0 +1,109 @@
+import gc
+from typing import Iterable, List, Sequence, Type
+import pandas as pd
+import vectorbt as vbt
+from core.metrics import compute_metrics
+from core.schema import as_float64
+from core.timeframes import BASE_TIMEFRAME
+from strategies.base import StrategyBase
+
+
+class ParameterSweep:
+    """Перебір сітки параметрів стратегій над панеллю пар.
+
+    Індикатори обчислюються один раз на кожне унікальне значення параметра
+    (див. ``sweep_signals`` у стратегіях), а комбінації симулюються пакетами
+    колонок одним багатоколонковим портфелем.
+    """
+
+    def __init__(
+        self,
+        panel: pd.DataFrame,
+        max_columns: int = 200,
+        timeframe: str = BASE_TIMEFRAME,
+    ):
+        """``panel`` - широка панель з ``DataLoader.to_panel``.
+
+        ``max_columns`` обмежує кількість колонок (комбінація x пара) в одній
+        симуляції, щоб пам'ять не росла разом із розміром сітки.
+        ``timeframe`` - інтервал свічок панелі, задає частоту портфеля.
+        Компактна (float32) панель розширюється до float64 для обчислень.
+        """
+        self.panel = as_float64(panel)
+        self.max_columns = max_columns
+        self.timeframe = timeframe
+
+    @staticmethod
+    def _resolve_grid(
+        strategy_cls: Type[StrategyBase], grid: dict[str, Sequence]
+    ) -> dict[str, list]:
+        """Доповнює сітку значеннями за замовчуванням і перевіряє ключі"""
+        unknown = set(grid) - set(strategy_cls.sweep_params)
+        if unknown:
+            raise ValueError(
+                f"{strategy_cls.__name__} не підтримує перебір {sorted(unknown)}"
+            )
+        defaults = strategy_cls.param_defaults()
+        return {
+            name: list(grid.get(name, [defaults[name]]))
+            for name in strategy_cls.sweep_params
+        }
+
+    def _simulate(
+        self, strategy_cls: Type[StrategyBase], chunk: List[tuple]
+    ) -> pd.DataFrame:
+        """Симулює пакет комбінацій одним портфелем і повертає довгу таблицю"""
+        names = list(chunk[0][0])
+        keys = pd.MultiIndex.from_tuples(
+            [tuple(item[0].values()) for item in chunk], names=names
+        )
+        # Кожен елемент пакета - (параметри, *сигнали стратегії)
+        signals = [
+            pd.concat([item[k] for item in chunk], axis=1, keys=keys)
+            for k in range(1, len(chunk[0]))
+        ]
+        close = self.panel["close"].vbt.tile(len(chunk), keys=keys)
+        bars = {
+            field: prices.vbt.tile(len(chunk), keys=keys)
+            for field, prices in strategy_cls.bar_prices(self.panel).items()
+        }
+
+        pf = strategy_cls.simulate(close, signals, self.timeframe, **bars)
+        return compute_metrics(pf).reset_index()
+
+    def run(
+        self, strategy_cls: Type[StrategyBase], grid: dict[str, Sequence]
+    ) -> pd.DataFrame:
+        """Оцінює всю сітку параметрів для однієї стратегії.
+
+        Повертає довгу таблицю: стратегія, пара, параметри, метрики.
+        """
+        grid = self._resolve_grid(strategy_cls, grid)
+        n_pairs = self.panel["close"].shape[1]
+        per_chunk = max(1, self.max_columns // n_pairs)
+
+        frames, chunk = [], []
+        for item in strategy_cls.sweep_signals(self.panel, grid):
+            chunk.append(item)
+            if len(chunk) >= per_chunk:
+                frames.append(self._simulate(strategy_cls, chunk))
+                chunk = []
+                # Об'єкти vectorbt утворюють цикли посилань; без явного збору
+                # пам'ять попередніх пакетів звільняється надто пізно
+                gc.collect()
+        if chunk:
+            frames.append(self._simulate(strategy_cls, chunk))
+
+        if not frames:
+            return pd.DataFrame()
+        results = pd.concat(frames, ignore_index=True)
+        results.insert(0, "strategy", strategy_cls.label)
+        results.insert(1, "pair", results.pop("pair"))
+        return results
+
+    def run_many(
+        self, grids: Iterable[tuple[Type[StrategyBase], dict[str, Sequence]]]
+    ) -> pd.DataFrame:
+        """Перебір сіток для кількох стратегій в одну довгу таблицю"""
+        frames = [self.run(strategy_cls, grid) for strategy_cls, grid in grids]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
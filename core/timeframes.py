@@ -0,0 +1,124 @@
+import hashlib
+import os
+from typing import Callable
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+# Таймфрейм завантажених даних Binance
+BASE_TIMEFRAME = "1min"
+# Агрегація свічок: перша/максимальна/мінімальна/остання ціна, сума обсягу
+OHLCV_AGG = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+def timeframe_offset(timeframe: str) -> pd.offsets.Tick:
+    """Фіксований інтервал (``"5min"``, ``"1h"``, ``"1D"``) як pandas offset.
+
+    Інтервал має ділити добу без остачі: тоді межі свічок від епохи
+    (``resample_ohlcv``) і від початку дня (``resample_panel``) збігаються.
+    """
+    offset = to_offset(timeframe)
+    if not isinstance(offset, pd.offsets.Tick):
+        raise ValueError(f"таймфрейм має бути фіксованим інтервалом: {timeframe}")
+    if pd.Timedelta(days=1) % pd.Timedelta(offset):
+        raise ValueError(f"таймфрейм має ділити добу без остачі: {timeframe}")
+    return offset
+
+
+def is_base(timeframe: str) -> bool:
+    return timeframe_offset(timeframe) == timeframe_offset(BASE_TIMEFRAME)
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Свічки ``timeframe`` для всіх пар довгої таблиці за один groupby.
+
+    Свічка починається на межі інтервалу (``timestamp.floor``) і містить
+    лише наявні хвилини; інтервали без жодної хвилини не створюються.
+    Результат впорядкований за парою та часом, як вихід ``DataLoader``.
+    """
+    offset = timeframe_offset(timeframe)
+    agg = {column: how for column, how in OHLCV_AGG.items() if column in df}
+    bars = (
+        df.groupby(
+            [df["pair"], df["timestamp"].dt.floor(offset)],
+            sort=True,
+            observed=True,
+        )
+        .agg(agg)
+        .reset_index()
+    )
+    return bars[["timestamp", *agg, "pair"]]
+
+
+def resample_panel(panel: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Те саме для широкої панелі ``DataLoader.to_panel`` (поле, пара)"""
+    offset = timeframe_offset(timeframe)
+    fields = panel.columns.get_level_values(0).unique()
+    resampler = {field: panel[field].resample(offset) for field in fields}
+    bars = pd.concat(
+        {
+            field: (
+                resampler[field].sum(min_count=1)
+                if OHLCV_AGG[field] == "sum"
+                else getattr(resampler[field], OHLCV_AGG[field])()
+            )
+            for field in fields
+        },
+        axis=1,
+    )
+    # resample створює й порожні інтервали; залишаємо лише ті, де є дані
+    return bars.dropna(how="all")
+
+
+def content_key(df: pd.DataFrame) -> str:
+    """Відбиток вмісту таблиці, стабільний між запусками (і для categorical)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class TimeframeCache:
+    """Дисковий кеш свічок старших таймфреймів.
+
+    Ключ описує вхідні хвилинні дані: відбиток їхнього вмісту або дешевший
+    опис, наприклад записи маніфесту за період - тоді при попаданні в кеш
+    хвилинні дані не потрібно навіть читати. Після оновлення даних ключ
+    змінюється, і свічки перераховуються.
+    """
+
+    def __init__(self, root: str = os.path.join("data", "timeframes")):
+        self.root = root
+
+    def path(self, key: str, timeframe: str) -> str:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        name = f"{timeframe_offset(timeframe).freqstr}_{digest}.parquet"
+        return os.path.join(self.root, name)
+
+    def get_or_build(
+        self, key: str, timeframe: str, source: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Свічки ``timeframe`` з диска або з хвилинних даних ``source()``"""
+        path = self.path(key, timeframe)
+        try:
+            return pd.read_parquet(path)
+        except (OSError, ValueError):
+            pass
+        df = source()
+        if df.empty:
+            return df
+        bars = resample_ohlcv(df, timeframe)
+        os.makedirs(self.root, exist_ok=True)
+        bars.to_parquet(path, index=False)
+        return bars
+
+    def get(self, df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """Свічки ``timeframe`` для ``df`` з ключем за вмістом"""
+        if is_base(timeframe):
+            return df
+        return self.get_or_build(content_key(df), timeframe, lambda: df)
@@ -0,0 +1,224 @@
+from typing import Sequence, Type
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from core.metrics import compute_metrics
+from core.schema import as_float64
+from core.sweep import ParameterSweep
+from core.timeframes import BASE_TIMEFRAME
+from strategies.base import StrategyBase
+
+# Метрики, для яких краще менше значення
+LOWER_IS_BETTER = {"max_drawdown"}
+
+
+class WalkForward:
+    """Walk-forward аналіз: оптимізація на вікні навчання, перевірка на
+    наступному тестовому вікні, зсув на ``step`` свічок.
+
+    Вікна нарізаються ``range_split`` з vectorbt у колонки (вікно, пара),
+    тож усі вікна всіх пар навчаються одним перебором ``ParameterSweep``,
+    а перевіряються одним багатоколонковим портфелем.
+    """
+
+    def __init__(
+        self,
+        panel: pd.DataFrame,
+        train_size: int,
+        test_size: int,
+        step: int = None,
+        objective: str = "sharpe_ratio",
+        per_pair: bool = True,
+        max_columns: int = 2000,
+        timeframe: str = BASE_TIMEFRAME,
+    ):
+        """``panel`` - широка панель з ``DataLoader.to_panel``.
+
+        Розміри вікон і ``step`` (за замовчуванням ``test_size``, тобто
+        тестові вікна не перекриваються) задаються у свічках. ``objective`` -
+        метрика ``core.metrics`` для вибору параметрів; ``per_pair=False``
+        обирає спільні параметри для всіх пар вікна за середнім значенням.
+        """
+        self.panel = as_float64(panel)
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step or test_size
+        self.objective = objective
+        self.per_pair = per_pair
+        self.max_columns = max_columns
+        self.timeframe = timeframe
+
+    def _starts(self) -> np.ndarray:
+        """Позиції початку вікон (навчання + тест) у панелі"""
+        window = self.train_size + self.test_size
+        starts = np.arange(0, len(self.panel) - window + 1, self.step)
+        if not len(starts):
+            raise ValueError(
+                f"даних ({len(self.panel)} свічок) менше за одне вікно ({window})"
+            )
+        return starts
+
+    def windows(self) -> pd.DataFrame:
+        """Повні вікна (навчання, потім тест) з колонками (поле, вікно, пара)"""
+        starts = self._starts()
+        ends = starts + self.train_size + self.test_size - 1
+        return pd.concat(
+            {
+                field: self.panel[field].vbt.range_split(
+                    start_idxs=starts, end_idxs=ends
+                )[0]
+                for field in self.panel.columns.get_level_values(0).unique()
+            },
+            axis=1,
+        )
+
+    def split(self) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Панелі навчання й тесту з колонками (поле, вікно, пара) та межі вікон"""
+        starts = self._starts()
+        window = self.train_size + self.test_size
+
+        train, test = {}, {}
+        for field in self.panel.columns.get_level_values(0).unique():
+            (train[field], train_index), (test[field], test_index) = self.panel[
+                field
+            ].vbt.range_split(
+                start_idxs=starts,
+                end_idxs=starts + window - 1,
+                set_lens=(self.test_size,),
+                left_to_right=False,
+            )
+        bounds = pd.DataFrame(
+            {
+                "train_start": [index[0] for index in train_index],
+                "train_end": [index[-1] for index in train_index],
+                "test_start": [index[0] for index in test_index],
+                "test_end": [index[-1] for index in test_index],
+            },
+            index=pd.Index(range(len(starts)), name="split_idx"),
+        )
+        return pd.concat(train, axis=1), pd.concat(test, axis=1), bounds
+
+    def _select(
+        self, scores: pd.DataFrame, names: list[str], defaults: dict
+    ) -> pd.DataFrame:
+        """Найкращі параметри для кожного (вікно, пара) за ``objective``.
+
+        Якщо жодна комбінація не має скінченного ``objective`` (напр. без
+        угод на навчанні ``sharpe_ratio`` нескінченний), для (вікно, пара)
+        беруться параметри ``defaults`` з NaN метрикою навчання.
+        """
+        keys = scores[["split_idx", "pair"]].drop_duplicates()
+        scores = scores.replace([np.inf, -np.inf], np.nan).dropna(
+            subset=[self.objective]
+        )
+        ascending = self.objective in LOWER_IS_BETTER
+        if self.per_pair:
+            ranked = scores.sort_values(self.objective, ascending=ascending)
+            chosen = ranked.groupby(["split_idx", "pair"]).head(1)
+        else:
+            mean = (
+                scores.groupby(["split_idx", *names])[self.objective]
+                .mean()
+                .reset_index()
+                .sort_values(self.objective, ascending=ascending)
+                .groupby("split_idx")
+                .head(1)
+            )
+            chosen = keys.merge(mean, on="split_idx")
+
+        missing = keys.merge(
+            chosen[["split_idx", "pair"]], how="left", indicator=True
+        ).query("_merge == 'left_only'")
+        fallback = missing[["split_idx", "pair"]].assign(
+            **{name: defaults[name] for name in names}, **{self.objective: np.nan}
+        )
+        return pd.concat([chosen, fallback], ignore_index=True)
+
+    def _simulate_test(
+        self,
+        strategy_cls: Type[StrategyBase],
+        windows: pd.DataFrame,
+        chosen: pd.DataFrame,
+        names: list[str],
+    ) -> pd.DataFrame:
+        """Тест обраних параметрів: одна симуляція для всіх (вікно, пара).
+
+        Сигнали рахуються над усім вікном (навчання + тест), тож індикатори
+        на початку тесту вже прогріті; симулюються лише тестові свічки.
+        """
+        grid = {name: sorted(chosen[name].unique()) for name in names}
+        columns = pd.MultiIndex.from_frame(chosen[["split_idx", "pair"]])
+        keys = chosen[names].itertuples(index=False, name=None)
+        wanted = pd.Series(list(keys), index=columns)
+
+        parts = []
+        test = slice(-self.test_size, None)
+        for params, *signals in strategy_cls.sweep_signals(windows, grid):
+            selected = wanted.index[wanted == tuple(params.values())]
+            if len(selected):
+                parts.append([signal[selected].iloc[test] for signal in signals])
+        signals = [pd.concat(frames, axis=1)[columns] for frames in zip(*parts)]
+
+        close = windows["close"][columns].iloc[test]
+        bars = {
+            field: prices[columns].iloc[test]
+            for field, prices in strategy_cls.bar_prices(windows).items()
+        }
+        pf = strategy_cls.simulate(close, signals, self.timeframe, **bars)
+        return compute_metrics(pf).reset_index()
+
+    def run(
+        self, strategy_cls: Type[StrategyBase], grid: dict[str, Sequence]
+    ) -> pd.DataFrame:
+        """Out-of-sample метрики кожного вікна кожної пари.
+
+        Рядок: стратегія, вікно, пара, межі вікон, обрані параметри,
+        ``train_<objective>`` та метрики на тестовому вікні.
+        """
+        train, _, bounds = self.split()
+        scores = ParameterSweep(train, self.max_columns, self.timeframe).run(
+            strategy_cls, grid
+        )
+        names = list(strategy_cls.sweep_params)
+        chosen = self._select(scores, names, strategy_cls.param_defaults())
+        if chosen.empty:
+            return pd.DataFrame()
+
+        tested = self._simulate_test(strategy_cls, self.windows(), chosen, names)
+        trained = chosen[["split_idx", "pair", *names, self.objective]].rename(
+            columns={self.objective: f"train_{self.objective}"}
+        )
+        results = trained.merge(tested, on=["split_idx", "pair"]).merge(
+            bounds, left_on="split_idx", right_index=True
+        )
+        results.insert(0, "strategy", strategy_cls.label)
+        order = ["strategy", "split_idx", "pair", *bounds.columns]
+        rest = [column for column in results if column not in order]
+        return results[order + rest].sort_values(
+            ["pair", "split_idx"], ignore_index=True
+        )
+
+    @staticmethod
+    def summary(results: pd.DataFrame) -> pd.DataFrame:
+        """Зведені out-of-sample метрики по стратегії та парі.
+
+        ``total_return`` - складена дохідність усіх тестових вікон поспіль,
+        ``trades`` - сума, решта метрик - середнє по вікнах.
+        """
+        metrics = [
+            column
+            for column in ("sharpe_ratio", "max_drawdown", "win_rate")
+            if column in results
+        ]
+        grouped = results.groupby(["strategy", "pair"], sort=False)
+        summary = grouped[metrics].mean()
+        summary.insert(0, "windows", grouped.size())
+        summary.insert(
+            1,
+            "total_return",
+            grouped["total_return"].apply(
+                lambda returns: ((1 + returns / 100).prod() - 1) * 100
+            ),
+        )
+        summary["trades"] = grouped["trades"].sum()
+        return summary.reset_index()
@@ -5,46 +5,117 @@ from strategies.ma_crossover import MACrossover
 from strategies.rsi_bb import RSIWithBB
 from strategies.sma_cross import SMACrossover
 from core.backtester import Backtester
+from core.profiling import profile_to, profiler
+from core.results import ResultStore
 
 import asyncio
 
 PAIRS_TO_GET = 100
+# Зафіксований набір пар: повторні запуски не залежать від поточних обсягів
+UNIVERSE = "2025-02"
+# Інтервал свічок: "1min" - вихідні дані, "5min", "15min", "1h" - агреговані
+TIMEFRAME = "1min"
+MAX_WORKERS = os.cpu_count()
+# Одна багатоколонкова симуляція на стратегію замість окремої на кожну пару
+BATCHED = True
+# Ціни та обсяг у пам'яті як float32 сховища (індикатори все одно рахуються у float64)
+COMPACT = True
+# Пропущені свічки у панелі: "ffill" - пласка свічка з попереднього close, "none" - NaN
+GAP_FILL = "ffill"
+# Сховище результатів: повтор виконує лише нові чи змінені задачі; None - вимкнено
+RESULT_STORE = os.path.join("results", "runs.sqlite")
+# Графіки кривих капіталу: "none", "html", "png" або "dashboard" (один HTML)
+CHART_FORMAT = "dashboard"
+# Звіт часу етапів по стратегіях і парах у results/profile.{json,csv}
+PROFILE = False
+# Дамп профілю: "results/profile.prof" (cProfile) або ".html" (pyinstrument)
+PROFILE_DUMP = None
+# Стратегії бектесту
+STRATEGIES = (SMACrossover, RSIWithBB, MACrossover)
+# Поля панелі - усі колонки, які читають стратегії (open/high/low - для стопів)
+FIELDS = tuple(
+    field
+    for field in ("open", "high", "low", "close")
+    if any(field in strategy_cls.required_columns for strategy_cls in STRATEGIES)
+)
 
 
 async def main():
+    profiler.enabled = PROFILE
+    with profile_to(PROFILE_DUMP):
+        await run()
+    if PROFILE:
+        profiler.save("results/profile.json")
+        profiler.save("results/profile.csv")
+        print("⏱️ Звіт профілювання збережено у results/profile.json")
+
+
+async def run():
     # Ініціалізація
     loader = DataLoader()
-    backtester = Backtester([])
+    store = ResultStore(RESULT_STORE) if RESULT_STORE else None
+    backtester = Backtester(
+        [],
+        max_workers=MAX_WORKERS,
+        chart_format=CHART_FORMAT,
+        result_store=store,
+    )
 
     # Завантаження даних
     print("🔄 Завантаження даних...")
-    all_data = await loader.load_month(2025, 2, PAIRS_TO_GET)
+    if BATCHED:
+        # Вирівняна панель: кожна хвилина є рядком, пропуски - пласкі свічки
+        data = await loader.load_panel(
+            2025,
+            2,
+            PAIRS_TO_GET,
+            UNIVERSE,
+            TIMEFRAME,
+            fields=FIELDS,
+            fill=GAP_FILL,
+            compact=COMPACT,
+        )
+        loaded = not data.empty
+    else:
+        # Ліниві handle: воркер читає лише колонки й діапазон стратегій пари
+        handles = await loader.load_handles(
+            2025, 2, PAIRS_TO_GET, UNIVERSE, TIMEFRAME, compact=COMPACT
+        )
+        loaded = bool(handles)
 
-    if all_data.empty:
+    if not loaded:
         print("❌ Не вдалося завантажити дані")
         return
 
-    # Створення стратегій
-    strategies = []
-    for pair, data in all_data.groupby("pair"):
-        strategies.extend(
-            [
-                SMACrossover(data, pair=pair),
-                RSIWithBB(data, pair=pair),
-                MACrossover(data, pair=pair),
-            ]
+    print("🚀 Запуск бектестів...")
+    if BATCHED:
+        results = await backtester.run_batched(
+            data,
+            list(STRATEGIES),
+            wait_charts=False,
+            timeframe=TIMEFRAME,
         )
+    else:
+        # Пам'ять залежить від кількості воркерів, а не від розміру датасету
+        strategies = [
+            strategy_cls.from_handle(handle)
+            for handle in handles
+            for strategy_cls in STRATEGIES
+        ]
 
-    # Паралельний бектест
-    print("🚀 Запуск бектестів...")
-    backtester.strategies = strategies
-    results = await backtester.run_all()
+        # Паралельний бектест
+        backtester.strategies = strategies
+        results = await backtester.run_all(wait_charts=False)
 
     # Збереження результатів
     os.makedirs("results", exist_ok=True)
     results.to_csv("results/metrics.csv", index=False)
     print("✅ Результати збережено у results/metrics.csv")
 
+    # Графіки рендеряться у фоні, поки зберігаються метрики
+    print("📈 Збереження графіків...")
+    await backtester.charts_done()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,9 +1,236 @@
+import functools
+import inspect
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Optional, Sequence, Union
+import numpy as np
 import pandas as pd
+import vectorbt as vbt
+from core.indicators import IndicatorCache, fingerprint, shared_cache
+from core.metrics import DEFAULT_METRICS, compute_metrics, relative_tick
+from core.profiling import profiler
+from core.schema import as_float64
+from core.timeframes import BASE_TIMEFRAME, timeframe_offset
+
+# Поля свічки, за якими ``simulate`` перевіряє стопи (крім close)
+BAR_FIELDS = ("open", "high", "low")
+
+
+@dataclass
+class BacktestResult:
+    """Результат одного бектесту: портфель, сигнали та ліниві похідні дані."""
+
+    portfolio: vbt.Portfolio
+    signals: Any = None
+
+    def metrics(self, names: Sequence[str] = DEFAULT_METRICS) -> pd.DataFrame:
+        """Лише потрібні метрики з рядком на колонку портфеля (``core.metrics``)"""
+        return compute_metrics(self.portfolio, names)
+
+    @cached_property
+    def stats(self) -> Union[pd.Series, pd.DataFrame]:
+        """Повна статистика портфеля, обчислюється при першому зверненні.
+
+        Для багатоколонкового портфеля повертає DataFrame з рядком на колонку.
+        """
+        if self.portfolio.wrapper.ndim == 2:
+            return self.portfolio.stats(agg_func=None)
+        return self.portfolio.stats()
+
+    @cached_property
+    def equity_curve(self) -> pd.Series:
+        """Крива капіталу (кумулятивна дохідність)."""
+        return self.portfolio.cumulative_returns()
+
+
+def _labels(strategy: "StrategyBase") -> dict:
+    return {"strategy": type(strategy).__name__, "pair": strategy.pair}
+
+
+def _float64_data(method):
+    """Виконує метод над float64-копією компактних (float32) даних.
+
+    ``self.data`` залишається компактним між викликами; для float64 даних
+    копія не створюється.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        data = self.data
+        self.data = as_float64(data)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.data = data
+
+    return wrapper
+
 
 class StrategyBase(ABC):
-    def __init__(self, price_data: pd.DataFrame):
+    label: str = ""
+    report_params: tuple = ()
+    sweep_params: tuple = ()
+    portfolio_kwargs: dict = {}
+    # Кеш індикаторів; None вимикає кешування
+    indicators: Optional[IndicatorCache] = shared_cache
+    # Сигнали з numba-ядра core.kernels замість ланцюжка індикаторів vectorbt
+    fused_signals: bool = False
+    # Метрики понад колонки metrics.csv, напр. ("sortino_ratio", "exposure")
+    extra_metrics: tuple = ()
+    # Колонки OHLCV, які читає стратегія (див. ``from_handle``)
+    required_columns: tuple = ("close",)
+
+    def __init_subclass__(cls, **kwargs):
+        """Обгортає ``generate_signals``/``run_backtest`` таймерами та float64"""
+        super().__init_subclass__(**kwargs)
+        for name, stage in (
+            ("generate_signals", "signals"),
+            ("run_backtest", "simulate"),
+        ):
+            if name in cls.__dict__:
+                method = _float64_data(cls.__dict__[name])
+                setattr(cls, name, profiler.timed(stage, _labels)(method))
+
+    def __init__(
+        self,
+        price_data: pd.DataFrame,
+        pair: Optional[str] = None,
+        timeframe: str = BASE_TIMEFRAME,
+    ):
+        """``timeframe`` - інтервал свічок ``price_data`` (див. ``core.timeframes``)"""
+        timeframe_offset(timeframe)
+        self._cache = None
+        self._handle = None
         self.data = price_data
+        self.pair = pair
+        self.timeframe = timeframe
+        # Початок періоду бектесту; свічки до нього - лише прогрів індикаторів
+        self.start: Optional[pd.Timestamp] = None
+        self._result: Optional[BacktestResult] = None
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """Дані стратегії; з ``from_cache``/``from_handle`` - при першому зверненні"""
+        if self._data is None:
+            if self._handle is not None:
+                self._data = self._handle.load()
+            elif self._cache is not None:
+                self._data = self._cache.view(self.pair)
+        return self._data
+
+    @data.setter
+    def data(self, value: pd.DataFrame):
+        self._data = value
+
+    @property
+    def lookback(self) -> int:
+        """Кількість свічок прогріву індикаторів перед початком періоду"""
+        return 0
+
+    @classmethod
+    def from_cache(cls, cache, pair: str, **params) -> "StrategyBase":
+        """Створює стратегію поверх read-only представлення ``OHLCVCache``.
+
+        Такі стратегії серіалізуються без даних: у процесі-воркері вони
+        підключаються до того ж memory-map кешу.
+        """
+        strategy = cls(cache.view(pair), pair=pair, **params)
+        strategy._cache = cache
+        return strategy
+
+    @classmethod
+    def from_handle(cls, handle, **params) -> "StrategyBase":
+        """Створює стратегію над лінивим ``core.handles.DataHandle`` пари.
+
+        Стратегія додає до handle свої ``required_columns`` і ``lookback``;
+        дані читаються лише при першому зверненні до ``data`` (у воркері)
+        і звільняються ``release`` після задачі.
+        """
+        strategy = cls(None, pair=handle.pair, timeframe=handle.timeframe, **params)
+        strategy._handle = handle.require(cls.required_columns, strategy.lookback)
+        strategy.start = handle.start
+        return strategy
+
+    def _period(self, obj):
+        """``obj`` без свічок прогріву: сигнали та ціни з ``[start, ...)``.
+
+        Індикатори рахуються над усіма даними handle, а симулюється лише
+        період бектесту, тож прогрів не потрапляє в угоди та метрики.
+        """
+        return obj if self.start is None else obj.loc[self.start :]
+
+    def data_key(self) -> str:
+        """Відбиток даних стратегії; для handle - без читання даних"""
+        if self._handle is not None:
+            return self._handle.fingerprint()
+        return fingerprint(self.data)
+
+    def release(self):
+        """Звільняє дані handle та результат бектесту після задачі"""
+        if self._handle is not None:
+            self._handle.release()
+            self._data = None
+            self._result = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state.get("_cache") is not None or state.get("_handle") is not None:
+            state["_data"] = None
+        return state
+
+    @classmethod
+    def param_defaults(cls) -> dict:
+        """Значення параметрів стратегії за замовчуванням (з сигнатури __init__)."""
+        return {
+            name: param.default
+            for name, param in inspect.signature(cls.__init__).parameters.items()
+            if param.default is not inspect.Parameter.empty
+            and name not in ("pair", "timeframe")
+        }
+
+    def portfolio_options(self) -> dict:
+        """Параметри симуляції; частота портфеля відповідає таймфрейму"""
+        return {**self.portfolio_kwargs, "freq": self.timeframe}
+
+    @classmethod
+    def bar_prices(cls, data: pd.DataFrame) -> dict:
+        """open/high/low з ``data`` для ``simulate``, якщо їх читає стратегія"""
+        return {
+            field: data[field]
+            for field in BAR_FIELDS
+            if field in cls.required_columns and field in data
+        }
+
+    @classmethod
+    def simulate(
+        cls,
+        close: pd.DataFrame,
+        signals: Sequence,
+        freq: str = BASE_TIMEFRAME,
+        **bars: pd.DataFrame,
+    ) -> vbt.Portfolio:
+        """Портфель для сигналів ``generate_signals``/``sweep_signals``.
+
+        За замовчуванням сигнали - (entries, exits) для
+        ``Portfolio.from_signals`` з ``portfolio_kwargs``. ``bars`` -
+        open/high/low з ``bar_prices`` для перевірки стопів усередині свічки.
+        """
+        entries, exits = signals
+        return vbt.Portfolio.from_signals(
+            close,
+            entries=entries,
+            exits=exits,
+            **bars,
+            **{**cls.portfolio_kwargs, "freq": freq},
+        )
+
+    @property
+    def result(self) -> BacktestResult:
+        """Результат бектесту; симуляція виконується не більше одного разу."""
+        if self._result is None:
+            self._result = self.run_backtest()
+        return self._result
 
     @abstractmethod
     def generate_signals(self) -> pd.DataFrame:
@@ -11,11 +238,58 @@ class StrategyBase(ABC):
         pass
 
     @abstractmethod
-    def run_backtest(self) -> pd.DataFrame:
+    def run_backtest(self) -> BacktestResult:
         """Запуск бектеста."""
         pass
 
-    @abstractmethod
+    def coarse_tick(self, close: pd.DataFrame) -> np.ndarray:
+        """Колонки ``close``, де крок ціни більший за найменший SL/TP.
+
+        На таких парах кожна зміна ціни перескакує рівень стопу, тож угоди
+        закриваються з розривом на цілий тік і метрики безглузді.
+        """
+        stops = np.concatenate(
+            [
+                np.ravel(self.portfolio_kwargs.get(name, np.nan))
+                for name in ("sl_stop", "tp_stop")
+            ]
+        )
+        tick = relative_tick(close)
+        if np.isnan(stops).all():
+            return np.zeros(len(tick), dtype=bool)
+        return tick > np.nanmin(stops)
+
+    def _metrics(self) -> pd.DataFrame:
+        result = self.result
+        with profiler.stage("metrics", **_labels(self)):
+            metrics = result.metrics(DEFAULT_METRICS + tuple(self.extra_metrics))
+            # Пари з надто грубим кроком ціни не потрапляють у рейтинги звіту
+            metrics.loc[self.coarse_tick(result.portfolio.close)] = np.nan
+            return metrics
+
     def get_metrics(self) -> dict:
         """Расчет метрик."""
-        pass
\ No newline at end of file
+        metrics = self._metrics()
+
+        return {
+            "strategy": self.label,
+            "pair": self.pair,
+            **{name: metrics[name].iloc[0] for name in metrics},
+            **{name: getattr(self, name) for name in self.report_params},
+        }
+
+    def get_metrics_frame(self) -> pd.DataFrame:
+        """Метрики у вигляді таблиці з рядком на кожну пару.
+
+        Для стратегії над панеллю пар (колонки ``close`` - пари) усі пари
+        симулюються одним портфелем, а метрики рахуються по колонках.
+        """
+        if self.result.portfolio.wrapper.ndim == 1:
+            return pd.DataFrame([self.get_metrics()])
+
+        frame = self._metrics()
+        frame.insert(0, "strategy", self.label)
+        frame.insert(1, "pair", frame.index)
+        for name in self.report_params:
+            frame[name] = getattr(self, name)
+        return frame.reset_index(drop=True)
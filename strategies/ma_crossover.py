@@ -1,77 +1,88 @@
+from typing import Iterator, Sequence
 import pandas as pd
 import vectorbt as vbt
-from strategies.base import StrategyBase
+from core.indicators import ma
+from core.kernels import crossover_signals
+from core.streaming import CrossoverStream
+from core.timeframes import BASE_TIMEFRAME
+from strategies.base import BacktestResult, StrategyBase
+from strategies.sma_cross import crossover_sweep
 
 
 class MACrossover(StrategyBase):
     """Стратегія на основі перетину двох ковзних середніх (MA Crossover)."""
 
+    label = "MA Crossover"
+    report_params = ("short_window", "long_window")
+    sweep_params = ("short_window", "long_window")
+    portfolio_kwargs = dict(fees=0.001, slippage=0.005)
+
     def __init__(
         self,
         price_data: pd.DataFrame,
         pair: str = None,
         short_window: int = 25,
         long_window: int = 100,
+        timeframe: str = BASE_TIMEFRAME,
     ):
         """Ініціалізує стратегію з параметрами."""
-        super().__init__(price_data)
-        self.pair = pair
+        super().__init__(price_data, pair, timeframe)
         self.short_window = short_window
         self.long_window = long_window
 
+    @property
+    def lookback(self) -> int:
+        return self.long_window
+
     def generate_signals(self) -> pd.DataFrame:
-        """Генерує вхідні та вихідні сигнали на основі MA."""
-        close = self.data["close"]
-        short_ma = vbt.MA.run(close, self.short_window).ma
-        long_ma = vbt.MA.run(close, self.long_window).ma
+        """Генерує вхідні та вихідні сигнали на основі MA.
 
-        entries = short_ma.vbt.crossed_above(long_ma)
-        exits = short_ma.vbt.crossed_below(long_ma)
+        З ``fused_signals`` ковзні середні не матеріалізуються, тож у
+        результаті лише ``entries``, ``exits`` та ``close``.
+        """
+        close = self.data["close"]
+        if self.fused_signals:
+            entries, exits = crossover_signals(
+                close, self.short_window, self.long_window
+            )
+            averages = {}
+        else:
+            short_ma = ma(close, self.short_window, self.indicators, self.pair)
+            long_ma = ma(close, self.long_window, self.indicators, self.pair)
+            entries = short_ma.vbt.crossed_above(long_ma)
+            exits = short_ma.vbt.crossed_below(long_ma)
+            averages = {"short_ma": short_ma, "long_ma": long_ma}
 
-        return pd.DataFrame(
-            {
-                "entries": entries,
-                "exits": exits,
-                "close": close,
-                "short_ma": short_ma,
-                "long_ma": long_ma,
-            },
-            index=self.data.index,
+        # concat працює і для однієї пари (Series), і для панелі пар (DataFrame)
+        return pd.concat(
+            {"entries": entries, "exits": exits, "close": close, **averages},
+            axis=1,
         )
 
-    def run_backtest(self) -> dict:
+    def run_backtest(self) -> BacktestResult:
         """Виконує бектест стратегії."""
-        signals = self.generate_signals()
+        signals = self._period(self.generate_signals())
 
         pf = vbt.Portfolio.from_signals(
             signals["close"],
             entries=signals["entries"],
             exits=signals["exits"],
-            fees=0.001,
-            slippage=0.005,
-            freq="1min",
+            **self.portfolio_options(),
         )
+        return BacktestResult(pf, signals)
 
-        return {
-            "portfolio": pf,
-            "equity_curve": pf.cumulative_returns(),
-            "signals": signals,
-            "stats": pf.stats(),
-        }
-
-    def get_metrics(self) -> dict:
-        """Розраховує основні метрики стратегії."""
-        backtest_result = self.run_backtest()
-        stats = backtest_result["stats"]
+    @classmethod
+    def sweep_signals(cls, panel: pd.DataFrame, grid: dict) -> Iterator[tuple]:
+        """Сигнали для всієї сітки вікон над панеллю пар."""
+        for short, long, entries, exits in crossover_sweep(
+            panel["close"],
+            grid["short_window"],
+            grid["long_window"],
+        ):
+            yield {"short_window": short, "long_window": long}, entries, exits
 
-        return {
-            "strategy": "MA Crossover",
-            "pair": self.pair,
-            "total_return": stats.loc["Total Return [%]"],
-            "sharpe_ratio": stats.loc["Sharpe Ratio"],
-            "max_drawdown": stats.loc["Max Drawdown [%]"],
-            "win_rate": stats.loc["Win Rate [%]"],
-            "trades": stats.loc["Total Trades"],
-            "short_window": self.short_window,
-            "long_window": self.long_window,
-        }
+    @classmethod
+    def stream(cls, pairs: Sequence[str], **params) -> CrossoverStream:
+        """Потокові сигнали для пар; збігаються з ``generate_signals``."""
+        params = {**cls.param_defaults(), **params}
+        return CrossoverStream(pairs, params["short_window"], params["long_window"])
@@ -1,11 +1,30 @@
+from itertools import product
+from typing import Iterator, Optional, Sequence
 import pandas as pd
 import vectorbt as vbt
-from strategies.base import StrategyBase
+from core import indicators
+from core.indicators import IndicatorCache
+from core.kernels import rsi_bb_signals
+from core.simulator import simulate_sl_tp
+from core.streaming import RSIBBStream
+from core.timeframes import BASE_TIMEFRAME
+from strategies.base import BacktestResult, StrategyBase
 
 
 class RSIWithBB(StrategyBase):
     """Комбінована стратегія на основі RSI та Болінджерівських смуг."""
 
+    label = "RSI with BB"
+    report_params = ("rsi_window", "bb_window")
+    sweep_params = ("rsi_window", "bb_window")
+    required_columns = ("open", "high", "low", "close")
+    portfolio_kwargs = dict(
+        fees=0.0005,
+        slippage=0.001,  # Сліппейдж 0.1%
+        sl_stop=0.01,  # Stop-Loss 0.8%
+        tp_stop=0.016,  # Take-Profit 4%
+    )
+
     def __init__(
         self,
         price_data: pd.DataFrame,
@@ -15,31 +34,60 @@ class RSIWithBB(StrategyBase):
         rsi_oversold: int = 40,
         bb_window: int = 20,
         bb_std: float = 1.5,
+        timeframe: str = BASE_TIMEFRAME,
     ):
         """Ініціалізує стратегію з параметрами."""
-        super().__init__(price_data)
-        self.pair = pair
+        super().__init__(price_data, pair, timeframe)
         self.rsi_window = rsi_window
         self.rsi_overbought = rsi_overbought
         self.rsi_oversold = rsi_oversold
         self.bb_window = bb_window
         self.bb_std = bb_std
-        self._pf = None
+
+    @property
+    def lookback(self) -> int:
+        # ATR(14) та його ковзне середнє за 50 свічок - найдовший прогрів
+        return max(self.rsi_window + 1, self.bb_window, 14 + 50)
 
     def generate_signals(self):
         """Генерує сигнали на основі RSI та Bollinger Bands."""
         close = self.data["close"]
-        rsi = vbt.RSI.run(close, self.rsi_window).rsi
-        bb = vbt.BBANDS.run(close, self.bb_window, self.bb_std)
+        # bb_std потрапляє у vectorbt як прапорець ewm, тож ядро відтворює
+        # EWM-смуги; для bb_std=0 лишається шлях через vectorbt
+        if self.fused_signals and self.bb_std:
+            return rsi_bb_signals(
+                close,
+                self.data["high"],
+                self.data["low"],
+                self.rsi_window,
+                self.bb_window,
+            )
 
-        # М'якші умови з додатковими фільтрами
-        atr = vbt.ATR.run(
-            self.data["high"], self.data["low"], self.data["close"], 14
-        ).atr
-        atr_filter = atr > atr.rolling(50).mean() * 0.5  # Фільтр низької волатильності
+        cache, pair = self.indicators, self.pair
+        rsi = indicators.rsi(close, self.rsi_window, cache, pair)
+        bb_lower, bb_upper = indicators.bbands(
+            close, self.bb_window, self.bb_std, cache, pair
+        )
+        atr_filter = self._atr_filter(self.data, cache, pair)
 
-        long_entry = (rsi < 45) & (close <= bb.lower * 1.02) & atr_filter
-        short_entry = (rsi > 55) & (close >= bb.upper * 0.98) & atr_filter
+        return self._combine_signals(close, rsi, bb_lower, bb_upper, atr_filter)
+
+    @staticmethod
+    def _atr_filter(
+        data: pd.DataFrame,
+        cache: Optional[IndicatorCache] = None,
+        pair: Optional[str] = None,
+    ):
+        """Фільтр низької волатильності на основі ATR."""
+        atr = indicators.atr(data["high"], data["low"], data["close"], 14, cache, pair)
+        return atr > indicators.rolling_mean(atr, 50, cache, pair) * 0.5
+
+    @staticmethod
+    def _combine_signals(close, rsi, bb_lower, bb_upper, atr_filter) -> tuple:
+        """Поєднує індикатори у сигнали входу/виходу для лонгів і шортів."""
+        # М'якші умови з додатковими фільтрами
+        long_entry = (rsi < 45) & (close <= bb_lower * 1.02) & atr_filter
+        short_entry = (rsi > 55) & (close >= bb_upper * 0.98) & atr_filter
 
         # Вихід при середньому рівні RSI
         long_exit = rsi >= 50
@@ -47,38 +95,64 @@ class RSIWithBB(StrategyBase):
 
         return long_entry, long_exit, short_entry, short_exit
 
-    def run_backtest(self) -> vbt.Portfolio:
+    def run_backtest(self) -> BacktestResult:
         """Виконує бектест стратегії з обмеженням ризиків."""
-        long_entry, long_exit, short_entry, short_exit = self.generate_signals()
-
-        self._pf = vbt.Portfolio.from_signals(
-            self.data["close"],
-            entries=long_entry | short_entry,
-            exits=long_exit | short_exit,
-            fees=0.0005,
-            slippage=0.001,  # Сліппейдж 0.1%
-            sl_stop=0.01,  # Stop-Loss 0.8%
-            tp_stop=0.016,  # Take-Profit 4%
-            freq="1min",  # Таймфрейм
-            direction="both",  # Дозволити лонги та шорти
+        signals = tuple(map(self._period, self.generate_signals()))
+        data = self._period(self.data)
+        pf = self.simulate(
+            data["close"], signals, self.timeframe, **self.bar_prices(data)
         )
-        return self._pf
-
-    def get_metrics(self) -> dict:
-        """Розраховує метрики продуктивності стратегії."""
-        if not hasattr(self, "_pf") or self._pf is None:
-            self._pf = self.run_backtest()
-
-        stats = self._pf.stats()
-
-        return {
-            "strategy": "RSI with BB",
-            "pair": self.pair,
-            "total_return": stats.get("Total Return [%]"),
-            "sharpe_ratio": stats.get("Sharpe Ratio"),
-            "max_drawdown": stats.get("Max Drawdown [%]"),
-            "win_rate": stats.get("Win Rate [%]"),
-            "trades": stats.get("Total Trades"),
-            "rsi_window": self.rsi_window,
-            "bb_window": self.bb_window,
-        }
+        return BacktestResult(pf, signals)
+
+    @classmethod
+    def simulate(
+        cls,
+        close: pd.DataFrame,
+        signals: Sequence,
+        freq: str = BASE_TIMEFRAME,
+        **bars: pd.DataFrame,
+    ) -> vbt.Portfolio:
+        """Лонги та шорти з окремими входами/виходами і SL/TP.
+
+        ``signals`` - (long_entry, long_exit, short_entry, short_exit);
+        симуляція numba-ядром ``core.simulator`` замість ``from_signals``.
+        Стопи в межах свічки (за ``bars``) виконуються за рівнем стопу.
+        """
+        return simulate_sl_tp(
+            close, *signals, **cls.portfolio_kwargs, freq=freq, **bars
+        )
+
+    @classmethod
+    def sweep_signals(cls, panel: pd.DataFrame, grid: dict) -> Iterator[tuple]:
+        """Сигнали для сітки параметрів RSI/BB над панеллю пар.
+
+        RSI рахується один раз на кожне вікно, смуги Боллінджера - один раз
+        на кожне вікно, ATR-фільтр - один раз для всієї сітки.
+        """
+        close = panel["close"]
+        bb_std = cls.param_defaults()["bb_std"]
+        rsi = vbt.RSI.run(close, grid["rsi_window"]).rsi
+        bb = vbt.BBANDS.run(close, grid["bb_window"], [bb_std], param_product=True)
+        atr_filter = cls._atr_filter(panel)
+
+        for rsi_window, bb_window in product(grid["rsi_window"], grid["bb_window"]):
+            long_entry, long_exit, short_entry, short_exit = cls._combine_signals(
+                close,
+                rsi[rsi_window],
+                bb.lower[(bb_window, bb_std)],
+                bb.upper[(bb_window, bb_std)],
+                atr_filter,
+            )
+            params = {"rsi_window": rsi_window, "bb_window": bb_window}
+            yield params, long_entry, long_exit, short_entry, short_exit
+
+    @classmethod
+    def stream(cls, pairs: Sequence[str], **params) -> RSIBBStream:
+        """Потокові сигнали для пар; збігаються з ``generate_signals``.
+
+        Як і numba-ядро, підтримує лише EWM-смуги (``bb_std`` не нуль).
+        """
+        params = {**cls.param_defaults(), **params}
+        if not params["bb_std"]:
+            raise ValueError("потоковий режим потребує bb_std != 0")
+        return RSIBBStream(pairs, params["rsi_window"], params["bb_window"])
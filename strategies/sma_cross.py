@@ -1,30 +1,67 @@
+from itertools import product
+from typing import Iterator, Sequence
 import pandas as pd
 import vectorbt as vbt
-from strategies.base import StrategyBase
+from core.indicators import ma
+from core.kernels import crossover_signals
+from core.streaming import CrossoverStream
+from core.timeframes import BASE_TIMEFRAME
+from strategies.base import BacktestResult, StrategyBase
+
+
+def crossover_sweep(
+    close: pd.DataFrame, fast_windows: Sequence[int], slow_windows: Sequence[int]
+) -> Iterator[tuple]:
+    """Сигнали перетину MA для кожної пари вікон (fast < slow).
+
+    Кожне унікальне вікно обчислюється один раз і перевикористовується
+    в усіх комбінаціях, де воно зустрічається.
+    """
+    windows = sorted(set(fast_windows) | set(slow_windows))
+    ma = vbt.MA.run(close, windows).ma
+
+    for fast, slow in product(fast_windows, slow_windows):
+        if fast >= slow:
+            continue
+        fast_ma, slow_ma = ma[fast], ma[slow]
+        entries = fast_ma.vbt.crossed_above(slow_ma)
+        exits = fast_ma.vbt.crossed_below(slow_ma)
+        yield fast, slow, entries, exits
 
 
 class SMACrossover(StrategyBase):
     """Стратегія на основі перетину двох простих ковзних середніх (SMA)."""
 
+    label = "SMA Crossover"
+    report_params = ("fast_window", "slow_window")
+    sweep_params = ("fast_window", "slow_window")
+    portfolio_kwargs = dict(fees=0.001, slippage=0.005)
+
     def __init__(
         self,
         price_data: pd.DataFrame,
         pair: str = None,
         fast_window: int = 15,
         slow_window: int = 40,
+        timeframe: str = BASE_TIMEFRAME,
     ):
         """Ініціалізує стратегію з параметрами."""
-        super().__init__(price_data)
-        self.pair = pair
+        super().__init__(price_data, pair, timeframe)
         self.fast_window = fast_window
         self.slow_window = slow_window
-        self._pf = None
+
+    @property
+    def lookback(self) -> int:
+        return self.slow_window
 
     def generate_signals(self) -> tuple:
         """Генерує сигнали входу/виходу на основі перетину SMA."""
         close = self.data["close"]
-        fast_ma = vbt.MA.run(close, self.fast_window).ma
-        slow_ma = vbt.MA.run(close, self.slow_window).ma
+        if self.fused_signals:
+            return crossover_signals(close, self.fast_window, self.slow_window)
+
+        fast_ma = ma(close, self.fast_window, self.indicators, self.pair)
+        slow_ma = ma(close, self.slow_window, self.indicators, self.pair)
 
         # Vectorized signal generation
         entries = fast_ma.vbt.crossed_above(slow_ma)
@@ -32,49 +69,30 @@ class SMACrossover(StrategyBase):
 
         return entries, exits
 
-    def run_backtest(self) -> vbt.Portfolio:
+    def run_backtest(self) -> BacktestResult:
         """Виконує бектест стратегії."""
-        entries, exits = self.generate_signals()
-
-        if self.data["close"].empty:
-            return None
-
-        try:
-            self._pf = vbt.Portfolio.from_signals(
-                self.data["close"],
-                entries=entries,
-                exits=exits,
-                fees=0.001,
-                slippage=0.005,
-                freq="1min",
-            )
-            return self._pf
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            return None
-
-    def get_metrics(self) -> dict:
-        """Розраховує метрики продуктивності стратегії."""
-        if not hasattr(self, "_pf") or self._pf is None:
-            self._pf = self.run_backtest()
-
-        if self._pf is None:
-            return {
-                "strategy": "SMA Crossover",
-                "pair": self.pair,
-                "error": "Failed to create portfolio",
-            }
-
-        stats = self._pf.stats()
-
-        return {
-            "strategy": "SMA Crossover",
-            "pair": self.pair,
-            "total_return": stats.get("Total Return [%]"),
-            "sharpe_ratio": stats.get("Sharpe Ratio"),
-            "max_drawdown": stats.get("Max Drawdown [%]"),
-            "win_rate": stats.get("Win Rate [%]"),
-            "trades": stats.get("Total Trades"),
-            "fast_window": self.fast_window,
-            "slow_window": self.slow_window,
-        }
+        entries, exits = map(self._period, self.generate_signals())
+
+        pf = vbt.Portfolio.from_signals(
+            self._period(self.data["close"]),
+            entries=entries,
+            exits=exits,
+            **self.portfolio_options(),
+        )
+        return BacktestResult(pf, (entries, exits))
+
+    @classmethod
+    def sweep_signals(cls, panel: pd.DataFrame, grid: dict) -> Iterator[tuple]:
+        """Сигнали для всієї сітки вікон над панеллю пар."""
+        for fast, slow, entries, exits in crossover_sweep(
+            panel["close"],
+            grid["fast_window"],
+            grid["slow_window"],
+        ):
+            yield {"fast_window": fast, "slow_window": slow}, entries, exits
+
+    @classmethod
+    def stream(cls, pairs: Sequence[str], **params) -> CrossoverStream:
+        """Потокові сигнали для пар; збігаються з ``generate_signals``."""
+        params = {**cls.param_defaults(), **params}
+        return CrossoverStream(pairs, params["fast_window"], params["slow_window"])
@@ -1,12 +1,8 @@
-import pytest
+import asyncio
+import sys
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Створюємо event loop для асинхронних тестів"""
-    import asyncio
-
-    policy = asyncio.WindowsSelectorEventLoopPolicy()
-    loop = policy.new_event_loop()
-    yield loop
-    loop.close()
+def pytest_configure(config):
+    """Selector-цикл на Windows (потрібен aiohttp), стандартний деінде"""
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -2,8 +2,36 @@ import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 import pandas as pd
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from core.backtester import Backtester
+from core.data_loader import DataLoader
+from core.simulator import simulate_sl_tp
 from strategies.base import StrategyBase
+from strategies.sma_cross import SMACrossover
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+import numpy as np
+import vectorbt as vbt
+
+
+class DummyStrategy(StrategyBase):
+    """Проста стратегія, яку можна передати у процес-воркер"""
+
+    def __init__(self, price_data, pair, fail=False):
+        super().__init__(price_data)
+        self.pair = pair
+        self.fail = fail
+
+    def generate_signals(self):
+        return None
+
+    def run_backtest(self):
+        return self.data["close"] / self.data["close"].iloc[0]
+
+    def get_metrics(self):
+        if self.fail:
+            raise ValueError("boom")
+        return {"total_return": float(self.data["close"].iloc[-1])}
 
 
 @pytest.fixture
@@ -48,7 +76,109 @@ async def test_run_all(backtester, mock_strategy):
         mock_save.assert_called_once()
 
 
-def test_create_heatmap(backtester):
+@pytest.mark.asyncio
+async def test_run_all_process_pool_keeps_order_and_errors():
+    frames = {
+        pair: pd.DataFrame({"close": [1.0, 2.0, float(i + 3)]})
+        for i, pair in enumerate(["AAABTC", "BBBBTC"])
+    }
+    strategies = [
+        DummyStrategy(frames["AAABTC"], "AAABTC"),
+        DummyStrategy(frames["BBBBTC"], "BBBBTC"),
+        DummyStrategy(frames["AAABTC"], "AAABTC", fail=True),
+        DummyStrategy(frames["BBBBTC"], "BBBBTC"),
+    ]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        backtester = Backtester(strategies, executor=executor)
+        with patch.object(
+            backtester, "_save_equity_curve", new_callable=AsyncMock
+        ) as mock_save:
+            results = await backtester.run_all()
+
+    assert results["strategy_name"].tolist() == ["DummyStrategy"] * 4
+    assert results["pair"].iloc[[0, 1, 3]].tolist() == ["AAABTC", "BBBBTC", "BBBBTC"]
+    assert results["total_return"].iloc[[0, 1, 3]].tolist() == [3.0, 4.0, 4.0]
+    assert results["error"].iloc[2] == "boom"
+    assert mock_save.call_count == 3
+    equity = mock_save.call_args_list[0].args[0]
+    assert equity.tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_run_all_simulates_each_strategy_once():
+    index = pd.date_range("2025-02-01", periods=300, freq="min")
+    close = 100 + np.sin(np.linspace(0, 20, len(index))) * 5
+    data = pd.DataFrame(
+        {"close": close, "open": close, "high": close + 1, "low": close - 1},
+        index=index,
+    )
+    strategies = [
+        SMACrossover(data, pair="TESTBTC"),
+        RSIWithBB(data, pair="TESTBTC"),
+        MACrossover(data, pair="TESTBTC"),
+    ]
+    backtester = Backtester(strategies, chart_format="none")
+
+    with patch.object(
+        vbt.Portfolio, "from_signals", wraps=vbt.Portfolio.from_signals
+    ) as mock_from_signals, patch(
+        "strategies.rsi_bb.simulate_sl_tp", wraps=simulate_sl_tp
+    ) as mock_simulator, patch.object(
+        backtester, "_create_report"
+    ):
+        results = await backtester.run_all()
+
+    assert len(results) == 3
+    assert "error" not in results.columns
+    assert mock_from_signals.call_count == 2
+    assert mock_simulator.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_run_batched_matches_per_pair_metrics():
+    index = pd.date_range("2025-02-01", periods=300, freq="min")
+    frames = []
+    for i, pair in enumerate(["AAABTC", "BBBBTC"]):
+        close = 100 + np.sin(np.linspace(0, 20 + i * 7, len(index))) * 5
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": index,
+                    "close": close,
+                    "high": close + 1,
+                    "low": close - 1,
+                    "pair": pair,
+                }
+            )
+        )
+    all_data = pd.concat(frames)
+    strategy_classes = [SMACrossover, RSIWithBB, MACrossover]
+    backtester = Backtester([])
+
+    with patch.object(
+        backtester, "_save_equity_curve", new_callable=AsyncMock
+    ), patch.object(backtester, "_create_report"):
+        batched = await backtester.run_batched(
+            DataLoader.to_panel(all_data), strategy_classes
+        )
+
+    assert batched["pair"].tolist() == ["AAABTC"] * 3 + ["BBBBTC"] * 3
+    assert (
+        batched["strategy_name"].tolist() == [c.__name__ for c in strategy_classes] * 2
+    )
+    for row in batched.itertuples():
+        data = all_data[all_data["pair"] == row.pair].set_index("timestamp")
+        strategy_cls = next(
+            c for c in strategy_classes if c.__name__ == row.strategy_name
+        )
+        expected = strategy_cls(data, pair=row.pair).get_metrics()
+        assert row.total_return == pytest.approx(expected["total_return"])
+        assert row.trades == expected["trades"]
+
+
+def test_create_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backtester = Backtester([])
     test_data = pd.DataFrame(
         {
             "pair": ["TESTBTC", "TESTBTC"],
@@ -57,10 +187,10 @@ def test_create_heatmap(backtester):
         }
     )
 
-    with patch("matplotlib.pyplot.show"):
-        backtester._create_heatmap(test_data)
+    backtester._create_report(test_data)
 
-    # Якщо не виникло виключень - тест пройдений
+    report = (tmp_path / "results" / "report.html").read_text(encoding="utf-8")
+    assert "Strategy1" in report and "TESTBTC" in report
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from core.backtester import Backtester
+from core.charts import decimate
+from strategies.sma_cross import SMACrossover
+
+
+def make_data(periods=3000):
+    rng = np.random.default_rng(3)
+    close = 1 + rng.normal(0, 0.01, periods).cumsum()
+    return pd.DataFrame(
+        {"close": close, "high": close * 1.01, "low": close * 0.99},
+        index=pd.date_range("2025-02-01", periods=periods, freq="min"),
+    )
+
+
+def test_decimate_keeps_extremes_and_endpoints():
+    equity = make_data(40320)["close"]
+    equity.iloc[:100] = np.nan
+
+    thinned = decimate(equity, max_points=1000)
+
+    assert len(thinned) <= 1002
+    assert thinned.index.is_monotonic_increasing
+    assert thinned.max() == equity.max() and thinned.min() == equity.min()
+    assert thinned.index[0] == equity.index[100]
+    assert thinned.index[-1] == equity.index[-1]
+    short = equity.iloc[-50:]
+    pd.testing.assert_series_equal(decimate(short), short)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chart_format", ["html", "dashboard"])
+async def test_metrics_returned_before_charts(tmp_path, monkeypatch, chart_format):
+    monkeypatch.chdir(tmp_path)
+    data = make_data()
+    strategies = [SMACrossover(data, pair) for pair in ["AAABTC", "BBBBTC"]]
+    backtester = Backtester(strategies, chart_format=chart_format, chart_workers=0)
+
+    with patch.object(backtester, "_create_report"):
+        metrics = await backtester.run_all(wait_charts=False)
+    assert len(metrics) == 2
+    assert not list(tmp_path.glob("results/*.html"))
+
+    await backtester.charts_done()
+    written = sorted(path.name for path in tmp_path.glob("results/*.html"))
+    if chart_format == "dashboard":
+        assert written == ["dashboard.html"]
+    else:
+        assert written == [
+            "equity_SMACrossover_AAABTC.html",
+            "equity_SMACrossover_BBBBTC.html",
+        ]
+
+
+def test_unknown_chart_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        Backtester([], chart_format="svg")
@@ -0,0 +1,198 @@
+import asyncio
+import io
+import zipfile
+import pytest
+import numpy as np
+import pandas as pd
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from core.data_loader import DataLoader
+from core.downloader import DownloadScheduler
+from core.manifest import FAILED, MISSING, OK
+
+
+def make_kline_zip(pair: str, date: str, periods: int = 1440) -> bytes:
+    """Zip-архів у форматі Binance: CSV з 12 колонками без заголовка"""
+    timestamps = pd.date_range(date, periods=periods, freq="min")
+    open_time = timestamps.values.astype("datetime64[us]").astype("int64")
+    close = np.linspace(0.001, 0.002, periods)
+    rows = pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": np.arange(periods, dtype=float),
+            "close_time": open_time + 59_999_999,
+            "quote_volume": 0.0,
+            "trades": 1,
+            "taker_base": 0.0,
+            "taker_quote": 0.0,
+            "ignore": 0,
+        }
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(f"{pair}-1m-{date}.csv", rows.to_csv(header=False, index=False))
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_zip_to_parquet_matches_legacy_extract(tmp_path):
+    content = make_kline_zip("AAABTC", "2025-02-01")
+    loader = DataLoader(str(tmp_path))
+    (tmp_path / "AAABTC_2025-02-01.zip").write_bytes(content)
+    legacy = pd.read_parquet(await loader.extract_and_save("AAABTC", "2025-02-01"))
+
+    stream_path = tmp_path / "stream.parquet"
+    DataLoader.zip_to_parquet(content, str(stream_path))
+    stream = pd.read_parquet(stream_path)
+
+    assert list(stream.columns) == list(legacy.columns)
+    pd.testing.assert_frame_equal(stream, legacy, check_dtype=False)
+    assert stream["timestamp"].iloc[0] == pd.Timestamp("2025-02-01")
+
+
+@pytest.mark.asyncio
+async def test_sync_retries_and_bounds_concurrency(tmp_path):
+    state = {"active": 0, "peak": 0, "hits": {}}
+
+    async def handler(request):
+        name = request.match_info["name"]
+        hits = state["hits"][name] = state["hits"].get(name, 0) + 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(0.01)
+            pair, _, date = name[: -len(".zip")].split("-", 2)
+            if pair == "MISSBTC":
+                return web.Response(status=404)
+            if pair == "SLOWBTC" and hits == 1:
+                return web.Response(status=429, headers={"Retry-After": "0"})
+            if pair == "FLAKYBTC" and hits == 1:
+                return web.Response(status=500)
+            return web.Response(body=make_kline_zip(pair, date, periods=10))
+        finally:
+            state["active"] -= 1
+
+    app = web.Application()
+    app.router.add_get("/{pair}/1m/{name}", handler)
+    async with TestServer(app) as server:
+        scheduler = DownloadScheduler(concurrency=2, backoff=0, on_progress=None)
+        loader = DataLoader(
+            str(tmp_path), base_url=str(server.make_url("")), scheduler=scheduler
+        )
+        pairs = ["AAABTC", "SLOWBTC", "FLAKYBTC", "MISSBTC"]
+        entries = await loader.sync(pairs, "2025-02-01", "2025-02-03")
+
+    status = entries.set_index("pair")["status"]
+    assert (status.drop("MISSBTC") == OK).all() and len(status) == 8
+    assert (status["MISSBTC"] == MISSING).all()
+    assert state["peak"] <= 2
+    assert scheduler.stats.retries == 4
+    assert scheduler.stats.failed == 0
+    assert scheduler.stats.done == 8
+    df = pd.read_parquet(tmp_path / "SLOWBTC_2025-02-02.parquet")
+    assert len(df) == 10
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_only_missing_or_changed_days(tmp_path):
+    requests = []
+
+    async def handler(request):
+        name = request.match_info["name"]
+        requests.append(name)
+        pair, _, date = name[: -len(".zip")].split("-", 2)
+        if pair == "NEWBTC" and date < "2025-03-01":
+            return web.Response(status=404)
+        etag = f'"{pair}-{date}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        body = make_kline_zip(pair, date, periods=10)
+        return web.Response(body=body, headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/{pair}/1m/{name}", handler)
+    async with TestServer(app) as server:
+        loader = DataLoader(
+            str(tmp_path),
+            base_url=str(server.make_url("")),
+            scheduler=DownloadScheduler(backoff=0, on_progress=None),
+        )
+        pairs = ["AAABTC", "NEWBTC"]
+
+        # 27-28 лютого та 1 березня: довжина місяця з календаря
+        entries = await loader.sync(pairs, "2025-02-27", "2025-03-02")
+        assert len(requests) == 6
+        assert entries["status"].tolist() == [OK, OK, OK, MISSING, MISSING, OK]
+        assert entries["etag"].iloc[0] == '"AAABTC-2025-02-27"'
+        assert loader.store.has("AAABTC", "2025-02")
+        assert loader.store.has("NEWBTC", "2025-03")
+        assert len(loader.store.read(pairs=["AAABTC"])) == 30
+
+        # Повторна синхронізація не звертається ні до мережі, ні до файлів
+        requests.clear()
+        await loader.sync(pairs, "2025-02-27", "2025-03-02")
+        assert requests == []
+
+        # Пошкоджений файл виявляється перевіркою і довантажується
+        (tmp_path / "AAABTC_2025-02-28.parquet").write_bytes(b"corrupt")
+        assert loader.manifest.verify(str(tmp_path)) == [("AAABTC", "2025-02-28")]
+        assert (
+            loader.manifest.get(["AAABTC"], "2025-02-28", "2025-02-28")[
+                ("AAABTC", "2025-02-28")
+            ]["status"]
+            == FAILED
+        )
+        await loader.sync(pairs, "2025-02-27", "2025-03-02")
+        assert requests == ["AAABTC-1m-2025-02-28.zip"]
+
+        # Перевірка за ETag: незмінені дні не перезавантажуються
+        requests.clear()
+        entries = await loader.sync(pairs, "2025-02-27", "2025-03-02", revalidate=True)
+        assert len(requests) == 4
+        assert (entries["status"] == OK).sum() == 4
+
+
+@pytest.mark.asyncio
+async def test_sync_does_not_record_unpublished_days_as_missing(tmp_path):
+    today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+    recent = today - pd.Timedelta(days=1)
+    published = {(today - pd.Timedelta(days=5)).strftime("%Y-%m-%d")}
+    requests = []
+
+    async def handler(request):
+        name = request.match_info["name"]
+        requests.append(name)
+        date = name[: -len(".zip")].split("-", 2)[2]
+        if date in published:
+            return web.Response(body=make_kline_zip("AAABTC", date, periods=10))
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get("/{pair}/1m/{name}", handler)
+    async with TestServer(app) as server:
+        loader = DataLoader(
+            str(tmp_path),
+            base_url=str(server.make_url("")),
+            scheduler=DownloadScheduler(backoff=0, on_progress=None),
+        )
+        # 404 старіше за затримку публікації - MISSING, за останні дні - без запису
+        start = (today - pd.Timedelta(days=6)).strftime("%Y-%m-%d")
+        end = (today + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        entries = await loader.sync(["AAABTC"], start, end)
+        assert len(requests) == 7
+        assert entries["status"].tolist() == [MISSING, OK, MISSING, MISSING]
+
+        # День опубліковано: звичайна синхронізація запитує лише незаписані дні
+        published.add(recent.strftime("%Y-%m-%d"))
+        requests.clear()
+        entries = await loader.sync(["AAABTC"], start, end)
+        assert sorted(requests) == [
+            f"AAABTC-1m-{today - pd.Timedelta(days=days):%Y-%m-%d}.zip"
+            for days in (2, 1, 0)
+        ]
+        status = entries.set_index("date")["status"]
+        assert status[recent.strftime("%Y-%m-%d")] == OK
@@ -0,0 +1,145 @@
+import pickle
+import pytest
+from unittest.mock import AsyncMock, patch
+import numpy as np
+import pandas as pd
+from core.data_loader import DataLoader
+from core.handles import DataHandle
+from core.store import MonthStore
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+
+@pytest.fixture
+def store(tmp_path):
+    index = pd.date_range(
+        "2025-01-31 22:00", "2025-02-02", freq="min", inclusive="left"
+    )
+    frames = []
+    for i, pair in enumerate(["AAABTC", "BBBBTC"]):
+        close = 100 + np.sin(np.linspace(0, 40 + i * 7, len(index))) * 5
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": index,
+                    "open": close,
+                    "high": close + 1,
+                    "low": close - 1,
+                    "close": close,
+                    "volume": 1.0,
+                    "pair": pair,
+                }
+            )
+        )
+    store = MonthStore(str(tmp_path / "store"))
+    store.write(pd.concat(frames, ignore_index=True))
+    return store
+
+
+def test_handle_reads_required_columns_and_lookback_lazily(store):
+    handle = DataHandle(store, "AAABTC", "2025-02-01", "2025-02-02")
+    strategies = [
+        SMACrossover.from_handle(handle, fast_window=5, slow_window=30),
+        RSIWithBB.from_handle(handle),
+    ]
+    assert not handle.loaded
+    assert handle.columns == ["close", "open", "high", "low"]
+    assert handle.lookback == 64
+
+    payload = pickle.dumps(strategies)
+    data = strategies[0].data
+    assert list(data.columns) == ["open", "high", "low", "close"]
+    assert data.index[0] == pd.Timestamp("2025-02-01") - pd.Timedelta(minutes=64)
+    assert data.index[-1] == pd.Timestamp("2025-02-01 23:59")
+    assert strategies[1].data is data
+
+    # Воркер отримує лише параметри читання, без даних
+    restored = pickle.loads(payload)
+    assert not restored[0]._handle.loaded
+    assert restored[0]._handle is restored[1]._handle
+
+    # Прогрів не симулюється: портфель починається з start
+    metrics = strategies[0].get_metrics()
+    assert strategies[0].result.portfolio.wrapper.index[0] == handle.start
+    assert metrics["trades"] > 0
+
+    for strategy in strategies:
+        strategy.release()
+    assert not handle.loaded
+    assert strategies[0]._result is None
+
+
+def test_handle_metrics_match_eager_load_with_prior_month_stored(tmp_path):
+    index = pd.date_range(
+        "2025-01-31 22:00", "2025-02-02", freq="min", inclusive="left"
+    )
+    # Коливання, а з 23:40 - зростання до 01:00: перетин SMA(5, 30) припадає
+    # на прогрів з січневого розділу, а не на перші свічки лютого
+    t = np.arange(len(index), dtype=float)
+    wave = 5 * np.sin(2 * np.pi * t / 40)
+    close = 100 + np.where(t < 100, wave, wave[100] + 0.2 * (np.minimum(t, 180) - 100))
+    close[t >= 180] += wave[t >= 180] - wave[180]
+    store = MonthStore(str(tmp_path / "store"))
+    store.write(
+        pd.DataFrame(
+            {
+                "timestamp": index,
+                "open": close,
+                "high": close + 1,
+                "low": close - 1,
+                "close": close,
+                "volume": 1.0,
+                "pair": "AAABTC",
+            }
+        )
+    )
+    assert any("month=2025-01" in path for path in store.files("AAABTC"))
+
+    eager = store.read(
+        pairs=["AAABTC"],
+        start=pd.Timestamp("2025-02-01"),
+        end=pd.Timestamp("2025-02-02"),
+    ).set_index("timestamp")[["high", "low", "close"]]
+    expected = SMACrossover(eager, "AAABTC", 5, 30).get_metrics()
+
+    # У групі з RSIWithBB прогрів довший (64 свічки), але метрики ті самі
+    for grouped in (False, True):
+        handle = DataHandle(store, "AAABTC", "2025-02-01", "2025-02-02")
+        if grouped:
+            RSIWithBB.from_handle(handle)
+        strategy = SMACrossover.from_handle(handle, fast_window=5, slow_window=30)
+        metrics = strategy.get_metrics()
+        assert metrics["trades"] == expected["trades"]
+        assert metrics["total_return"] == pytest.approx(expected["total_return"])
+
+
+def test_handle_resamples_and_fingerprints_without_reading(store):
+    handle = DataHandle(store, "BBBBTC", "2025-02-01", "2025-02-02", timeframe="1h")
+    handle.require(["close"], lookback=2)
+    key = handle.fingerprint()
+    assert not handle.loaded
+
+    data = handle.load()
+    assert data.index[0] == pd.Timestamp("2025-01-31 22:00")
+    assert len(data) == 26
+    assert data["close"].dtype == np.float64
+
+    handle.require(["close"], lookback=3)
+    assert not handle.loaded
+    assert handle.fingerprint() != key
+
+
+@pytest.mark.asyncio
+async def test_load_handles_skips_pairs_without_data(store, tmp_path):
+    loader = DataLoader(data_dir=str(tmp_path))
+    loader.store = store
+    with patch.object(
+        loader, "get_top_pairs", AsyncMock(return_value=["AAABTC", "CCCBTC", "BBBBTC"])
+    ), patch.object(loader, "sync", AsyncMock()) as mock_sync:
+        handles = await loader.load_handles(2025, 2, 3, compact=True)
+
+    assert [handle.pair for handle in handles] == ["AAABTC", "BBBBTC"]
+    assert handles[0].end == pd.Timestamp("2025-03-01")
+    assert not any(handle.loaded for handle in handles)
+    mock_sync.assert_awaited_once()
+    assert handles[0].require(["close"]).load()["close"].dtype == np.float32
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from core import indicators
+from core.indicators import IndicatorCache, fingerprint
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+
+def make_prices(seed=0, periods=500):
+    rng = np.random.default_rng(seed)
+    close = 1 + rng.normal(0, 0.01, periods).cumsum()
+    return pd.DataFrame(
+        {"close": close, "high": close * 1.01, "low": close * 0.99},
+        index=pd.date_range("2025-02-01", periods=periods, freq="min"),
+    )
+
+
+def test_fingerprint_tracks_content():
+    prices = make_prices()
+    close = prices["close"]
+
+    assert fingerprint(close) == fingerprint(close.copy())
+    assert fingerprint(close) != fingerprint(close * 2)
+    assert fingerprint(close) != fingerprint(close.rename("open"))
+
+
+def test_cache_shared_between_strategies_and_matches_vbt():
+    prices = make_prices()
+    cache = IndicatorCache()
+    SMACrossover.indicators = MACrossover.indicators = cache
+    try:
+        SMACrossover(prices, "AAABTC", 25, 100).generate_signals()
+        assert cache.misses == 2
+        # Ті самі вікна в іншій стратегії - без перерахунку
+        MACrossover(prices, "AAABTC", 25, 100).generate_signals()
+        assert cache.misses == 2
+        assert cache.hits == 2
+    finally:
+        del SMACrossover.indicators, MACrossover.indicators
+
+    expected = vbt.MA.run(prices["close"], 25, hide_params=["window"]).ma
+    pd.testing.assert_series_equal(
+        indicators.ma(prices["close"], 25, cache, "AAABTC"), expected
+    )
+
+
+def test_lru_evicts_by_bytes():
+    close = make_prices()["close"]
+    size = close.to_numpy().nbytes + close.index.nbytes
+    cache = IndicatorCache(max_bytes=2 * size)
+
+    for window in (5, 10, 20):
+        indicators.ma(close, window, cache)
+    assert len(cache) == 2
+    assert cache.nbytes <= cache.max_bytes
+
+    indicators.ma(close, 5, cache)
+    assert cache.misses == 4
+
+
+def test_disk_tier_survives_new_cache(tmp_path):
+    prices = make_prices()
+    first = IndicatorCache(disk_dir=str(tmp_path))
+    RSIWithBB.indicators = first
+    try:
+        expected = RSIWithBB(prices, "AAABTC").generate_signals()
+        second = IndicatorCache(disk_dir=str(tmp_path))
+        RSIWithBB.indicators = second
+        cached = RSIWithBB(prices.copy(), "AAABTC").generate_signals()
+    finally:
+        del RSIWithBB.indicators
+
+    assert second.misses == 0
+    assert second.disk_hits == first.misses + 1  # дві смуги за один розрахунок
+    for actual, signal in zip(cached, expected):
+        pd.testing.assert_series_equal(actual, signal)
@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import pandas as pd
+from core.kernels import crossover_signals, rsi_bb_signals
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+
+@pytest.fixture
+def panel():
+    """Панель з пропусками: пізній лістинг, розрив посередині, делістинг"""
+    rng = np.random.default_rng(7)
+    n, pairs = 3000, ["AAABTC", "BBBBTC", "CCCBTC", "DDDBTC", "EEEBTC"]
+    close = pd.DataFrame(
+        1 + rng.normal(0, 0.003, (n, len(pairs))).cumsum(axis=0),
+        index=pd.date_range("2025-02-01", periods=n, freq="min"),
+        columns=pd.Index(pairs, name="pair"),
+    )
+    close.iloc[:500, 1] = np.nan
+    close.iloc[1200:1290, 2] = np.nan
+    close.iloc[2500:, 3] = np.nan
+    close.iloc[100:300, 4] = close.iloc[100, 4]  # пара без торгів
+    spread = np.abs(rng.normal(0, 0.002, close.shape))
+    return pd.concat(
+        {"close": close, "high": close * (1 + spread), "low": close * (1 - spread)},
+        axis=1,
+    )
+
+
+def vbt_signals(strategy_cls, data, **params):
+    strategy = strategy_cls(data, **params)
+    strategy.indicators = None
+    return strategy.generate_signals()
+
+
+@pytest.mark.parametrize("fast, slow", [(15, 40), (25, 100), (3, 4)])
+def test_crossover_kernel_matches_vbt(panel, fast, slow):
+    expected = vbt_signals(SMACrossover, panel, fast_window=fast, slow_window=slow)
+    actual = crossover_signals(panel["close"], fast, slow)
+
+    for left, right in zip(actual, expected):
+        pd.testing.assert_frame_equal(left, right)
+
+
+@pytest.mark.parametrize("rsi_window, bb_window", [(14, 20), (7, 50)])
+def test_rsi_bb_kernel_matches_vbt(panel, rsi_window, bb_window):
+    expected = vbt_signals(RSIWithBB, panel, rsi_window=rsi_window, bb_window=bb_window)
+    actual = rsi_bb_signals(
+        panel["close"], panel["high"], panel["low"], rsi_window, bb_window
+    )
+
+    assert any(signal.to_numpy().any() for signal in actual)
+    for left, right in zip(actual, expected):
+        pd.testing.assert_frame_equal(left, right)
+
+
+def test_kernel_accepts_single_pair(panel):
+    data = panel.xs("CCCBTC", axis=1, level="pair")
+    expected = vbt_signals(RSIWithBB, data, pair="CCCBTC")
+    actual = rsi_bb_signals(data["close"], data["high"], data["low"], 14, 20)
+
+    for left, right in zip(actual, expected):
+        pd.testing.assert_series_equal(left, right)
+
+
+@pytest.mark.parametrize("strategy_cls", [SMACrossover, MACrossover, RSIWithBB])
+def test_fused_strategy_metrics_unchanged(panel, strategy_cls):
+    data = panel.xs("BBBBTC", axis=1, level="pair")
+    reference = strategy_cls(data, "BBBBTC").get_metrics()
+
+    fused = strategy_cls(data, "BBBBTC")
+    fused.fused_signals = True
+    assert fused.get_metrics() == reference
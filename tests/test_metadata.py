@@ -0,0 +1,70 @@
+import json
+import time
+import pytest
+import aiohttp
+from unittest.mock import AsyncMock, patch
+from core.data_loader import DataLoader
+from core.metadata import ExchangeMetadata, top_by_volume, volume_index
+
+TICKERS = [
+    {"symbol": "AAABTC", "quoteVolume": "10.5"},
+    {"symbol": "BBBUSDT", "quoteVolume": "1000"},
+    {"symbol": "CCCBTC", "quoteVolume": "30"},
+    {"symbol": "DDDBTC", "quoteVolume": "10.5"},
+    {"symbol": "EEEBTC", "quoteVolume": "0"},
+]
+
+
+def legacy_top_pairs(data, top_n):
+    btc_pairs = [t["symbol"] for t in data if t["symbol"].endswith("BTC")]
+    return sorted(
+        btc_pairs,
+        key=lambda x: float(next(t["quoteVolume"] for t in data if t["symbol"] == x)),
+        reverse=True,
+    )[:top_n]
+
+
+def test_top_by_volume_matches_full_sort():
+    volumes = volume_index(TICKERS)
+
+    assert "BBBUSDT" not in volumes
+    for top_n in range(1, 6):
+        assert top_by_volume(volumes, top_n) == legacy_top_pairs(TICKERS, top_n)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reused_within_ttl_and_when_offline(tmp_path):
+    metadata = ExchangeMetadata(str(tmp_path), ttl=60)
+    with patch.object(
+        metadata, "_fetch_tickers", AsyncMock(return_value=TICKERS)
+    ) as fetch:
+        assert await metadata.top_pairs(2) == ["CCCBTC", "AAABTC"]
+        assert await metadata.top_pairs(2) == ["CCCBTC", "AAABTC"]
+    fetch.assert_awaited_once()
+
+    # Прострочений знімок використовується, якщо API недоступне
+    snapshot = json.loads((tmp_path / "ticker_24hr.json").read_text())
+    snapshot["fetched_at"] = time.time() - 120
+    (tmp_path / "ticker_24hr.json").write_text(json.dumps(snapshot))
+    with patch.object(
+        metadata, "_fetch_tickers", AsyncMock(side_effect=aiohttp.ClientError())
+    ) as fetch:
+        assert await metadata.top_pairs(1) == ["CCCBTC"]
+    fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_pinned_universe_skips_api(tmp_path):
+    loader = DataLoader(str(tmp_path))
+    with patch.object(
+        loader.metadata, "_fetch_tickers", AsyncMock(return_value=TICKERS)
+    ) as fetch:
+        assert await loader.get_top_pairs(3, universe="test") == [
+            "CCCBTC",
+            "AAABTC",
+            "DDDBTC",
+        ]
+        fetch.reset_mock()
+        loader.metadata.ttl = 0
+        assert await loader.get_top_pairs(2, universe="test") == ["CCCBTC", "AAABTC"]
+    fetch.assert_not_awaited()
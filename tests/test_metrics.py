@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from unittest.mock import AsyncMock, patch
+from core.backtester import Backtester
+from core.data_loader import DataLoader
+from core.metrics import (
+    DEFAULT_METRICS,
+    EXTRA_METRICS,
+    compute_metrics,
+    relative_tick,
+)
+from strategies.sma_cross import SMACrossover
+
+STATS_FIELDS = {
+    "total_return": "Total Return [%]",
+    "sharpe_ratio": "Sharpe Ratio",
+    "max_drawdown": "Max Drawdown [%]",
+    "win_rate": "Win Rate [%]",
+    "trades": "Total Trades",
+    "sortino_ratio": "Sortino Ratio",
+    "calmar_ratio": "Calmar Ratio",
+}
+
+
+@pytest.fixture
+def portfolio():
+    """Колонки з пізнім лістингом, без угод і з відкритою позицією в кінці"""
+    rng = np.random.default_rng(5)
+    n, pairs = 2000, ["AAABTC", "BBBBTC", "CCCBTC", "DDDBTC"]
+    close = pd.DataFrame(
+        1 + rng.normal(0, 0.004, (n, len(pairs))).cumsum(axis=0),
+        index=pd.date_range("2025-02-01", periods=n, freq="min"),
+        columns=pd.Index(pairs, name="pair"),
+    )
+    close.iloc[:300, 1] = np.nan
+    entries = pd.DataFrame(rng.random(close.shape) < 0.01, close.index, close.columns)
+    exits = pd.DataFrame(rng.random(close.shape) < 0.01, close.index, close.columns)
+    entries["CCCBTC"] = exits["CCCBTC"] = False
+    exits.iloc[-500:, 3] = False
+    return vbt.Portfolio.from_signals(
+        close, entries, exits, **SMACrossover.portfolio_kwargs
+    )
+
+
+def test_matches_pf_stats(portfolio):
+    metrics = compute_metrics(portfolio, DEFAULT_METRICS + EXTRA_METRICS)
+    stats = portfolio.stats(agg_func=None)
+
+    assert metrics.index.equals(stats.index)
+    for name, field in STATS_FIELDS.items():
+        np.testing.assert_array_equal(
+            metrics[name].to_numpy(float), stats[field].to_numpy(float), err_msg=name
+        )
+    assert metrics.loc["CCCBTC", "exposure"] == 0
+    assert 0 < metrics.loc["DDDBTC", "exposure"] < 100
+
+
+def test_unknown_metric(portfolio):
+    with pytest.raises(ValueError):
+        compute_metrics(portfolio, ["omega_ratio"])
+
+
+@pytest.mark.asyncio
+async def test_backtester_extra_metrics(portfolio):
+    close = portfolio.close
+    long = close.rename_axis("timestamp").stack().rename("close").reset_index()
+    long["high"] = long["low"] = long["close"]
+    backtester = Backtester([], extra_metrics=("sortino_ratio", "exposure"))
+
+    with patch.object(
+        backtester, "_save_equity_curve", new_callable=AsyncMock
+    ), patch.object(backtester, "_create_report"):
+        results = await backtester.run_batched(
+            DataLoader.to_panel(long), [SMACrossover]
+        )
+
+    assert {"sortino_ratio", "exposure"} <= set(results.columns)
+    assert results["pair"].tolist() == list(close.columns)
+
+
+def test_relative_tick():
+    close = pd.DataFrame(
+        {
+            "coarse": [1.0, 1.1, 1.0, 1.2],
+            "fine": [100.0, 100.01, 100.02, np.nan],
+            "flat": 5.0,
+            "empty": np.nan,
+        }
+    )
+    tick = relative_tick(close)
+    np.testing.assert_allclose(tick[:2], [0.1 / 1.1, 0.01 / 100.01])
+    assert np.isnan(tick[2:]).all()
@@ -0,0 +1,60 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from core.mmap_cache import OHLCVCache
+from strategies.sma_cross import SMACrossover
+
+
+@pytest.fixture
+def all_data():
+    index = pd.date_range("2025-02-01", periods=300, freq="min")
+    frames = []
+    for i, pair in enumerate(["BBBBTC", "AAABTC"]):
+        close = 100 + np.sin(np.linspace(0, 20 + i * 5, len(index))) * 5
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": index,
+                    "open": close,
+                    "high": close + 1,
+                    "low": close - 1,
+                    "close": close,
+                    "volume": 1.0,
+                    "pair": pair,
+                }
+            )
+        )
+    return pd.concat(frames).sort_values("timestamp")
+
+
+def test_view_is_read_only_memory_map(tmp_path, all_data):
+    cache = OHLCVCache.build(all_data, str(tmp_path))
+    view = cache.view("AAABTC")
+
+    assert cache.pairs == ["AAABTC", "BBBBTC"]
+    assert len(view) == 300
+    assert view.index.is_monotonic_increasing
+    close = view["close"].to_numpy()
+    assert np.shares_memory(close, cache.arrays["close"])
+    assert not close.flags.writeable
+    expected = all_data[all_data["pair"] == "AAABTC"]["close"].to_numpy()
+    np.testing.assert_array_equal(close, expected)
+
+
+def test_strategy_from_cache_pickles_without_data(tmp_path, all_data):
+    cache = OHLCVCache.build(all_data, str(tmp_path))
+    strategy = SMACrossover.from_cache(cache, "BBBBTC", fast_window=10, slow_window=20)
+
+    payload = pickle.dumps(strategy)
+    restored = pickle.loads(payload)
+
+    assert len(payload) < all_data.memory_usage().sum() / 10
+    assert np.shares_memory(
+        restored.data["close"].to_numpy(), restored._cache.arrays["close"]
+    )
+    data = all_data[all_data["pair"] == "BBBBTC"].set_index("timestamp")
+    expected = SMACrossover(data, "BBBBTC", 10, 20).get_metrics()
+    assert restored.get_metrics()["total_return"] == pytest.approx(
+        expected["total_return"]
+    )
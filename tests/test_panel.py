@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+from core.data_loader import DataLoader
+from core.panel import align_panel, fill_gaps
+
+
+def make_minutes():
+    """AAABTC з пропуском 00:03-00:05, BBBBTC з'являється з 00:04"""
+    frames = []
+    for pair, minutes in [("AAABTC", [0, 1, 2, 6, 7, 8, 9]), ("BBBBTC", [4, 5, 9])]:
+        timestamps = pd.Timestamp("2025-02-01") + pd.to_timedelta(minutes, "min")
+        close = np.arange(len(minutes), dtype=float) + 1
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": timestamps.astype("datetime64[us]"),
+                    "close": close,
+                    "high": close + 0.5,
+                    "low": close - 0.5,
+                    "volume": 10.0,
+                    "pair": pair,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_align_panel_matches_pivot_on_full_grid():
+    df = make_minutes()
+    # Порядок рядків довгої таблиці не впливає на результат
+    panel = align_panel(df.sample(frac=1, random_state=3))
+
+    assert len(panel) == 10
+    assert panel.index.freq == pd.Timedelta("1min")
+    expected = DataLoader.to_panel(df).reindex(panel.index)
+    np.testing.assert_array_equal(panel.to_numpy(), expected[panel.columns])
+    assert (
+        panel["close"]["AAABTC"].isna().tolist()
+        == [False] * 3 + [True] * 3 + [False] * 4
+    )
+
+    common = align_panel(df, mask="common")
+    assert common.index[0] == pd.Timestamp("2025-02-01 00:04")
+    assert common.index[-1] == pd.Timestamp("2025-02-01 00:09")
+
+    with pytest.raises(ValueError):
+        align_panel(df, timeframe="2min")
+
+
+def test_fill_gaps_inside_listing_only():
+    panel = align_panel(make_minutes(), fields=("close", "high", "low", "volume"))
+    filled = fill_gaps(panel)
+
+    aaa = filled.xs("AAABTC", axis=1, level="pair")
+    # Пропуск - пласкі свічки з попереднього close та нульовим обсягом
+    assert aaa.loc["2025-02-01 00:03":"2025-02-01 00:05", "close"].tolist() == [3] * 3
+    assert aaa.loc["2025-02-01 00:03":"2025-02-01 00:05", "high"].tolist() == [3] * 3
+    assert aaa.loc["2025-02-01 00:04", "volume"] == 0
+    # До лістингу BBBBTC даних немає
+    bbb = filled["close"]["BBBBTC"]
+    assert bbb.iloc[:4].isna().all()
+    assert bbb.iloc[4:].tolist() == [1, 2, 2, 2, 2, 3]
+
+    limited = fill_gaps(panel, limit=1)
+    assert limited["close"]["AAABTC"].iloc[3:6].isna().tolist() == [False, True, True]
+
+
+@pytest.mark.asyncio
+async def test_load_panel_aligns_and_fills(tmp_path):
+    loader = DataLoader(str(tmp_path))
+    with patch.object(
+        DataLoader, "load_month", AsyncMock(return_value=make_minutes())
+    ) as mock_load:
+        panel = await loader.load_panel(2025, 2, 2, timeframe="1min")
+        with pytest.raises(ValueError):
+            await loader.load_panel(2025, 2, 2, fill="bfill")
+
+    mock_load.assert_awaited_once_with(
+        2025, 2, 2, None, "1min", False, columns=("close", "high", "low")
+    )
+    assert list(panel.columns.get_level_values(0).unique()) == ["close", "high", "low"]
+    assert panel["close"].notna().sum().tolist() == [10, 6]
@@ -0,0 +1,90 @@
+import json
+import pstats
+import pytest
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import AsyncMock, patch
+from core.backtester import Backtester
+from core.profiling import Profiler, profile_to, profiler
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+
+@pytest.fixture
+def enabled_profiler():
+    profiler.reset()
+    profiler.enabled = True
+    yield profiler
+    profiler.enabled = False
+    profiler.reset()
+
+
+def make_strategies():
+    rng = np.random.default_rng(1)
+    strategies = []
+    for pair in ["AAABTC", "BBBBTC"]:
+        close = 1 + rng.normal(0, 0.01, 300).cumsum()
+        data = pd.DataFrame(
+            {"close": close, "high": close * 1.01, "low": close * 0.99},
+            index=pd.date_range("2025-02-01", periods=300, freq="min"),
+        )
+        strategies += [SMACrossover(data, pair), RSIWithBB(data, pair)]
+    return strategies
+
+
+def test_disabled_profiler_records_nothing():
+    local = Profiler()
+    with local.stage("download"):
+        pass
+    local.count("rows", 10)
+    assert local.report().empty
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parallel", [False, True])
+async def test_run_all_breaks_down_by_strategy_and_pair(enabled_profiler, parallel):
+    strategies = make_strategies()
+    executor = ProcessPoolExecutor(max_workers=2) if parallel else None
+    try:
+        backtester = Backtester(strategies, executor=executor)
+        with patch.object(backtester, "_save_equity_curve", new_callable=AsyncMock):
+            await backtester.run_all()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report = enabled_profiler.report()
+    simulate = report[report["stage"] == "simulate"]
+    # Записи воркерів повертаються в основний процес
+    assert len(simulate) == 4
+    assert set(simulate["pair"]) == {"AAABTC", "BBBBTC"}
+    assert set(simulate["strategy"]) == {"SMACrossover", "RSIWithBB"}
+    assert set(report["stage"]) >= {"signals", "simulate", "metrics", "run_all"}
+    assert (report["total"] >= 0).all()
+
+
+def test_report_and_profile_dump(enabled_profiler, tmp_path):
+    with profile_to(str(tmp_path / "run.prof")):
+        SMACrossover(make_strategies()[0].data, "AAABTC").get_metrics()
+    enabled_profiler.count("rows", 300, pair="AAABTC")
+
+    enabled_profiler.save(str(tmp_path / "profile.json"))
+    enabled_profiler.save(str(tmp_path / "profile.csv"))
+
+    with open(tmp_path / "profile.json", encoding="utf-8") as f:
+        records = json.load(f)
+    counter = next(r for r in records if r["kind"] == "counter")
+    assert counter == {
+        "kind": "counter",
+        "stage": "rows",
+        "strategy": "",
+        "pair": "AAABTC",
+        "calls": 1,
+        "total": 300,
+        "mean": 300,
+        "max": 300,
+    }
+    frame = pd.read_csv(tmp_path / "profile.csv")
+    assert {"signals", "simulate", "metrics"} <= set(frame["stage"])
+    assert pstats.Stats(str(tmp_path / "run.prof")).total_calls > 0
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from core.report import heatmap_matrix, pivot_metric, top_rows, write_report
+
+
+def _results(n_pairs: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    names = ["SMACrossover", "RSIWithBB", "MACrossover"]
+    return pd.DataFrame(
+        {
+            "pair": np.repeat([f"P{i:05d}BTC" for i in range(n_pairs)], len(names)),
+            "strategy_name": names * n_pairs,
+            "total_return": rng.normal(0, 10, n_pairs * len(names)),
+            "max_drawdown": rng.uniform(0, 50, n_pairs * len(names)),
+            "trades": rng.integers(0, 100, n_pairs * len(names)),
+        }
+    )
+
+
+def test_pivot_matches_pivot_table():
+    df = _results(20)
+    df.loc[3, "total_return"] = np.nan
+    expected = df.pivot_table(
+        index="pair", columns="strategy_name", values="total_return", aggfunc="mean"
+    )
+    matrix = pivot_metric(df)
+    pd.testing.assert_frame_equal(
+        matrix, expected, check_names=False, check_index_type=False
+    )
+
+
+def test_heatmap_is_bounded_and_ranked():
+    df = _results(4000)
+    top = heatmap_matrix(df, top_n=10)
+    assert top.shape == (10, 3)
+    best = df.groupby("pair")["total_return"].max().nlargest(10)
+    assert top.index.tolist() == best.index.tolist()
+
+    # Без top_n усі пари стискаються у max_rows кошиків за рангом
+    buckets = heatmap_matrix(df, top_n=None, max_rows=40)
+    assert buckets.shape == (40, 3)
+    assert buckets.index[0].startswith("#1-100 (")
+
+    # Для max_drawdown найкращі - найменші значення
+    drawdown = heatmap_matrix(df, value="max_drawdown", top_n=5)
+    assert drawdown.min(axis=1).is_monotonic_increasing
+
+
+def test_write_report_size_does_not_grow_with_rows(tmp_path):
+    sizes = []
+    for n_pairs in (100, 3000):
+        path = write_report(_results(n_pairs), str(tmp_path / f"{n_pairs}.html"))
+        sizes.append(len(open(path, encoding="utf-8").read()))
+    assert abs(sizes[1] - sizes[0]) < 0.05 * sizes[0]
+
+    best, worst = top_rows(_results(100), n=5)
+    assert best["total_return"].is_monotonic_decreasing
+    assert worst["total_return"].is_monotonic_increasing
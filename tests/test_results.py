@@ -0,0 +1,121 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from core.backtester import Backtester
+from core.data_loader import DataLoader
+from core.results import ResultStore
+from core.simulator import simulate_sl_tp
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+
+def _frame(pair: str, i: int) -> pd.DataFrame:
+    index = pd.date_range("2025-02-01", periods=300, freq="min")
+    close = 100 + np.sin(np.linspace(0, 20 + i * 7, len(index))) * 5
+    return pd.DataFrame(
+        {
+            "timestamp": index,
+            "close": close,
+            "high": close + 1,
+            "low": close - 1,
+            "pair": pair,
+        }
+    )
+
+
+async def _run(backtester: Backtester, run, *args) -> tuple[pd.DataFrame, int]:
+    """Результат запуску та кількість виконаних симуляцій"""
+    with patch.object(
+        vbt.Portfolio, "from_signals", wraps=vbt.Portfolio.from_signals
+    ) as mock_from_signals, patch(
+        "strategies.rsi_bb.simulate_sl_tp", wraps=simulate_sl_tp
+    ) as mock_simulator, patch.object(
+        backtester, "_save_equity_curve", new_callable=AsyncMock
+    ), patch.object(
+        backtester, "_create_report"
+    ):
+        results = await run(*args)
+    return results, mock_from_signals.call_count + mock_simulator.call_count
+
+
+@pytest.mark.asyncio
+async def test_run_all_skips_stored_jobs(tmp_path):
+    store = ResultStore(str(tmp_path / "runs.sqlite"))
+    data = _frame("AAABTC", 0).set_index("timestamp")
+
+    def strategies(**params):
+        return [
+            SMACrossover(data, pair="AAABTC", **params),
+            RSIWithBB(data, pair="AAABTC"),
+        ]
+
+    backtester = Backtester(strategies(), result_store=store)
+    first, calls = await _run(backtester, backtester.run_all)
+    assert calls == 2
+
+    backtester.strategies = strategies()
+    second, calls = await _run(backtester, backtester.run_all)
+    assert calls == 0
+    pd.testing.assert_frame_equal(first, second)
+
+    # Змінений параметр - нова задача, решта з кешу
+    backtester.strategies = strategies(fast_window=5)
+    third, calls = await _run(backtester, backtester.run_all)
+    assert calls == 1
+    assert third["strategy_name"].tolist() == ["SMACrossover", "RSIWithBB"]
+    assert len(store.history(strategies=["SMACrossover"])) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_batched_runs_only_new_pairs(tmp_path):
+    store = ResultStore(str(tmp_path / "runs.sqlite"))
+    classes = [SMACrossover, MACrossover]
+    frames = [_frame(pair, i) for i, pair in enumerate(["AAABTC", "BBBBTC"])]
+    backtester = Backtester([], result_store=store)
+
+    await _run(
+        backtester, backtester.run_batched, DataLoader.to_panel(frames[0]), classes
+    )
+
+    # Друга пара: симулюється лише вона, перша береться зі сховища
+    panel = DataLoader.to_panel(pd.concat(frames))
+    simulated = []
+    run_backtest = SMACrossover.run_backtest
+
+    def spy(self):
+        simulated.append(self.data["close"].columns.tolist())
+        return run_backtest(self)
+
+    with patch.object(SMACrossover, "run_backtest", spy):
+        results, calls = await _run(backtester, backtester.run_batched, panel, classes)
+    assert calls == 2
+    assert simulated == [["BBBBTC"]]
+
+    reference = Backtester([])
+    expected, _ = await _run(reference, reference.run_batched, panel, classes)
+    pd.testing.assert_frame_equal(
+        results[expected.columns], expected, check_dtype=False
+    )
+
+    # Змінені дані пари інвалідують лише її результати
+    frames[1]["close"] *= 1.01
+    simulated.clear()
+    with patch.object(SMACrossover, "run_backtest", spy):
+        _, calls = await _run(
+            backtester,
+            backtester.run_batched,
+            DataLoader.to_panel(pd.concat(frames)),
+            classes,
+        )
+    assert calls == 2
+    assert simulated == [["BBBBTC"]]
+    _, calls = await _run(
+        backtester,
+        backtester.run_batched,
+        DataLoader.to_panel(pd.concat(frames)),
+        classes,
+    )
+    assert calls == 0
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from core.mmap_cache import OHLCVCache
+from core.schema import as_float64, compare_metrics, memory_report, to_compact
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+
+def make_minutes(periods=600):
+    rng = np.random.default_rng(5)
+    frames = []
+    for pair in ["AAABTC", "BBBBTC"]:
+        close = 1 + rng.normal(0, 0.01, periods).cumsum()
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": pd.date_range(
+                        "2025-02-01", periods=periods, freq="min"
+                    ),
+                    "open": close,
+                    "high": close * 1.01,
+                    "low": close * 0.99,
+                    "close": close,
+                    "volume": rng.random(periods),
+                    "pair": pair,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_compact_types_and_report():
+    df = make_minutes()
+    compact = to_compact(df, columns=["close", "high", "low"])
+
+    assert list(compact.columns) == ["timestamp", "high", "low", "close", "pair"]
+    assert (compact[["high", "low", "close"]].dtypes == np.float32).all()
+    assert isinstance(compact["pair"].dtype, pd.CategoricalDtype)
+
+    report = memory_report({"default": df, "compact": compact})
+    assert report.loc["close", "default"] == 8
+    assert report.loc["close", "compact"] == 4
+    assert report.loc["total", "compact"] < report.loc["total", "default"] / 2
+
+
+def test_strategies_compute_in_float64():
+    df = to_compact(make_minutes())
+    data = df[df["pair"] == "AAABTC"].set_index("timestamp").drop(columns="pair")
+    reference = as_float64(data)
+    assert (reference.dtypes == np.float64).all()
+    assert as_float64(reference) is reference
+
+    for strategy_cls in (SMACrossover, RSIWithBB):
+        strategy = strategy_cls(data, "AAABTC")
+        expected = strategy_cls(reference, "AAABTC").get_metrics()
+        assert strategy.get_metrics() == expected
+        # Розширення тимчасове: стратегія зберігає компактні дані
+        assert (strategy.data.dtypes == np.float32).all()
+
+
+def test_float32_mmap_cache_within_tolerance(tmp_path):
+    df = make_minutes()
+    rows = []
+    for dtype in ("float64", "float32"):
+        cache = OHLCVCache.build(df, str(tmp_path / dtype), dtype=dtype)
+        assert cache.view("AAABTC")["close"].dtype == dtype
+        for pair in cache.pairs:
+            metrics = SMACrossover.from_cache(cache, pair, fast_window=5).get_metrics()
+            rows.append({**metrics, "dtype": dtype})
+    results = pd.DataFrame(rows)
+    reference = results[results["dtype"] == "float64"]
+    compact = results[results["dtype"] == "float32"]
+
+    # float32 округлює ціни, тож метрики збігаються лише з допуском
+    keys = ["pair", "strategy"]
+    assert compare_metrics(reference, compact, keys, rtol=1e-3, atol=1e-3).empty
+    shifted = compact.assign(total_return=compact["total_return"] + 1)
+    assert len(compare_metrics(reference, shifted, keys)) == 2
@@ -0,0 +1,153 @@
+import glob
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from core.metrics import compute_metrics
+from core.simulator import simulate_sl_tp
+from strategies.rsi_bb import RSIWithBB
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+
+@pytest.fixture
+def panel():
+    """Панель з пропусками: пізній лістинг, розрив посередині, делістинг"""
+    rng = np.random.default_rng(11)
+    n, pairs = 3000, ["AAABTC", "BBBBTC", "CCCBTC", "DDDBTC"]
+    close = pd.DataFrame(
+        100 * np.exp(rng.normal(0, 0.003, (n, len(pairs))).cumsum(axis=0)),
+        index=pd.date_range("2025-02-01", periods=n, freq="min"),
+        columns=pd.Index(pairs, name="pair"),
+    )
+    close.iloc[:500, 1] = np.nan
+    close.iloc[1200:1290, 2] = np.nan
+    close.iloc[2500:, 3] = np.nan
+    spread = np.abs(rng.normal(0, 0.002, close.shape))
+    return pd.concat(
+        {"close": close, "high": close * (1 + spread), "low": close * (1 - spread)},
+        axis=1,
+    )
+
+
+def _fixture_data(pair: str) -> pd.DataFrame:
+    """Хвилинні свічки пари з денних parquet-фікстур ``data/`` (10-19 лютого)"""
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, f"{pair}_2025-02-1?.parquet")))
+    if not paths:
+        pytest.skip(f"немає фікстур {pair} у data/")
+    return pd.concat(map(pd.read_parquet, paths)).set_index("timestamp")
+
+
+def _random_signals(close: pd.DataFrame, seed: int = 0) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    return [
+        pd.DataFrame(rng.random(close.shape) < p, close.index, close.columns)
+        for p in (0.2, 0.3, 0.2, 0.3)
+    ]
+
+
+def assert_same_fills(actual: vbt.Portfolio, expected: vbt.Portfolio):
+    left, right = actual.order_records, expected.order_records
+    assert len(left) == len(right)
+    for field in right.dtype.names:
+        np.testing.assert_array_equal(left[field], right[field], err_msg=field)
+    pd.testing.assert_frame_equal(compute_metrics(actual), compute_metrics(expected))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(sl_stop=0.01, tp_stop=0.016, fees=0.0005, slippage=0.001),
+        dict(sl_stop=0.005, fees=0.001),
+        dict(tp_stop=0.003, slippage=0.002),
+        dict(fees=0.001, slippage=0.005),
+        dict(sl_stop=np.array([0.002, np.nan, 0.01, 0.004]), tp_stop=0.006),
+    ],
+)
+def test_simulator_matches_from_signals(panel, options):
+    close = panel["close"]
+    signals = _random_signals(close)
+    expected = vbt.Portfolio.from_signals(
+        close,
+        entries=signals[0],
+        exits=signals[1],
+        short_entries=signals[2],
+        short_exits=signals[3],
+        freq="1min",
+        **options,
+    )
+    actual = simulate_sl_tp(close, *signals, freq="1min", **options)
+
+    # Ордерів більше, ніж рядків: масив записів розширювався
+    assert len(expected.order_records) > len(close)
+    assert_same_fills(actual, expected)
+    pd.testing.assert_frame_equal(actual.value(), expected.value())
+
+
+def test_rsi_bb_keeps_long_and_short_signals_apart(panel):
+    data = panel.xs("AAABTC", axis=1, level="pair")
+    strategy = RSIWithBB(data, "AAABTC")
+    strategy.indicators = None
+    long_entry, long_exit, short_entry, short_exit = strategy.generate_signals()
+
+    expected = vbt.Portfolio.from_signals(
+        data["close"],
+        entries=long_entry,
+        exits=long_exit,
+        short_entries=short_entry,
+        short_exits=short_exit,
+        high=data["high"].to_numpy(),
+        low=data["low"].to_numpy(),
+        freq="1min",
+        **RSIWithBB.portfolio_kwargs,
+    )
+    assert_same_fills(strategy.result.portfolio, expected)
+    assert isinstance(strategy.result.portfolio.wrapper.columns, pd.Index)
+
+    # Увесь набір пар одним проходом дає ті самі угоди, що й окремі пари
+    batched = RSIWithBB(panel, timeframe="1min").get_metrics_frame()
+    row = batched.set_index("pair").loc["AAABTC"]
+    single = strategy.get_metrics()
+    assert row["trades"] == single["trades"]
+    assert row["total_return"] == pytest.approx(single["total_return"])
+
+
+# RVNBTC - ціна в кілька тіків (тік 1e-8 при ціні ~1.5e-7): майже кожна
+# зміна ціни перескакує рівень SL/TP; HEIBTC лістингується 13 лютого
+@pytest.mark.parametrize("pair", ["RVNBTC", "ETHBTC", "HEIBTC"])
+def test_simulator_matches_from_signals_on_fixtures(pair):
+    data = _fixture_data(pair)
+    close = data["close"]
+    bars = {field: data[field].to_numpy() for field in ("open", "high", "low")}
+    strategy = RSIWithBB(data, pair)
+    strategy.indicators = None
+    random_signals = [
+        signal["close"] for signal in _random_signals(close.to_frame(), seed=3)
+    ]
+
+    rsi_bb_signals = strategy.generate_signals()
+    for signals in (rsi_bb_signals, random_signals):
+        # Стопи лише за close і за open/high/low свічки
+        for prices in ({}, bars):
+            expected = vbt.Portfolio.from_signals(
+                close,
+                entries=signals[0],
+                exits=signals[1],
+                short_entries=signals[2],
+                short_exits=signals[3],
+                freq="1min",
+                **prices,
+                **RSIWithBB.portfolio_kwargs,
+            )
+            actual = simulate_sl_tp(
+                close, *signals, freq="1min", **prices, **RSIWithBB.portfolio_kwargs
+            )
+            assert len(expected.order_records) > 0
+            assert_same_fills(actual, expected)
+            if signals is rsi_bb_signals and prices:
+                assert_same_fills(strategy.result.portfolio, expected)
+
+    # Тік понад найменший стоп: метрики пари не потрапляють у звіт
+    metrics = strategy.get_metrics()
+    assert np.isnan(metrics["total_return"]) == (pair == "RVNBTC")
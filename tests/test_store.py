@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+import numpy as np
+import pandas as pd
+from core.data_loader import DataLoader
+from core.manifest import MISSING
+from core.store import MonthStore
+
+
+def write_daily_files(data_dir, pairs, days):
+    for pair in pairs:
+        for day in days:
+            timestamps = pd.date_range(day, periods=1440, freq="min")
+            close = np.linspace(1.0, 2.0, len(timestamps))
+            pd.DataFrame(
+                {
+                    "timestamp": timestamps[::-1],  # порядок рядків не гарантовано
+                    "open": close,
+                    "high": close,
+                    "low": close,
+                    "close": close,
+                    "volume": np.ones(len(timestamps)),
+                }
+            ).to_parquet(data_dir / f"{pair}_{day}.parquet")
+
+
+@pytest.fixture
+def store(tmp_path):
+    write_daily_files(
+        tmp_path, ["AAABTC", "BBBBTC"], ["2025-01-31", "2025-02-01", "2025-02-02"]
+    )
+    store = MonthStore(str(tmp_path / "store"))
+    assert store.compact(str(tmp_path)) == 6
+    return store
+
+
+def test_compact_writes_sorted_partitions(store):
+    assert store.has("AAABTC", "2025-01")
+    assert store.has("BBBBTC", "2025-02")
+
+    df = store.read()
+    assert len(df) == 6 * 1440
+    assert df["close"].dtype == np.float32
+    assert isinstance(df["pair"].dtype, pd.CategoricalDtype)
+    for _, part in df.groupby("pair", observed=True):
+        assert part["timestamp"].is_monotonic_increasing
+
+
+def test_read_filters_and_projection(store):
+    df = store.read(
+        pairs=["BBBBTC"],
+        start="2025-02-01 12:00",
+        end="2025-02-02",
+        columns=["close"],
+    )
+
+    assert list(df.columns) == ["timestamp", "close", "pair"]
+    assert list(df["pair"].cat.categories) == ["BBBBTC"]
+    assert df["timestamp"].min() == pd.Timestamp("2025-02-01 12:00")
+    assert df["timestamp"].max() == pd.Timestamp("2025-02-01 23:59")
+
+
+@pytest.mark.asyncio
+async def test_load_month_reads_store_without_downloads(tmp_path, store):
+    loader = DataLoader(str(tmp_path))
+    loader.store = store
+    # Решта днів лютого раніше повернула 404
+    loader.manifest.record(
+        {"pair": pair, "date": f"2025-02-{day:02d}", "status": MISSING}
+        for pair in ["AAABTC", "BBBBTC"]
+        for day in range(3, 29)
+    )
+    with patch.object(
+        DataLoader, "get_top_pairs", AsyncMock(return_value=["AAABTC", "BBBBTC"])
+    ), patch.object(loader.scheduler, "request") as mock_request:
+        df = await loader.load_month(2025, 2, 2)
+        compact = await loader.load_month(2025, 2, 2, compact=True, columns=["close"])
+
+    mock_request.assert_not_called()
+    assert len(df) == 2 * 2 * 1440
+    assert df["timestamp"].min() == pd.Timestamp("2025-02-01")
+    assert df["close"].dtype == np.float64
+    # Компактний режим: float32 сховища і лише потрібні поля
+    assert list(compact.columns) == ["timestamp", "close", "pair"]
+    assert compact["close"].dtype == np.float32
+    np.testing.assert_array_equal(compact["close"], df["close"])
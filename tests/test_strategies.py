@@ -5,6 +5,7 @@ import numpy as np
 from strategies.sma_cross import SMACrossover
 from strategies.ma_crossover import MACrossover
 from strategies.rsi_bb import RSIWithBB
+from strategies.base import BacktestResult
 
 
 @pytest.fixture
@@ -36,10 +37,10 @@ def test_ma_crossover_backtest(sample_price_data):
     strategy = MACrossover(sample_price_data, "TESTBTC", 10, 20)
     result = strategy.run_backtest()
 
-    assert isinstance(result, dict)
-    assert "portfolio" in result
-    assert "stats" in result
-    assert isinstance(result["stats"], pd.Series)
+    assert isinstance(result, BacktestResult)
+    assert result.portfolio is not None
+    assert isinstance(result.signals, pd.DataFrame)
+    assert isinstance(result.stats, pd.Series)
 
 
 def test_rsi_with_bb_metrics(sample_price_data):
@@ -51,6 +52,16 @@ def test_rsi_with_bb_metrics(sample_price_data):
     assert metrics["strategy"] == "RSI with BB"
 
 
+def test_result_is_cached(sample_price_data):
+    strategy = SMACrossover(sample_price_data, "TESTBTC", 10, 20)
+    strategy.get_metrics()
+
+    with patch.object(strategy, "run_backtest") as mock_run:
+        strategy.get_metrics()
+        assert strategy.result.equity_curve is not None
+        mock_run.assert_not_called()
+
+
 @pytest.mark.parametrize("window,expected", [(14, 14), (20, 20)])
 def test_strategy_parameters(sample_price_data, window, expected):
     # Тестування різних параметрів для стратегій
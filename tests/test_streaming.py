@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+import pandas as pd
+from core.streaming import replay
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+from strategies.sma_cross import SMACrossover
+
+
+@pytest.fixture
+def minutes():
+    """Довга таблиця: пізній лістинг, пропущені хвилини, період без торгів"""
+    rng = np.random.default_rng(3)
+    n = 1500
+    index = pd.date_range("2025-02-01", periods=n, freq="min")
+    frames = []
+    for k, pair in enumerate(["AAABTC", "BBBBTC", "CCCBTC"]):
+        close = 1 + rng.normal(0, 0.003, n).cumsum()
+        spread = np.abs(rng.normal(0, 0.002, n))
+        frame = pd.DataFrame(
+            {
+                "timestamp": index,
+                "close": close,
+                "high": close * (1 + spread),
+                "low": close * (1 - spread),
+                "pair": pair,
+            }
+        )
+        if k == 0:
+            frame.loc[100:300, ["close", "high", "low"]] = close[100]
+        if k == 1:
+            frame = frame.iloc[400:]
+        if k == 2:
+            frame = frame.drop(index=range(700, 760))
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def batch_signals(strategy_cls, data, pair, fused, **params):
+    strategy = strategy_cls(data, pair, **params)
+    strategy.indicators = None
+    strategy.fused_signals = fused
+    signals = strategy.generate_signals()
+    if isinstance(signals, pd.DataFrame):
+        return signals["entries"], signals["exits"]
+    return signals
+
+
+@pytest.mark.parametrize(
+    "strategy_cls, params",
+    [
+        (SMACrossover, {"fast_window": 5, "slow_window": 20}),
+        (MACrossover, {}),
+        (RSIWithBB, {"rsi_window": 7, "bb_window": 30}),
+    ],
+)
+def test_stream_matches_batch_signals(minutes, strategy_cls, params):
+    pairs = ["AAABTC", "BBBBTC", "CCCBTC"]
+    stream = strategy_cls.stream(pairs, **params)
+    result = stream.run(replay(minutes.sample(frac=1, random_state=1)))
+
+    assert len(result) == len(minutes)
+    for pair, part in minutes.groupby("pair"):
+        data = part.set_index("timestamp").drop(columns="pair")
+        actual = result[result["pair"] == pair].set_index("timestamp")
+        for fused in (False, True):
+            expected = batch_signals(strategy_cls, data, pair, fused, **params)
+            for name, signal in zip(stream.outputs, expected):
+                np.testing.assert_array_equal(actual[name], signal.to_numpy())
+                assert actual.index.equals(signal.index)
+
+
+def test_stream_update_per_bar(minutes):
+    stream = SMACrossover.stream(["AAABTC", "BBBBTC"], fast_window=3, slow_window=5)
+    _, bars = next(replay(minutes[minutes["pair"] != "CCCBTC"]))
+
+    signals = stream.update(bars)
+    assert list(signals.index) == ["AAABTC"]
+    assert list(signals.columns) == ["entries", "exits"]
+    assert stream.state.bars.tolist() == [1, 0]
+
+    with pytest.raises(ValueError):
+        stream.update(minutes[minutes["pair"] == "CCCBTC"].head(1))
+    with pytest.raises(ValueError):
+        RSIWithBB.stream(["AAABTC"], bb_std=0)
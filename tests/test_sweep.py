@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from core.data_loader import DataLoader
+from core.sweep import ParameterSweep
+from strategies.sma_cross import SMACrossover
+from strategies.ma_crossover import MACrossover
+from strategies.rsi_bb import RSIWithBB
+
+
+@pytest.fixture
+def all_data():
+    index = pd.date_range("2025-02-01", periods=400, freq="min")
+    frames = []
+    for i, pair in enumerate(["AAABTC", "BBBBTC"]):
+        close = 100 + np.sin(np.linspace(0, 25 + i * 9, len(index))) * 5
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": index,
+                    "close": close,
+                    "high": close + 1,
+                    "low": close - 1,
+                    "pair": pair,
+                }
+            )
+        )
+    return pd.concat(frames)
+
+
+def test_sweep_matches_single_runs(all_data):
+    sweep = ParameterSweep(DataLoader.to_panel(all_data), max_columns=4)
+    grid = {"fast_window": [5, 10], "slow_window": [10, 30]}
+    results = sweep.run(SMACrossover, grid)
+
+    # (10, 10) відкидається, бо fast >= slow
+    assert len(results) == 3 * 2
+    assert list(results.columns[:4]) == [
+        "strategy",
+        "pair",
+        "fast_window",
+        "slow_window",
+    ]
+    for row in results.itertuples():
+        data = all_data[all_data["pair"] == row.pair].set_index("timestamp")
+        expected = SMACrossover(
+            data, row.pair, row.fast_window, row.slow_window
+        ).get_metrics()
+        assert row.total_return == pytest.approx(expected["total_return"])
+        assert row.trades == expected["trades"]
+
+
+def test_sweep_computes_each_window_once(all_data):
+    sweep = ParameterSweep(DataLoader.to_panel(all_data))
+    with patch.object(vbt.MA, "run", wraps=vbt.MA.run) as mock_run:
+        results = sweep.run(
+            MACrossover, {"short_window": [5, 10], "long_window": [20, 40]}
+        )
+
+    assert len(results) == 4 * 2
+    mock_run.assert_called_once()
+    assert list(mock_run.call_args.args[1]) == [5, 10, 20, 40]
+
+
+def test_sweep_rsi_defaults_and_validation(all_data):
+    sweep = ParameterSweep(DataLoader.to_panel(all_data))
+    results = sweep.run(RSIWithBB, {"rsi_window": [7, 14]})
+
+    assert set(results["bb_window"]) == {20}
+    row = results[(results["pair"] == "BBBBTC") & (results["rsi_window"] == 14)].iloc[0]
+    data = all_data[all_data["pair"] == "BBBBTC"].set_index("timestamp")
+    expected = RSIWithBB(data, "BBBBTC").get_metrics()
+    assert row["total_return"] == pytest.approx(expected["total_return"])
+
+    with pytest.raises(ValueError):
+        sweep.run(RSIWithBB, {"atr_window": [14]})
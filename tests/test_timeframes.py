@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+from core.data_loader import DataLoader
+from core.manifest import MISSING
+from core.timeframes import resample_ohlcv, resample_panel, timeframe_offset
+from strategies.sma_cross import SMACrossover
+
+
+def make_minutes(pairs=("AAABTC", "BBBBTC"), periods=600):
+    rng = np.random.default_rng(11)
+    frames = []
+    for i, pair in enumerate(pairs):
+        close = 1 + rng.normal(0, 0.01, periods).cumsum()
+        frame = pd.DataFrame(
+            {
+                "timestamp": pd.date_range("2025-02-01", periods=periods, freq="min"),
+                "open": close + 0.001,
+                "high": close + 0.01,
+                "low": close - 0.01,
+                "close": close,
+                "volume": rng.exponential(10, periods),
+                "pair": pair,
+            }
+        )
+        # Пізній лістинг другої пари та розрив у торгах першої
+        frames.append(frame.iloc[130:] if i else frame.drop(frame.index[200:290]))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("timeframe", ["5min", "15min", "1h"])
+def test_resample_matches_per_pair_pandas(timeframe):
+    df = make_minutes()
+    bars = resample_ohlcv(df, timeframe)
+
+    for pair, part in df.groupby("pair"):
+        resampler = part.set_index("timestamp").resample(timeframe)
+        expected = resampler.agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last"}
+        ).assign(volume=resampler["volume"].sum())
+        expected = expected[resampler["close"].count() > 0]
+        actual = bars[bars["pair"] == pair].set_index("timestamp")
+        pd.testing.assert_frame_equal(
+            actual.drop(columns="pair"), expected, check_freq=False
+        )
+
+
+@pytest.mark.parametrize("timeframe", ["1h", "45min"])
+def test_resample_panel_matches_long_table(timeframe):
+    # Дві доби: межі свічок не зсуваються на переході через північ
+    df = make_minutes(periods=2 * 1440)
+    fields = ("open", "close", "volume")
+
+    panel = resample_panel(DataLoader.to_panel(df, fields), timeframe)
+    expected = DataLoader.to_panel(resample_ohlcv(df, timeframe), fields)
+    pd.testing.assert_frame_equal(panel, expected, check_freq=False)
+
+
+@pytest.mark.parametrize("timeframe", ["7min", "2D"])
+def test_timeframe_must_divide_day(timeframe):
+    with pytest.raises(ValueError):
+        resample_ohlcv(make_minutes(), timeframe)
+    with pytest.raises(ValueError):
+        timeframe_offset(timeframe)
+
+
+def test_timeframe_drives_portfolio_freq():
+    bars = resample_ohlcv(make_minutes(), "15min")
+    data = bars[bars["pair"] == "AAABTC"].set_index("timestamp")
+
+    strategy = SMACrossover(data, "AAABTC", 3, 8, timeframe="15min")
+    assert strategy.result.portfolio.wrapper.freq == pd.Timedelta("15min")
+    with pytest.raises(ValueError):
+        SMACrossover(data, "AAABTC", timeframe="1ME")
+
+
+@pytest.mark.asyncio
+async def test_load_month_caches_bars(tmp_path):
+    df = make_minutes(periods=2 * 1440)
+    for (pair, day), part in df.groupby(["pair", df["timestamp"].dt.date]):
+        part.drop(columns="pair").to_parquet(tmp_path / f"{pair}_{day}.parquet")
+    loader = DataLoader(str(tmp_path))
+    loader.manifest.record(
+        {"pair": pair, "date": f"2025-02-{day:02d}", "status": MISSING}
+        for pair in ["AAABTC", "BBBBTC"]
+        for day in range(3, 29)
+    )
+
+    with patch.object(
+        DataLoader, "get_top_pairs", AsyncMock(return_value=["AAABTC", "BBBBTC"])
+    ):
+        bars = await loader.load_month(2025, 2, 2, timeframe="1h")
+        # Повторне завантаження не читає хвилинні дані
+        with patch.object(loader, "_read_month") as mock_read:
+            cached = await loader.load_month(2025, 2, 2, timeframe="1h")
+
+    mock_read.assert_not_called()
+    pd.testing.assert_frame_equal(cached, bars)
+    expected = resample_ohlcv(df, "1h")
+    assert len(bars) == len(expected) == 2 * 48 - 2
+    np.testing.assert_allclose(bars["close"], expected["close"], rtol=1e-6)
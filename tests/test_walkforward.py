@@ -0,0 +1,123 @@
+import pytest
+import numpy as np
+import pandas as pd
+from core.data_loader import DataLoader
+from core.walkforward import WalkForward
+from strategies.sma_cross import SMACrossover
+from strategies.rsi_bb import RSIWithBB
+
+
+@pytest.fixture
+def all_data():
+    index = pd.date_range("2025-02-01", periods=400, freq="min")
+    frames = []
+    for i, pair in enumerate(["AAABTC", "BBBBTC"]):
+        close = 100 + np.sin(np.linspace(0, 25 + i * 9, len(index))) * 5
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": index,
+                    "close": close,
+                    "high": close + 1,
+                    "low": close - 1,
+                    "pair": pair,
+                }
+            )
+        )
+    return pd.concat(frames)
+
+
+def test_split_windows(all_data):
+    wf = WalkForward(DataLoader.to_panel(all_data), 200, 100, step=50)
+    train, test, bounds = wf.split()
+
+    assert len(bounds) == 3
+    assert train.shape == (200, 3 * 3 * 2)
+    assert test.shape == (100, 3 * 3 * 2)
+    # Тестове вікно йде одразу за вікном навчання
+    assert (bounds["test_start"] - bounds["train_end"] == pd.Timedelta("1min")).all()
+    assert bounds["train_start"].diff().dropna().eq(pd.Timedelta("50min")).all()
+
+    with pytest.raises(ValueError):
+        WalkForward(DataLoader.to_panel(all_data), 300, 200).split()
+
+
+def test_out_of_sample_matches_single_runs(all_data):
+    wf = WalkForward(DataLoader.to_panel(all_data), 200, 100, step=50)
+    results = wf.run(SMACrossover, {"fast_window": [5, 10], "slow_window": [10, 30]})
+
+    assert len(results) == 3 * 2
+    for row in results.itertuples():
+        data = all_data[all_data["pair"] == row.pair].set_index("timestamp")
+        # Прогрів з вікна навчання, симуляція - лише тестові свічки
+        window = data.loc[row.train_start : row.test_end]
+        strategy = SMACrossover(window, row.pair, row.fast_window, row.slow_window)
+        strategy.start = row.test_start
+        expected = strategy.get_metrics()
+        assert row.total_return == pytest.approx(expected["total_return"])
+        assert row.trades == expected["trades"]
+
+    summary = WalkForward.summary(results)
+    assert list(summary["windows"]) == [3, 3]
+    first = results[results["pair"] == "AAABTC"]["total_return"]
+    assert summary["total_return"].iloc[0] == pytest.approx(
+        ((1 + first / 100).prod() - 1) * 100
+    )
+
+
+def test_shared_params_across_pairs(all_data):
+    wf = WalkForward(DataLoader.to_panel(all_data), 200, 100, per_pair=False)
+    results = wf.run(RSIWithBB, {"rsi_window": [7, 14], "bb_window": [10, 20]})
+
+    assert set(results["split_idx"]) == {0, 1}
+    chosen = results.groupby("split_idx")[["rsi_window", "bb_window"]].nunique()
+    assert (chosen == 1).all().all()
+
+
+def test_window_without_training_trades_uses_defaults(all_data):
+    # BBBBTC стоїть на місці перші 200 свічок: на першому навчанні угод
+    # немає, sharpe_ratio нескінченний
+    flat = (all_data["pair"] == "BBBBTC") & (
+        all_data["timestamp"] < all_data["timestamp"].iloc[200]
+    )
+    all_data.loc[flat, ["close", "high", "low"]] = 100.0
+    wf = WalkForward(DataLoader.to_panel(all_data), 200, 100)
+    results = wf.run(SMACrossover, {"fast_window": [5, 10], "slow_window": [30]})
+
+    assert len(results) == 2 * 2
+    row = results.set_index(["pair", "split_idx"]).loc[("BBBBTC", 0)]
+    assert np.isnan(row["train_sharpe_ratio"])
+    assert (row["fast_window"], row["slow_window"]) == (15, 40)
+
+    data = all_data[all_data["pair"] == "BBBBTC"].set_index("timestamp")
+    strategy = SMACrossover(data.loc[: row["test_end"]], "BBBBTC")
+    strategy.start = row["test_start"]
+    assert row["total_return"] == pytest.approx(strategy.get_metrics()["total_return"])
+
+    summary = WalkForward.summary(results)
+    assert list(summary["windows"]) == [2, 2]
+
+
+def test_test_window_can_enter_on_first_bar():
+    # Падіння, потім зростання: SMA(5) перетинає SMA(30) знизу вгору на
+    # свічці, з якої починається тестове вікно
+    index = pd.date_range("2025-02-01", periods=300, freq="min")
+    close = 100 + np.abs(np.arange(len(index)) - 150.0) * 0.1
+    data = pd.DataFrame(
+        {"timestamp": index, "close": close, "high": close, "low": close}
+    ).assign(pair="AAABTC")
+    entries, _ = SMACrossover(
+        data.set_index("timestamp"), "AAABTC", 5, 30
+    ).generate_signals()
+    first = int(np.flatnonzero(entries.to_numpy())[0])
+
+    # Одне вікно; на навчанні угод немає, тож ціль - total_return (0%):
+    # з sharpe_ratio вікно тестувалося б з параметрами за замовчуванням
+    panel = DataLoader.to_panel(data.iloc[: first + 30])
+    wf = WalkForward(panel, first, 30, objective="total_return")
+    results = wf.run(SMACrossover, {"fast_window": [5], "slow_window": [30]})
+
+    assert len(results) == 1
+    assert results["test_start"].iloc[0] == index[first]
+    # Без прогріву SMA(30) не визначена на всіх 30 тестових свічках
+    assert results["trades"].iloc[0] == 1